@@ -0,0 +1,237 @@
+# -*- coding: utf-8 -*-
+"""
+DOLPA Underwater Technologies
+Anomali Tespiti
+
+Telemetri kanalları (kablo izleyici sinyali, derinlik, yunuslama, yalpa)
+akarken örnek başına sabit işle izlenir. İstatistikler ardışık örnekler
+arasındaki değişim (fark) üzerinde tutulur; böylece derinlik değişimi gibi
+yavaş eğilimler anomali sayılmaz, ani sıçramalar ve kaymalar sayılır:
+
+    EWMA       farkın üstel ağırlıklı ortalaması ve varyansı
+    z-skoru    farkın EWMA'ya göre kaç standart sapma uzakta olduğu (sıçrama)
+    CUSUM      z-skorlarının iki yönlü birikimli toplamı (kayma)
+
+Eşiği aşan her olay (bir "bölüm") sakinleşene kadar tepe noktası izlenir ve
+bitince puanına göre sıralanan listeye girer. En yüksek puanlı dört olay
+konumu ve zamanıyla GUI'ye gönderilir. Hesap kendi thread'inde, telemetri
+tamponundan okunarak yapılır; GUI thread'ine yalnızca liste değiştiğinde
+bir sinyal düşer.
+"""
+
+import heapq
+import math
+import time
+
+from PyQt5 import QtCore
+
+VARSAYILAN_KANALLAR = ("kablo_sinyali", "derinlik", "yunuslama", "yalpa")
+
+ALFA = 0.05          # fark ortalamasının EWMA ağırlığı
+VARYANS_ALFA = 0.01  # fark varyansının EWMA ağırlığı (~100 örneklik bellek)
+Z_ESIGI = 4.0        # sıçrama eşiği (standart sapma)
+CUSUM_K = 0.5        # CUSUM'un tolere ettiği kayma (standart sapma)
+CUSUM_H = 10.0       # CUSUM alarm eşiği
+ISINMA = 100         # istatistik oturmadan olay üretilmeyen örnek sayısı
+SAKIN = 10           # bölümün kapanması için eşik altında geçmesi gereken örnek
+EN_YUKSEK = 4        # GUI'de gösterilen olay sayısı
+
+
+class ChannelDetector:
+    """Tek kanal için fark üzerinde EWMA + z-skoru + CUSUM; örnek başına O(1)."""
+
+    def __init__(self, z_esigi=Z_ESIGI, alfa=ALFA, varyans_alfa=VARYANS_ALFA,
+                 cusum_k=CUSUM_K, cusum_h=CUSUM_H, isinma=ISINMA):
+        self.z_esigi = z_esigi
+        self.alfa = alfa
+        self.varyans_alfa = varyans_alfa
+        self.cusum_k = cusum_k
+        self.cusum_h = cusum_h
+        self.isinma = isinma
+        self.onceki = None
+        self.ortalama = 0.0
+        self.varyans = 0.0
+        self.adet = 0
+        self._arti = 0.0
+        self._eksi = 0.0
+
+    def guncelle(self, x):
+        """Örneği işle; (anomali puanı, z-skoru) döndür. Eşik altında puan 0.0."""
+        self.adet += 1
+        if self.onceki is None:
+            self.onceki = x
+            return 0.0, 0.0
+        sapma = x - self.onceki - self.ortalama
+        self.onceki = x
+        std = math.sqrt(self.varyans)
+        z = sapma / std if std > 1e-12 else 0.0
+
+        # Sıçramalar istatistiği kirletmesin diye kırpılarak öğrenilir
+        z_kirpik = max(-self.z_esigi, min(self.z_esigi, z))
+        ogrenilen = z_kirpik * std if std > 1e-12 else sapma
+        self.ortalama += self.alfa * ogrenilen
+        self.varyans = (1 - self.varyans_alfa) * (
+            self.varyans + self.varyans_alfa * ogrenilen * ogrenilen)
+
+        if self.adet <= self.isinma:
+            return 0.0, z
+        self._arti = max(0.0, self._arti + z_kirpik - self.cusum_k)
+        self._eksi = max(0.0, self._eksi - z_kirpik - self.cusum_k)
+        puan = abs(z) if abs(z) >= self.z_esigi else 0.0
+        cusum = max(self._arti, self._eksi)
+        if cusum >= self.cusum_h:
+            # CUSUM puanı z ölçeğine çekilir: eşikte z_esigi
+            puan = max(puan, self.z_esigi * cusum / self.cusum_h)
+        return puan, z
+
+    def cusum_sifirla(self):
+        self._arti = self._eksi = 0.0
+
+
+class AnomalyDetector:
+    """Kanal dedektörleri, olay bölümleri ve en yüksek puanlı olaylar.
+
+    Bir kanalda eşik aşılınca bölüm açılır ve `SAKIN` örnek boyunca eşik
+    altında kalana kadar tepe örnek (puan, değer, konum, zaman) güncellenir.
+    Kapanan bölüm sıralamaya girer; sıralama en fazla `en_yuksek` olay
+    tutan bir min-yığındır.
+    """
+
+    def __init__(self, kanallar=VARSAYILAN_KANALLAR, z_esigi=Z_ESIGI, en_yuksek=EN_YUKSEK):
+        self.kanallar = tuple(kanallar)
+        self.z_esigi = z_esigi
+        self.en_yuksek_adet = en_yuksek
+        self.sifirla()
+
+    def sifirla(self):
+        self._dedektorler = {k: ChannelDetector(z_esigi=self.z_esigi) for k in self.kanallar}
+        self._bolumler = {}   # kanal -> açık bölümün tepe olayı
+        self._sakin = {}      # kanal -> açık bölümde eşik altında geçen örnek
+        self._yigin = []      # (puan, sıra, olay)
+        self._sira = 0
+        self.ornek = 0
+        self.olay = 0
+
+    def besle(self, kanal_degerleri, zamanlar, enlemler, boylamlar):
+        """Yeni örnekleri işle; sıralama değiştiyse True.
+
+        `kanal_degerleri` kanal adından değer dizisine; tüm diziler aynı
+        uzunlukta ve aynı örnekleri kapsar. NaN değerler atlanır.
+        """
+        degisti = False
+        n = len(zamanlar)
+        self.ornek += n
+        for kanal in self.kanallar:
+            degerler = kanal_degerleri.get(kanal)
+            if degerler is None:
+                continue
+            dedektor = self._dedektorler[kanal]
+            for i, x in enumerate(degerler.tolist()):
+                if x != x:
+                    continue
+                puan, z = dedektor.guncelle(x)
+                bolum = self._bolumler.get(kanal)
+                if puan > 0.0:
+                    self._sakin[kanal] = 0
+                    if bolum is None or puan > bolum["puan"]:
+                        self._bolumler[kanal] = {
+                            "kanal": kanal, "puan": puan, "z": z, "deger": x,
+                            "zaman": float(zamanlar[i]), "enlem": float(enlemler[i]),
+                            "boylam": float(boylamlar[i]),
+                        }
+                elif bolum is not None:
+                    self._sakin[kanal] += 1
+                    if self._sakin[kanal] >= SAKIN:
+                        del self._bolumler[kanal]
+                        dedektor.cusum_sifirla()
+                        degisti |= self._sirala(bolum)
+        return degisti
+
+    def _sirala(self, olay):
+        self.olay += 1
+        self._sira += 1
+        kayit = (olay["puan"], self._sira, olay)
+        if len(self._yigin) < self.en_yuksek_adet:
+            heapq.heappush(self._yigin, kayit)
+            return True
+        if kayit[0] > self._yigin[0][0]:
+            heapq.heapreplace(self._yigin, kayit)
+            return True
+        return False
+
+    def en_yuksek(self):
+        """En yüksek puanlı olaylar, büyükten küçüğe."""
+        return [olay for _, _, olay in sorted(self._yigin, key=lambda k: (-k[0], k[1]))]
+
+
+class AnomalyWorker(QtCore.QObject):
+    """AnomalyDetector'ı kendi thread'inde telemetri tamponundan besler.
+
+    Tampon `aralik_ms`'de bir `since` ile okunur; sıralama değişince
+    `anomaliler_degisti` en yüksek olayların listesiyle yayınlanır.
+    """
+
+    anomaliler_degisti = QtCore.pyqtSignal(object)  # [olay sözlüğü, ...]
+
+    _sifirlama_istendi = QtCore.pyqtSignal(object)  # yeni tampon ya da None
+
+    def __init__(self, tampon, kanallar=VARSAYILAN_KANALLAR, aralik_ms=100, z_esigi=Z_ESIGI):
+        super().__init__()
+        self.tampon = tampon
+        self.aralik_ms = aralik_ms
+        self.dedektor = AnomalyDetector(kanallar, z_esigi)
+        self._sayac = tampon.sayac  # geçmiş örnekler taranmaz
+        self._thread = None
+        self._timer = None
+        self.sure_s = 0.0           # işlemeye harcanan toplam süre
+        self._sifirlama_istendi.connect(self._sifirla)
+
+    def baslat(self):
+        self._thread = QtCore.QThread()
+        self._thread.setObjectName("AnomalyWorker")
+        self.moveToThread(self._thread)
+        self._thread.started.connect(self._zamanlayiciyi_kur)
+        self._thread.start()
+
+    def durdur(self):
+        if self._thread is not None:
+            QtCore.QMetaObject.invokeMethod(self, "_kapat", QtCore.Qt.BlockingQueuedConnection)
+            self._thread.quit()
+            self._thread.wait()
+            self._thread = None
+
+    def sifirla(self, tampon=None):
+        """Olayları temizle; `tampon` verilirse o andan sonra ondan okunur."""
+        self._sifirlama_istendi.emit(tampon)
+
+    @QtCore.pyqtSlot()
+    def _zamanlayiciyi_kur(self):
+        self._timer = QtCore.QTimer(self)
+        self._timer.timeout.connect(self.isle)
+        self._timer.start(self.aralik_ms)
+
+    @QtCore.pyqtSlot()
+    def _kapat(self):
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+
+    @QtCore.pyqtSlot(object)
+    def _sifirla(self, tampon):
+        if tampon is not None:
+            self.tampon = tampon
+        self._sayac = self.tampon.sayac
+        self.dedektor.sifirla()
+        self.anomaliler_degisti.emit([])
+
+    @QtCore.pyqtSlot()
+    def isle(self):
+        t0 = time.perf_counter()
+        kanallar = self.dedektor.kanallar
+        self._sayac, diziler = self.tampon.since(
+            self._sayac, "zaman", "enlem", "boylam", *kanallar)
+        zamanlar, enlemler, boylamlar = diziler[:3]
+        if len(zamanlar) and self.dedektor.besle(
+                dict(zip(kanallar, diziler[3:])), zamanlar, enlemler, boylamlar):
+            self.anomaliler_degisti.emit(self.dedektor.en_yuksek())
+        self.sure_s += time.perf_counter() - t0
@@ -0,0 +1,761 @@
+# -*- coding: utf-8 -*-
+"""
+DOLPA Underwater Technologies
+Performans Ölçümleri
+
+Arayüz ölçümleri ekransız Qt (offscreen) ile, araç yerine yerel simülatöre
+ya da bir dalış kaydına karşı çalışır.
+
+Kullanım:
+    python benchmark.py                              # tüm ölçümler
+    python benchmark.py protocol rtt                 # yalnızca seçilenler
+    python benchmark.py --json sonuc.json            # makine okunur çıktı
+    python benchmark.py --karsilastir onceki.json    # önceki sürümle kıyasla
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import protocol
+
+# Tipik bir telemetri mesajı
+ORNEK_TELEMETRI = {
+    "tip": "telemetri",
+    "zaman": 1712345678.123,
+    "derinlik": 12.34,
+    "yon": 271.5,
+    "yunuslama": -1.25,
+    "yalpa": 0.75,
+    "enlem": 40.987654,
+    "boylam": 29.123456,
+    "sarj": 87,
+    "sizinti": False,
+}
+
+TCP_SEGMENT = 1460
+
+
+def bench_protocol(n=100000):
+    """Çerçeve kodlama/çözme hızı (mesaj/s), TCP segmentleriyle beslenerek."""
+    mesajlar = [dict(ORNEK_TELEMETRI, seq=i) for i in range(n)]
+
+    t0 = time.perf_counter()
+    cerceveler = [protocol.encode_message(m) for m in mesajlar]
+    kodlama_s = time.perf_counter() - t0
+    akis = b"".join(cerceveler)
+
+    cozucu = protocol.FrameDecoder()
+    cozulen = 0
+    t0 = time.perf_counter()
+    for i in range(0, len(akis), TCP_SEGMENT):
+        cozulen += len(cozucu.feed(akis[i:i + TCP_SEGMENT]))
+    cozme_s = time.perf_counter() - t0
+    assert cozulen == n, f"{cozulen} / {n} mesaj çözüldü"
+
+    return {
+        "encode_msg_s": n / kodlama_s,
+        "decode_msg_s": n / cozme_s,
+        "bytes_per_msg": len(akis) / n,
+    }
+
+
+def bench_telemetry_encoding(n=100000):
+    """Telemetri çerçevesi başına bayt ve kodlama/çözme maliyeti: JSON ve ikili."""
+    telemetri = {k: v for k, v in ORNEK_TELEMETRI.items() if k != "tip"}
+    sonuc = {}
+    for ad, kodla in (("json", lambda: protocol.encode_message(ORNEK_TELEMETRI)),
+                      ("ikili", lambda: protocol.encode_telemetry(telemetri))):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            cerceve = kodla()
+        kodlama_s = time.perf_counter() - t0
+
+        akis = cerceve * n
+        cozucu = protocol.FrameDecoder()
+        t0 = time.perf_counter()
+        for i in range(0, len(akis), TCP_SEGMENT):
+            cozucu.feed(akis[i:i + TCP_SEGMENT])
+        cozme_s = time.perf_counter() - t0
+
+        sonuc[f"{ad}_bytes_per_frame"] = len(cerceve)
+        sonuc[f"{ad}_encode_us"] = kodlama_s / n * 1e6
+        sonuc[f"{ad}_decode_us"] = cozme_s / n * 1e6
+    return sonuc
+
+
+def _yuzdelik(degerler, p):
+    sirali = sorted(degerler)
+    return sirali[min(len(sirali) - 1, int(round(p / 100 * (len(sirali) - 1))))]
+
+
+# --- Qt tabanlı ölçümler -------------------------------------------------------
+
+_APP = None
+
+
+def _qt_uygulamasi():
+    global _APP
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PyQt5 import QtWidgets
+    if QtWidgets.QApplication.instance() is None:
+        import mapview
+        mapview.sema_kaydet()
+    _APP = QtWidgets.QApplication.instance() or QtWidgets.QApplication([sys.argv[0]])
+    return _APP
+
+
+def _olay_dongusu(kosul, zaman_asimi=10.0):
+    """Koşul sağlanana dek Qt olaylarını işle; zaman aşımında False."""
+    from PyQt5 import QtCore
+    app = _qt_uygulamasi()
+    son = time.monotonic() + zaman_asimi
+    while not kosul():
+        if time.monotonic() > son:
+            return False
+        app.processEvents(QtCore.QEventLoop.AllEvents, 10)
+    return True
+
+
+def _bos_port():
+    import socket
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _pencere(port, oynatma=None, tanilama=False):
+    """Simülatöre (ya da hiçbir şeye) bağlı, görünür bir ana pencere kur."""
+    _qt_uygulamasi()
+    import dolpa
+    dolpa.ARACLAR = [{"ad": "bench", "ip": "127.0.0.1", "port": port, "kamera": None}]
+    dolpa.CONFIG["kayit"] = False
+    dolpa.CONFIG["log_dosyasi"] = None
+    dolpa.CONFIG["karo_deposu"] = os.path.join(tempfile.gettempdir(), "dolpa_benchmark.mbtiles")
+    dolpa.CONFIG["karo_indir"] = False
+    pencere = dolpa.ResponsiveMainWindow()
+    ui = dolpa.Ui_MainWindow(oynatma, tanilama)
+    ui.setupUi(pencere)
+    pencere.show()
+    return pencere, ui
+
+
+def _pencereyi_kapat(pencere, ui):
+    ui.connection_timer.stop()
+    ui.filo.durdur()
+    if ui.tanilama is not None:
+        ui.tanilama.durdur()
+    ui.terminal_log.kapat()
+    pencere.close()
+    pencere.deleteLater()
+    _olay_dongusu(lambda: False, 0.05)
+
+
+class _DonguGecikmesi:
+    """GUI olay döngüsü gecikmesini sık tetiklenen bir QTimer ile ölçer."""
+
+    ARALIK_MS = 5
+
+    def __init__(self):
+        from PyQt5 import QtCore
+        self.gecikmeler = []
+        self._onceki = None
+        self._timer = QtCore.QTimer()
+        self._timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self._timer.timeout.connect(self._tik)
+
+    def baslat(self):
+        self._onceki = time.perf_counter()
+        self._timer.start(self.ARALIK_MS)
+
+    def durdur(self):
+        self._timer.stop()
+
+    def _tik(self):
+        simdi = time.perf_counter()
+        self.gecikmeler.append(max(0.0, (simdi - self._onceki) * 1000 - self.ARALIK_MS))
+        self._onceki = simdi
+
+    def sonuc(self, onek):
+        if not self.gecikmeler:
+            return {}
+        return {
+            f"{onek}_p50_ms": _yuzdelik(self.gecikmeler, 50),
+            f"{onek}_p99_ms": _yuzdelik(self.gecikmeler, 99),
+            f"{onek}_max_ms": max(self.gecikmeler),
+        }
+
+
+def bench_rtt(n=500):
+    """Kalıcı oturum üzerinden komut gidiş-dönüş süresi (sarj_durumu)."""
+    _qt_uygulamasi()
+    import network
+    from simulator import VehicleSimulator
+
+    with VehicleSimulator() as sim:
+        oturum = network.VehicleSession(sim.host, sim.port)
+        oturum.baslat()
+        if not _olay_dongusu(oturum.bagli_mi):
+            raise RuntimeError("simülatöre bağlanılamadı")
+
+        sureler = []
+        for _ in range(n):
+            yanit = []
+            t0 = time.perf_counter()
+            oturum.istek({"komut": "sarj_durumu"}, lambda y, h: yanit.append(h))
+            _olay_dongusu(lambda: yanit, 2.0)
+            if yanit and yanit[0] is None:
+                sureler.append((time.perf_counter() - t0) * 1000)
+        oturum.kapat()
+
+    return {
+        "rtt_p50_ms": _yuzdelik(sureler, 50),
+        "rtt_p99_ms": _yuzdelik(sureler, 99),
+        "yanit_orani": len(sureler) / n,
+    }
+
+
+def _telemetri_kaydi(yol, n, hiz=100.0):
+    import recorder
+    from simulator import sentetik_telemetri
+    kaydedici = recorder.DiveRecorder(yol)
+    kaydedici.baslat()
+    for i in range(n):
+        cerceve = protocol.encode_telemetry(sentetik_telemetri(i, hiz=hiz))
+        kaydedici.kaydet(recorder.GELEN, cerceve[protocol.BASLIK_BOYUTU:], i / hiz)
+    kaydedici.durdur()
+
+
+def bench_ingest(n=200000):
+    """Tam arayüzle en yüksek sürekli telemetri alımı (kayıt oynatma, en yüksek hız)."""
+    with tempfile.TemporaryDirectory() as klasor:
+        yol = os.path.join(klasor, "bench.dkyt")
+        _telemetri_kaydi(yol, n)
+
+        pencere, ui = _pencere(_bos_port(), {"yol": yol, "hiz": None, "baslangic": 0.0})
+        istatistik = []
+        ui.ag_iscisi.oturum.oynatma_bitti.connect(istatistik.append)
+        olcer = _DonguGecikmesi()
+        olcer.baslat()
+        _olay_dongusu(lambda: istatistik, 120.0)
+        olcer.durdur()
+        _pencereyi_kapat(pencere, ui)
+
+    if not istatistik:
+        raise RuntimeError("oynatma zamanında bitmedi")
+    sonuc = {"ingest_frames_s": istatistik[0]["cerceve_s"]}
+    sonuc.update(olcer.sonuc("gui_lag"))
+    return sonuc
+
+
+def bench_event_loop_lag(hiz=1000, sure=3.0):
+    """Simülatör yüksek hızda telemetri yayınlarken GUI olay döngüsü gecikmesi."""
+    from simulator import SimulatorAyarlari, VehicleSimulator
+
+    with VehicleSimulator(ayarlar=SimulatorAyarlari(hiz=hiz)) as sim:
+        pencere, ui = _pencere(sim.port)
+        _olay_dongusu(lambda: len(ui.ag_iscisi.telemetri) > 0)
+        baslangic = ui.ag_iscisi.telemetri.sayac
+        olcer = _DonguGecikmesi()
+        olcer.baslat()
+        _olay_dongusu(lambda: False, sure)
+        olcer.durdur()
+        alinan = ui.ag_iscisi.telemetri.sayac - baslangic
+        _pencereyi_kapat(pencere, ui)
+
+    sonuc = {"telemetry_hz": alinan / sure}
+    sonuc.update(olcer.sonuc("lag"))
+    return sonuc
+
+
+def bench_diagnostics(hiz=1000, sure=2.0, n=100000):
+    """Tanılama modunun maliyeti: slot sarmalayıcısı başına ek süre (µs) ve
+    telemetri akarken tanılama kapalı/açık olay döngüsü gecikmesi."""
+    _qt_uygulamasi()
+    import diagnostics
+    from simulator import SimulatorAyarlari, VehicleSimulator
+
+    bos = lambda: None
+    sarili = diagnostics.SlotTimer(lambda *_: None).sar(bos, "bos")
+    sureler = []
+    for fonk in (bos, sarili):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fonk()
+        sureler.append(time.perf_counter() - t0)
+    sonuc = {"slot_wrapper_us": (sureler[1] - sureler[0]) / n * 1e6}
+
+    with VehicleSimulator(ayarlar=SimulatorAyarlari(hiz=hiz)) as sim:
+        for ad, tanilama in (("off", False), ("on", True)):
+            pencere, ui = _pencere(sim.port, tanilama=tanilama)
+            _olay_dongusu(lambda: len(ui.ag_iscisi.telemetri) > 0)
+            olcer = _DonguGecikmesi()
+            olcer.baslat()
+            _olay_dongusu(lambda: False, sure)
+            olcer.durdur()
+            _pencereyi_kapat(pencere, ui)
+            sonuc.update(olcer.sonuc(f"lag_{ad}"))
+    return sonuc
+
+
+def bench_terminal(boyutlar=(1000, 10000, 50000), ornek=200):
+    """Günlük büyüdükçe terminale_yaz başına maliyet (µs)."""
+    pencere, ui = _pencere(_bos_port())
+    ui.connection_timer.stop()
+    sonuc = {}
+    yazilan = 0
+    for boyut in boyutlar:
+        while yazilan < boyut:
+            ui.terminale_yaz(f"Telemetri satırı {yazilan}: derinlik 12.3 m, yön 271°")
+            yazilan += 1
+        ui.terminal_log.bosalt()
+        _olay_dongusu(lambda: False, 0.05)
+        t0 = time.perf_counter()
+        for i in range(ornek):
+            ui.terminale_yaz(f"Ölçüm satırı {i}: derinlik 12.3 m, yön 271°")
+        # Biriken satırların widget'a aktarımı ve ertelenmiş çizim de ölçüme girsin
+        ui.terminal_log.bosalt()
+        _olay_dongusu(lambda: False, 0.0)
+        sonuc[f"append_us_at_{boyut}"] = (time.perf_counter() - t0) / ornek * 1e6
+        yazilan += ornek
+    _pencereyi_kapat(pencere, ui)
+    return sonuc
+
+
+def bench_resize(n=500):
+    """Canlı sürüklemeye benzer ardışık yeniden boyutlandırmalar: boyut değişimi
+    başına maliyet (µs) ve yapılan yerleşim geçişi / setGeometry sayısı."""
+    app = _qt_uygulamasi()
+    pencere, ui = _pencere(_bos_port())
+    ui.connection_timer.stop()
+    app.processEvents()
+    yerlesim = ui.yerlesim
+    gecis, uygulanan, atlanan = yerlesim.gecis, yerlesim.uygulanan, yerlesim.atlanan
+    boyutlar = [(960 + (i % 50) * 8, 587 + (i % 30) * 6) for i in range(n)]
+    t0 = time.perf_counter()
+    for genislik, yukseklik in boyutlar:
+        pencere.resize(genislik, yukseklik)
+        app.processEvents()
+    _olay_dongusu(lambda: not yerlesim.bekleyen_var(), 1.0)
+    sure = time.perf_counter() - t0
+    sonuc = {
+        "resize_us": sure / n * 1e6,
+        "layout_passes_per_resize": (yerlesim.gecis - gecis) / n,
+        "set_geometry_per_pass": (yerlesim.uygulanan - uygulanan) / max(yerlesim.gecis - gecis, 1),
+        "skipped_per_pass": (yerlesim.atlanan - atlanan) / max(yerlesim.gecis - gecis, 1),
+    }
+    _pencereyi_kapat(pencere, ui)
+    return sonuc
+
+
+def bench_styles(n=2000):
+    """Stil maliyeti: pencere kurulumu (ms) ve durum değişimi başına (µs)."""
+    app = _qt_uygulamasi()
+    # İlk pencere modül yüklemesini ve Qt ısınmasını üstlenir
+    _pencereyi_kapat(*_pencere(_bos_port()))
+    t0 = time.perf_counter()
+    pencere, ui = _pencere(_bos_port())
+    app.processEvents()
+    kurulum = time.perf_counter() - t0
+    ui.connection_timer.stop()
+    ui.render_timer.stop()
+
+    # Tüm stilin yeniden uygulanması (ayrıştırma + tüm widget'ların cilalanması)
+    tekrar = 20
+    t0 = time.perf_counter()
+    for _ in range(tekrar):
+        ui.apply_styles(pencere)
+        app.processEvents()
+    stil_uygulama = (time.perf_counter() - t0) / tekrar
+
+    # Her adımda bağlantı ve şarj etiketinin ikisi de durum değiştirir
+    durumlar = [(True, 80), (False, None), (True, 30), (True, 10)]
+    uygulama = 0.0
+    t0 = time.perf_counter()
+    for i in range(n):
+        bagli, sarj = durumlar[i % len(durumlar)]
+        ui.arac_baglanti_guncelle(bagli)
+        ui.update_battery_status(sarj)
+        t1 = time.perf_counter()
+        ui.gorunum.uygula()
+        uygulama += time.perf_counter() - t1
+        app.processEvents()
+    sure = time.perf_counter() - t0
+    _pencereyi_kapat(pencere, ui)
+    return {"setup_ms": kurulum * 1000, "apply_styles_ms": stil_uygulama * 1000,
+            "state_change_us": sure / n * 1e6,
+            "state_apply_us": uygulama / n * 1e6}
+
+
+def _tarama_izi(n, hiz=1.0, frekans=5.0, seritler=200.0, tohum=0):
+    """Şerit şerit tarama yapan aracın gürültülü (enlem, boylam) izi."""
+    import numpy as np
+    rng = np.random.default_rng(tohum)
+    adim = hiz / frekans
+    yol = np.arange(n) * adim
+    serit, konum = np.divmod(yol, seritler)
+    x = np.where(serit % 2 == 0, konum, seritler - konum) + rng.normal(0, 0.1, n)
+    y = serit * 20.0 + rng.normal(0, 0.1, n)
+    return 40.98 + y / 111195.0, 29.02 + x / (111195.0 * np.cos(np.radians(40.98)))
+
+
+def bench_map_bridge(n=100000, paket=25):
+    """Araç izinin haritaya gönderimi (5 Hz, şerit taraması): tampondan okuma +
+    sadeleştirme + paketleme maliyeti (nokta başına µs), sayfaya giden nokta
+    ve bayt; nokta başına runJavaScript metniyle kıyaslanır."""
+    _qt_uygulamasi()
+    import mapview
+    import telemetry
+    izin_enlem, izin_boylam = _tarama_izi(n)
+    tampon = telemetry.TelemetryBuffer(kapasite=n)
+    kopru = mapview.MapBridge()
+    kopru.sayfa_hazir = True
+    boyut = 0
+
+    def say(metin):
+        nonlocal boyut
+        boyut += len(metin)
+    kopru.iz_eklendi.connect(say)
+
+    # Her harita güncellemesinden önce `paket` yeni örnek gelir; yalnızca
+    # okuma + paketleme + gönderim ölçülür
+    sayac = 0
+    sure = 0.0
+    for i in range(0, n, paket):
+        for j in range(i, min(i + paket, n)):
+            tampon.append({"enlem": izin_enlem[j], "boylam": izin_boylam[j]}, float(j))
+        t0 = time.perf_counter()
+        sayac, (enlemler, boylamlar) = tampon.since(sayac, "enlem", "boylam")
+        kopru.iz_ekle(enlemler, boylamlar)
+        kopru.gonder()
+        sure += time.perf_counter() - t0
+
+    # Eski yol: nokta başına bir JavaScript çağrısı metni
+    _, (enlemler, boylamlar) = tampon.since(0, "enlem", "boylam")
+    t0 = time.perf_counter()
+    js_boyut = sum(len(f"addPoint({e}, {b});") for e, b in zip(enlemler.tolist(), boylamlar.tolist()))
+    js_sure = time.perf_counter() - t0
+    return {"push_us_per_point": sure / n * 1e6, "bytes_per_point": boyut / n,
+            "js_format_us_per_point": js_sure / n * 1e6, "js_bytes_per_point": js_boyut / n,
+            "messages_per_1000_points": kopru.paket / n * 1000,
+            "sent_points_per_1000": kopru.nokta / n * 1000,
+            "drawn_points_per_1000": kopru.istatistik()["goruntu"] / n * 1000}
+
+
+def _haversine_skaler(lat1, lon1, lat2, lon2):
+    # Ui_MainWindow.haversine'in geodesy modülünden önceki hâli (hız kıyası için)
+    import math
+    R = 6371000
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin(dlambda/2)**2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return R * c
+
+
+def _sure(islev, tekrar):
+    en_iyi = float("inf")
+    for _ in range(tekrar):
+        t0 = time.perf_counter()
+        islev()
+        en_iyi = min(en_iyi, time.perf_counter() - t0)
+    return en_iyi
+
+
+def bench_geodesy(boyutlar=(1000, 10000, 100000, 1000000)):
+    """Vektörleştirilmiş jeodezi: nokta başına süre (ns) ve eski skaler
+    haversine ile hız kıyası. Doğruluk tests/test_geodesy.py'de sınanır."""
+    import numpy as np
+    import geodesy
+    rng = np.random.default_rng(0)
+    sonuc = {}
+    for n in boyutlar:
+        e1, b1 = rng.uniform(-80, 80, n), rng.uniform(-180, 180, n)
+        e2, b2 = rng.uniform(-80, 80, n), rng.uniform(-180, 180, n)
+        tekrar = max(1, 100000 // n)
+        sonuc[f"haversine_ns_{n}"] = _sure(lambda: geodesy.mesafe(e1, b1, e2, b2), tekrar) / n * 1e9
+        sonuc[f"bearing_ns_{n}"] = _sure(lambda: geodesy.yon(e1, b1, e2, b2), tekrar) / n * 1e9
+        sonuc[f"destination_ns_{n}"] = _sure(lambda: geodesy.hedef(e1, b1, b2, 5000.0), tekrar) / n * 1e9
+        sonuc[f"cross_track_ns_{n}"] = _sure(
+            lambda: geodesy.capraz_mesafe(e2, b2, e1, b1, 40.0, 29.0), tekrar) / n * 1e9
+        sonuc[f"enu_ns_{n}"] = _sure(lambda: geodesy.enu(e2, b2, 40.98, 29.02), tekrar) / n * 1e9
+
+    # Eski skaler fonksiyonla hız
+    n = min(boyutlar[-1], 100000)
+    liste = list(zip(*(rng.uniform(-80, 80, n), rng.uniform(-180, 180, n),
+                       rng.uniform(-80, 80, n), rng.uniform(-180, 180, n))))
+    sonuc["scalar_haversine_ns"] = _sure(lambda: [_haversine_skaler(*nokta) for nokta in liste], 1) / n * 1e9
+    return sonuc
+
+
+def bench_mission(aralik=2.0, tekrar=20):
+    """Görev planlama: ~4 km'lik kare üzerinde şerit ve spiral desen üretimi,
+    uzunluk/süre tahmini ve paketleme (ms) ile paket boyutu."""
+    import mission
+    kare = [(40.98, 29.00), (40.98, 29.05), (41.02, 29.05), (41.02, 29.00)]
+    serit = mission.serit_tarama(kare, aralik)
+    spiral = mission.spiral_tarama(kare, aralik)
+    mesaj_boyutu = len(json.dumps(serit.mesaj(), separators=(",", ":")))
+    return {
+        "lawnmower_legs": serit.bacak_sayisi,
+        "lawnmower_ms": _sure(lambda: mission.serit_tarama(kare, aralik), tekrar) * 1000,
+        "spiral_legs": spiral.bacak_sayisi,
+        "spiral_ms": _sure(lambda: mission.spiral_tarama(kare, aralik), tekrar) * 1000,
+        "estimate_ms": _sure(lambda: (serit.uzunluk(), serit.sure()), tekrar) * 1000,
+        "serialize_ms": _sure(serit.mesaj, tekrar) * 1000,
+        "message_bytes_per_waypoint": mesaj_boyutu / len(serit),
+    }
+
+
+def bench_anomaly(n=36000, hiz=10.0, sicrama=12, tohum=0):
+    """Anomali tespiti: 1 saatlik sentetik dalış (10 Hz, sensör gürültülü) +
+    derinliğe eklenen sıçramalar; örnek başına maliyet (µs, tüm kanallar),
+    yakalanan sıçrama oranı ve olay sayıları."""
+    import random
+    import anomaly
+    import telemetry
+    from simulator import sentetik_telemetri
+    rastgele = random.Random(tohum)
+    gurultu = {"kablo_sinyali": 0.02, "derinlik": 0.02, "yunuslama": 0.1, "yalpa": 0.1}
+    sicramalar = set(range(n // sicrama // 2, n, n // sicrama))
+    ornekler = []
+    for i in range(n):
+        t = sentetik_telemetri(i, hiz=hiz)
+        for kanal, sigma in gurultu.items():
+            t[kanal] += rastgele.gauss(0.0, sigma)
+        if i in sicramalar:
+            t["derinlik"] += 0.5
+        t["zaman"] = i / hiz
+        ornekler.append(t)
+
+    tampon = telemetry.TelemetryBuffer(kapasite=n)
+    dedektor = anomaly.AnomalyDetector()
+    olaylar = []
+    sirala = dedektor._sirala
+    dedektor._sirala = lambda olay: olaylar.append(olay) or sirala(olay)
+    kanallar = dedektor.kanallar
+    sayac = 0
+    sure = 0.0
+    adim = int(hiz)  # işçi gibi periyodik okuma; burada 1 s'lik paketler
+    for bas in range(0, n, adim):
+        for t in ornekler[bas:bas + adim]:
+            tampon.append(t)
+        t0 = time.perf_counter()
+        sayac, diziler = tampon.since(sayac, "zaman", "enlem", "boylam", *kanallar)
+        dedektor.besle(dict(zip(kanallar, diziler[3:])), *diziler[:3])
+        sure += time.perf_counter() - t0
+
+    derinlik = [round(o["zaman"] * hiz) for o in olaylar if o["kanal"] == "derinlik"]
+    yakalanan = sum(any(abs(j - i) <= 2 for j in derinlik) for i in sicramalar)
+    sayim = {k: sum(o["kanal"] == k for o in olaylar) for k in kanallar}
+    return {
+        "us_per_sample": sure / n * 1e6,
+        "spikes_detected_pct": yakalanan / len(sicramalar) * 100,
+        "depth_false_events": len(derinlik) - yakalanan,
+        "cable_events": sayim["kablo_sinyali"],
+        "attitude_events": sayim["yunuslama"] + sayim["yalpa"],
+        "top_score": dedektor.en_yuksek()[0]["puan"] if olaylar else 0.0,
+    }
+
+
+def bench_camera(sure=3.0, fps=(30, 1000)):
+    """Kamera paneli: simülatörden MJPEG ve ham kare akışı (640x480) normal ve
+    aşırı yüksek hızda; çözme/gösterim hızı, ekrana gecikme (ms) ve düşen
+    kare oranı."""
+    app = _qt_uygulamasi()
+    import camera
+    import simulator
+    sonuc = {}
+    for mod, sema in (("mjpeg", "http"), ("ham", "tcp")):
+        for hiz in fps:
+            with simulator.CameraSimulator(mod=mod, fps=hiz) as sim:
+                isci = camera.CameraWorker(f"{sema}://127.0.0.1:{sim.port}/akis")
+                panel = camera.VideoWidget()
+                panel.resize(320, 240)
+                panel.baglan(isci)
+                panel.show()
+                isci.baslat()
+                _olay_dongusu(lambda: isci.alinan > 0)
+                alinan0, gosterilen0 = isci.alinan, panel.gosterilen
+                bitis = time.monotonic() + sure
+                _olay_dongusu(lambda: time.monotonic() >= bitis, sure + 5)
+                ist = isci.istatistik()
+                isci.durdur()
+                panel.close()
+            alinan = ist["alinan"] - alinan0
+            gosterilen = panel.gosterilen - gosterilen0
+            sonuc[f"{mod}_{hiz}_received_fps"] = alinan / sure
+            sonuc[f"{mod}_{hiz}_displayed_fps"] = gosterilen / sure
+            sonuc[f"{mod}_{hiz}_latency_ms"] = panel.gecikme_ms
+            sonuc[f"{mod}_{hiz}_dropped_pct"] = max(0.0, 1 - gosterilen / max(alinan, 1)) * 100
+    app.processEvents()
+    return sonuc
+
+
+def bench_fleet(araclar=(1, 4, 5), hiz=100, yuk_hizi=2000, sure=3.0):
+    """Tek ağ thread'inde k araç: ilk aracın (hiz Hz) telemetri gecikmesi,
+    diğerleri yuk_hizi Hz'de yayınlarken. Beşinci araç ilk araca gecikme
+    eklememelidir."""
+    from PyQt5 import QtCore
+    _qt_uygulamasi()
+    import network
+    from simulator import SimulatorAyarlari, VehicleSimulator
+
+    class _Olcer(QtCore.QObject):
+        # Ağ thread'inde, mesaj oturumdan çıktığı anda ölçer
+        def __init__(self):
+            super().__init__()
+            self.gecikmeler = []
+
+        @QtCore.pyqtSlot(object)
+        def mesaj(self, mesaj):
+            if isinstance(mesaj, dict) and mesaj.get("tip") == "telemetri":
+                self.gecikmeler.append((time.time() - mesaj["zaman"]) * 1000)
+
+    sonuc = {}
+    for k in araclar:
+        simler = [VehicleSimulator(ayarlar=SimulatorAyarlari(hiz=hiz if i == 0 else yuk_hizi))
+                  for i in range(k)]
+        for sim in simler:
+            sim.baslat()
+        filo = network.FleetManager()
+        for i, sim in enumerate(simler):
+            filo.ekle(f"arac{i}", network.NetworkWorker(sim.host, sim.port, hiz))
+        olcer = _Olcer()
+        filo.isciler[0].oturum.mesaj_alindi.connect(olcer.mesaj, QtCore.Qt.DirectConnection)
+        filo.baslat()
+        _olay_dongusu(lambda: all(len(isci.telemetri) for isci in filo.isciler))
+        _olay_dongusu(lambda: False, 0.5)
+        olcer.gecikmeler.clear()
+        baslangic = sum(isci.telemetri.sayac for isci in filo.isciler)
+        _olay_dongusu(lambda: False, sure)
+        alinan = sum(isci.telemetri.sayac for isci in filo.isciler) - baslangic
+        gecikmeler = list(olcer.gecikmeler)
+        filo.durdur()
+        for sim in simler:
+            sim.durdur()
+        sonuc[f"vehicles_{k}_first_p50_ms"] = _yuzdelik(gecikmeler, 50)
+        sonuc[f"vehicles_{k}_first_p99_ms"] = _yuzdelik(gecikmeler, 99)
+        sonuc[f"vehicles_{k}_total_hz"] = alinan / sure
+    return sonuc
+
+
+def bench_startup(tekrar=3):
+    """Soğuk başlangıçtan ilk boyamaya kadar geçen süre (ms)."""
+    sureler = []
+    for _ in range(tekrar):
+        t0 = time.time()
+        cikti = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--ilk-boyama", repr(t0)],
+            capture_output=True, text=True, timeout=60,
+            env=dict(os.environ, QT_QPA_PLATFORM=os.environ.get("QT_QPA_PLATFORM", "offscreen")))
+        satirlar = [s for s in cikti.stdout.splitlines() if s.startswith("ilk_boyama_ms=")]
+        if not satirlar:
+            raise RuntimeError(f"başlangıç ölçülemedi: {cikti.stderr[-500:]}")
+        sureler.append(float(satirlar[-1].split("=", 1)[1]))
+    return {"first_paint_ms_min": min(sureler), "first_paint_ms_median": statistics.median(sureler)}
+
+
+def _ilk_boyama_olc(t0):
+    """bench_startup'ın alt sürecinde çalışır."""
+    from PyQt5 import QtCore
+    app = _qt_uygulamasi()
+    import dolpa
+    dolpa.ARACLAR = [{"ad": "bench", "ip": "127.0.0.1", "port": _bos_port(), "kamera": None}]
+    dolpa.CONFIG["kayit"] = False
+    dolpa.CONFIG["log_dosyasi"] = None
+    dolpa.CONFIG["karo_deposu"] = os.path.join(tempfile.gettempdir(), "dolpa_benchmark.mbtiles")
+    dolpa.CONFIG["karo_indir"] = False
+
+    class _BoyamaFiltresi(QtCore.QObject):
+        def eventFilter(self, nesne, olay):
+            if olay.type() == QtCore.QEvent.Paint:
+                print(f"ilk_boyama_ms={(time.time() - t0) * 1000:.1f}", flush=True)
+                os._exit(0)
+            return False
+
+    pencere = dolpa.ResponsiveMainWindow()
+    filtre = _BoyamaFiltresi()
+    pencere.installEventFilter(filtre)
+    ui = dolpa.Ui_MainWindow()
+    ui.setupUi(pencere)
+    pencere.show()
+    QtCore.QTimer.singleShot(30000, app.quit)
+    app.exec_()
+
+
+BENCHMARKS = {
+    "protocol": bench_protocol,
+    "telemetry_encoding": bench_telemetry_encoding,
+    "rtt": bench_rtt,
+    "ingest": bench_ingest,
+    "event_loop_lag": bench_event_loop_lag,
+    "terminal": bench_terminal,
+    "resize": bench_resize,
+    "styles": bench_styles,
+    "map_bridge": bench_map_bridge,
+    "geodesy": bench_geodesy,
+    "mission": bench_mission,
+    "anomaly": bench_anomaly,
+    "camera": bench_camera,
+    "fleet": bench_fleet,
+    "diagnostics": bench_diagnostics,
+    "startup": bench_startup,
+}
+
+
+def _karsilastir(onceki_yolu, sonuclar):
+    with open(onceki_yolu, "r", encoding="utf-8") as f:
+        onceki = json.load(f)["sonuclar"]
+    print(f"\nKarşılaştırma ({onceki_yolu}):")
+    for ad, degerler in sonuclar.items():
+        for anahtar, deger in degerler.items():
+            eski = onceki.get(ad, {}).get(anahtar)
+            if eski:
+                print(f"{ad}.{anahtar}: {eski:,.2f} -> {deger:,.2f} ({(deger - eski) / eski * 100:+.1f}%)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DOLPA GCS performans ölçümleri")
+    parser.add_argument("secilen", nargs="*", metavar="olcum",
+                        help=f"çalıştırılacak ölçümler: {', '.join(BENCHMARKS)} (varsayılan: hepsi)")
+    parser.add_argument("--json", metavar="DOSYA", help="sonuçları JSON olarak yaz")
+    parser.add_argument("--karsilastir", metavar="DOSYA", help="önceki bir JSON sonucuyla kıyasla")
+    parser.add_argument("--ilk-boyama", type=float, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+    if args.ilk_boyama is not None:
+        _ilk_boyama_olc(args.ilk_boyama)
+        return
+    bilinmeyen = set(args.secilen) - set(BENCHMARKS)
+    if bilinmeyen:
+        parser.error(f"bilinmeyen ölçüm: {', '.join(sorted(bilinmeyen))}")
+
+    sonuclar = {}
+    for ad in args.secilen or list(BENCHMARKS):
+        sonuc = BENCHMARKS[ad]()
+        sonuclar[ad] = sonuc
+        for anahtar, deger in sonuc.items():
+            print(f"{ad}.{anahtar}: {deger:,.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({
+                "zaman": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "sonuclar": sonuclar,
+            }, f, indent=4, ensure_ascii=False)
+    if args.karsilastir:
+        _karsilastir(args.karsilastir, sonuclar)
+
+
+if __name__ == "__main__":
+    main()
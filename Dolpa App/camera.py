@@ -0,0 +1,492 @@
+# -*- coding: utf-8 -*-
+"""
+DOLPA Underwater Technologies
+Kamera Akışı
+
+Araç kamerası iki biçimden biriyle okunur (adres `kamera_adresi`):
+
+    http://ip:port/yol   MJPEG (multipart/x-mixed-replace); her parçanın
+                         Content-Length başlığı olmalı. İsteğe bağlı
+                         X-Timestamp (gönderim zamanı, Unix saniye) gecikme
+                         ölçümü için kullanılır.
+    tcp://ip:port        ham kareler: HAM_BASLIK + sıkıştırılmamış pikseller
+
+Okuma ve JPEG çözme arka plan thread'inde yapılır. Kareler üç QImage
+arasında döner (üçlü tampon): işçi birine yazar, GUI birini çizer, üçüncüsü
+en yeni tam karedir. GUI yetişemezse eski kare yenisiyle değiştirilir
+(düşen kare); kuyruk oluşmaz. Görüntüler yeniden kullanılır: ham kareler
+soketten doğrudan QImage belleğine okunur, JPEG aynı QImage'ın üzerine
+çözülür. İşçi arkada kalırsa (sokette bir sonraki kare zaten bekliyorsa)
+mevcut JPEG hiç çözülmeden atlanır.
+"""
+
+import errno
+import math
+import os
+import select
+import socket
+import struct
+import threading
+import time
+import urllib.parse
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+# Ham kare başlığı: sihir, genişlik, yükseklik, biçim, gönderim zamanı, yük uzunluğu
+HAM_BASLIK = struct.Struct("!4sHHBdI")
+HAM_SIHIR = b"DKAM"
+BICIM_GRI = 0
+BICIM_RGB = 1
+# biçim -> (QImage biçimi, piksel başına bayt)
+HAM_BICIMLERI = {
+    BICIM_GRI: (QtGui.QImage.Format_Grayscale8, 1),
+    BICIM_RGB: (QtGui.QImage.Format_RGB888, 3),
+}
+
+BAGLANTI_ZAMAN_ASIMI = 3.0   # saniye
+DURMA_KONTROLU = 0.1         # bağlanırken durdurma isteğine bakma aralığı (saniye)
+DURDURMA_BEKLEMESI = 0.5     # durdur'un GUI thread'inde en fazla beklediği süre
+OKUMA_ZAMAN_ASIMI = 5.0      # saniye; bu kadar kare gelmezse yeniden bağlanılır
+YENIDEN_BAGLANMA = (0.5, 5.0)  # bekleme: başlangıç, üst sınır (saniye)
+OKUMA_TAMPONU = 64 * 1024
+MAKS_KARE = 16 * 1024 * 1024
+GECIKME_ALFA = 0.1           # gecikme ortalamasının EWMA ağırlığı
+
+
+class RateCounter:
+    """Saniyedeki olay sayısı; `pencere` saniyede bir güncellenir."""
+
+    def __init__(self, pencere=1.0):
+        self.pencere = pencere
+        self._t0 = None
+        self._adet = 0
+        self._son = None
+        self._hiz = 0.0
+
+    def tik(self, simdi=None):
+        if simdi is None:
+            simdi = time.monotonic()
+        if self._t0 is None:
+            self._t0 = simdi
+        self._adet += 1
+        self._son = simdi
+        if simdi - self._t0 >= self.pencere:
+            self._hiz = self._adet / (simdi - self._t0)
+            self._t0 = simdi
+            self._adet = 0
+
+    def hiz(self, simdi=None):
+        """Son hız; olaylar kesildiyse 0."""
+        if simdi is None:
+            simdi = time.monotonic()
+        if self._son is None or simdi - self._son > 2 * self.pencere:
+            return 0.0
+        return self._hiz
+
+
+class FrameSlots:
+    """Üçlü kare tamponu.
+
+    `yazilan` yalnızca işçiye aittir. `yayinla` onu en yeni kare yapar,
+    `al` en yeni kareyi GUI'ye geçirir. İki taraf yalnızca kilit altında
+    yer değiştirir; pikseller kopyalanmaz.
+    """
+
+    def __init__(self):
+        self._kilit = threading.Lock()
+        self.yazilan = QtGui.QImage()
+        self._hazir = QtGui.QImage()
+        self._gosterilen = QtGui.QImage()
+        self._zamanlar = (math.nan, math.nan)
+        self._yeni = False
+        self.dusen = 0   # gösterilmeden üzerine yazılan kare
+
+    def yayinla(self, gonderim, alim):
+        """Yazılan kareyi en yeni kare yap; GUI'ye haber verilmesi gerekiyorsa True."""
+        with self._kilit:
+            bildir = not self._yeni
+            if self._yeni:
+                self.dusen += 1
+            self.yazilan, self._hazir = self._hazir, self.yazilan
+            self._zamanlar = (gonderim, alim)
+            self._yeni = True
+        return bildir
+
+    def al(self):
+        """(kare, gönderim zamanı, alım zamanı); yeni kare yoksa None.
+
+        Dönen QImage bir sonraki `al` çağrısına kadar değişmez.
+        """
+        with self._kilit:
+            if not self._yeni:
+                return None
+            self._gosterilen, self._hazir = self._hazir, self._gosterilen
+            self._yeni = False
+            return (self._gosterilen,) + self._zamanlar
+
+
+class _StreamReader:
+    """Soket üzerinde satır ve sabit uzunluklu okuma.
+
+    Büyük yükler ara tampona uğramadan doğrudan hedef belleğe okunur.
+    """
+
+    def __init__(self, soket, boyut=OKUMA_TAMPONU):
+        self.soket = soket
+        self._tampon = bytearray(boyut)
+        self._bas = 0
+        self._son = 0
+
+    def _doldur(self):
+        if self._bas == self._son:
+            self._bas = self._son = 0
+        elif self._son == len(self._tampon):
+            kalan = self._son - self._bas
+            self._tampon[:kalan] = self._tampon[self._bas:self._son]
+            self._bas, self._son = 0, kalan
+        n = self.soket.recv_into(memoryview(self._tampon)[self._son:])
+        if not n:
+            raise ConnectionError("kamera akışı kapandı")
+        self._son += n
+
+    def satir(self):
+        while True:
+            i = self._tampon.find(b"\n", self._bas, self._son)
+            if i >= 0:
+                satir = bytes(self._tampon[self._bas:i + 1])
+                self._bas = i + 1
+                return satir
+            if self._son - self._bas >= len(self._tampon) // 2:
+                raise ValueError("kamera başlık satırı çok uzun")
+            self._doldur()
+
+    def oku_icine(self, hedef):
+        """`hedef` (yazılabilir memoryview) dolana kadar oku."""
+        n = len(hedef)
+        hazir = min(n, self._son - self._bas)
+        hedef[:hazir] = memoryview(self._tampon)[self._bas:self._bas + hazir]
+        self._bas += hazir
+        while hazir < n:
+            k = self.soket.recv_into(hedef[hazir:])
+            if not k:
+                raise ConnectionError("kamera akışı kapandı")
+            hazir += k
+
+    def hazir_bayt(self, en_fazla):
+        """Beklemeden okunabilecek bayt sayısı (en fazla `en_fazla`)."""
+        n = self._son - self._bas
+        if n < en_fazla and select.select([self.soket], [], [], 0)[0]:
+            n += len(self.soket.recv(en_fazla - n, socket.MSG_PEEK))
+        return n
+
+
+def _basliklar(okuyucu):
+    # Boş satıra kadar "Ad: değer" satırları; sınır ve baştaki boş satırlar atlanır
+    basliklar = {}
+    while True:
+        satir = okuyucu.satir().strip()
+        if not satir:
+            if basliklar:
+                return basliklar
+            continue
+        if satir.startswith(b"--") and not basliklar:
+            continue
+        ad, _, deger = satir.decode("latin-1").partition(":")
+        basliklar[ad.strip().lower()] = deger.strip()
+
+
+class CameraWorker(QtCore.QObject):
+    """Kamera akışını arka plan thread'inde okuyup çözen işçi.
+
+    Kopan bağlantı artan aralıklarla yeniden kurulur. `kare_hazir`, GUI
+    önceki kareyi aldıktan sonraki ilk yeni karede bir kez yayınlanır.
+    """
+
+    kare_hazir = QtCore.pyqtSignal()
+    durum_degisti = QtCore.pyqtSignal(str)
+
+    def __init__(self, adres, parent=None):
+        super().__init__(parent)
+        self.adres = adres
+        self._parca = urllib.parse.urlsplit(adres)
+        if self._parca.scheme not in ("http", "tcp") or not self._parca.hostname:
+            raise ValueError(f"desteklenmeyen kamera adresi: {adres}")
+        self.kareler = FrameSlots()
+        self.cozum = RateCounter()
+        self._dur = threading.Event()
+        self._soket = None
+        self._thread = None
+        self.alinan = 0        # tamamı alınan kare
+        self.atlanan = 0       # arkada kalındığı için çözülmeden atlanan kare
+        self.hatali = 0        # çözülemeyen kare
+        self.bayt = 0
+        self.cozme_ms = 0.0    # son çözme süresi
+
+    def baslat(self):
+        self._dur.clear()
+        self._thread = threading.Thread(target=self._calis, name="CameraWorker", daemon=True)
+        self._thread.start()
+
+    def durdur(self):
+        """Thread'i durdur. GUI thread'inden çağrılır; kısa bir süreden fazla
+        beklenmez, bitmemiş thread (daemon) kendi kendine çıkar."""
+        self._dur.set()
+        soket = self._soket
+        if soket is not None:
+            try:
+                soket.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+        if self._thread is not None:
+            self._thread.join(DURDURMA_BEKLEMESI)
+            self._thread = None
+
+    def _baglan(self, port):
+        # Engellemeyen connect; durdurma isteğine DURMA_KONTROLU aralıklarla bakılır.
+        # Ad çözümleme (getaddrinfo) engelleyicidir, adres IP ise anlıktır
+        aile, tur, proto, _, adres = socket.getaddrinfo(
+            self._parca.hostname, port, type=socket.SOCK_STREAM)[0]
+        self._soket = soket = socket.socket(aile, tur, proto)
+        soket.setblocking(False)
+        hata = soket.connect_ex(adres)
+        if hata not in (0, errno.EINPROGRESS, errno.EWOULDBLOCK):
+            raise OSError(hata, os.strerror(hata))
+        son = time.monotonic() + BAGLANTI_ZAMAN_ASIMI
+        while hata:
+            if self._dur.is_set():
+                raise OSError("kamera durduruldu")
+            kalan = son - time.monotonic()
+            if kalan <= 0:
+                raise socket.timeout("bağlantı zaman aşımı")
+            _, yazilabilir, hatali = select.select(
+                [], [soket], [soket], min(kalan, DURMA_KONTROLU))
+            if yazilabilir or hatali:
+                hata = soket.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                if hata:
+                    raise OSError(hata, os.strerror(hata))
+                break
+        soket.settimeout(OKUMA_ZAMAN_ASIMI)
+
+    def _calis(self):
+        bekleme = YENIDEN_BAGLANMA[0]
+        port = self._parca.port or (80 if self._parca.scheme == "http" else 5600)
+        while not self._dur.is_set():
+            onceki = self.alinan
+            try:
+                self.durum_degisti.emit("Kameraya bağlanılıyor...")
+                self._baglan(port)
+                okuyucu = _StreamReader(self._soket)
+                if self._parca.scheme == "http":
+                    self._mjpeg_oku(okuyucu)
+                else:
+                    self._ham_oku(okuyucu)
+            except (OSError, ValueError) as e:
+                if self._dur.is_set():
+                    break
+                self.durum_degisti.emit(f"Kamera bağlantısı yok: {e}")
+            finally:
+                if self._soket is not None:
+                    self._soket.close()
+                    self._soket = None
+            if self.alinan > onceki:
+                bekleme = YENIDEN_BAGLANMA[0]
+            self._dur.wait(bekleme)
+            bekleme = min(bekleme * 2, YENIDEN_BAGLANMA[1])
+
+    def _yayinla(self, gonderim):
+        self.cozum.tik()
+        if self.kareler.yayinla(gonderim, time.time()):
+            self.kare_hazir.emit()
+
+    def _mjpeg_oku(self, okuyucu):
+        yol = self._parca.path or "/"
+        if self._parca.query:
+            yol += "?" + self._parca.query
+        self._soket.sendall(
+            f"GET {yol} HTTP/1.1\r\nHost: {self._parca.netloc}\r\n"
+            f"Connection: close\r\n\r\n".encode("latin-1"))
+        durum = okuyucu.satir().split()
+        if len(durum) < 2 or durum[1] != b"200":
+            raise ValueError(f"kamera yanıtı: {b' '.join(durum).decode('latin-1')}")
+        if "multipart" not in _basliklar(okuyucu).get("content-type", ""):
+            raise ValueError("kamera MJPEG akışı göndermiyor")
+        self.durum_degisti.emit("Kamera bağlı")
+
+        # Çözücü nesneler bu thread'de kurulur ve her karede yeniden kullanılır
+        tampon = QtCore.QBuffer()
+        cozucu = QtGui.QImageReader()
+        veri = bytearray(OKUMA_TAMPONU)
+        while not self._dur.is_set():
+            basliklar = _basliklar(okuyucu)
+            try:
+                uzunluk = int(basliklar["content-length"])
+            except (KeyError, ValueError):
+                raise ValueError("MJPEG parçasında Content-Length yok") from None
+            if not 0 < uzunluk <= MAKS_KARE:
+                raise ValueError(f"geçersiz kare boyutu: {uzunluk}")
+            if len(veri) < uzunluk:
+                veri = bytearray(2 * uzunluk)
+            jpeg = memoryview(veri)[:uzunluk]
+            okuyucu.oku_icine(jpeg)
+            self.alinan += 1
+            self.bayt += uzunluk
+            if okuyucu.hazir_bayt(uzunluk) >= uzunluk:
+                # Daha yeni bir kare zaten gelmiş; bunu çözmek boşa iş
+                self.atlanan += 1
+                continue
+            try:
+                gonderim = float(basliklar.get("x-timestamp", "nan"))
+            except ValueError:
+                gonderim = math.nan
+            if self._coz(jpeg, tampon, cozucu):
+                self._yayinla(gonderim)
+
+    def _coz(self, jpeg, tampon, cozucu):
+        t0 = time.perf_counter()
+        tampon.close()
+        tampon.setData(jpeg.tobytes())
+        tampon.open(QtCore.QIODevice.ReadOnly)
+        cozucu.setDevice(tampon)
+        # Boyut ve biçim aynıysa Qt mevcut QImage belleğinin üzerine çözer
+        if not cozucu.read(self.kareler.yazilan):
+            self.hatali += 1
+            return False
+        self.cozme_ms = (time.perf_counter() - t0) * 1000
+        return True
+
+    def _ham_oku(self, okuyucu):
+        self.durum_degisti.emit("Kamera bağlı")
+        baslik = bytearray(HAM_BASLIK.size)
+        while not self._dur.is_set():
+            okuyucu.oku_icine(memoryview(baslik))
+            sihir, genislik, yukseklik, bicim, gonderim, uzunluk = HAM_BASLIK.unpack(baslik)
+            if sihir != HAM_SIHIR:
+                raise ValueError("ham kare akışında senkron kayboldu")
+            if bicim not in HAM_BICIMLERI:
+                raise ValueError(f"bilinmeyen ham kare biçimi: {bicim}")
+            qbicim, bpp = HAM_BICIMLERI[bicim]
+            satir = genislik * bpp
+            if uzunluk != satir * yukseklik or not 0 < uzunluk <= MAKS_KARE:
+                raise ValueError(f"geçersiz ham kare: {genislik}x{yukseklik}, {uzunluk} bayt")
+
+            kare = self.kareler.yazilan
+            if kare.width() != genislik or kare.height() != yukseklik or kare.format() != qbicim:
+                kare = self.kareler.yazilan = QtGui.QImage(genislik, yukseklik, qbicim)
+            bellek = kare.bits()
+            bellek.setsize(kare.sizeInBytes())
+            hedef = memoryview(bellek)
+            adim = kare.bytesPerLine()
+            if adim == satir:
+                okuyucu.oku_icine(hedef[:uzunluk])
+            else:
+                # QImage satırları 4 bayta hizalı; satır satır oku
+                for y in range(yukseklik):
+                    okuyucu.oku_icine(hedef[y * adim:y * adim + satir])
+            self.alinan += 1
+            self.bayt += uzunluk
+            self._yayinla(gonderim)
+
+    def istatistik(self):
+        return {
+            "alinan": self.alinan,
+            "atlanan": self.atlanan,
+            "dusen": self.kareler.dusen,
+            "hatali": self.hatali,
+            "cozum_fps": self.cozum.hiz(),
+            "cozme_ms": self.cozme_ms,
+            "bayt": self.bayt,
+        }
+
+
+class VideoWidget(QtWidgets.QWidget):
+    """En yeni kamera karesini en-boy oranını koruyarak çizen panel.
+
+    Karenin üzerine çözme/gösterim hızı, gecikme ve düşen kare sayısı yazılır.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(QtCore.Qt.WA_OpaquePaintEvent)
+        self._isci = None
+        self._kare = None
+        self._gonderim = math.nan
+        self._cizilmedi = False
+        self._durum = "Kamera yok"
+        self.gosterim = RateCounter()
+        self.gosterilen = 0    # ekrana çizilen farklı kare
+        self.gecikme_ms = math.nan
+        self._yazi = QtGui.QFont(self.font())
+        self._yazi.setPixelSize(11)
+        # Akış durursa sayaçlar yine de güncellensin
+        self._timer = QtCore.QTimer(self)
+        self._timer.timeout.connect(self.update)
+        self._timer.start(1000)
+
+    def baglan(self, isci):
+        """Paneli `isci`nin akışına bağla; önceki işçinin bağlantısı kesilir."""
+        self.ayir()
+        self._isci = isci
+        isci.kare_hazir.connect(self._kare_geldi)
+        isci.durum_degisti.connect(self._durum_geldi)
+        self.update()
+
+    def ayir(self, durum="Kamera yok"):
+        """Paneli akıştan ayır; son kare ve ölçümler silinir, `durum` yazılır."""
+        if self._isci is not None:
+            self._isci.kare_hazir.disconnect(self._kare_geldi)
+            self._isci.durum_degisti.disconnect(self._durum_geldi)
+            self._isci = None
+        self._kare = None
+        self._gonderim = math.nan
+        self._cizilmedi = False
+        self._durum = durum
+        self.gosterim = RateCounter()
+        self.gecikme_ms = math.nan
+        self.update()
+
+    @QtCore.pyqtSlot(str)
+    def _durum_geldi(self, durum):
+        self._durum = durum
+        self.update()
+
+    @QtCore.pyqtSlot()
+    def _kare_geldi(self):
+        kare = self._isci.kareler.al()
+        if kare is None:
+            return
+        self._kare, self._gonderim, _ = kare
+        self._cizilmedi = True
+        self.update()
+
+    def paintEvent(self, olay):
+        p = QtGui.QPainter(self)
+        p.fillRect(self.rect(), QtCore.Qt.black)
+        p.setPen(QtCore.Qt.white)
+        p.setFont(self._yazi)
+        if self._kare is None or self._kare.isNull():
+            p.drawText(self.rect(), QtCore.Qt.AlignCenter | QtCore.Qt.TextWordWrap, self._durum)
+            return
+        boyut = self._kare.size().scaled(self.size(), QtCore.Qt.KeepAspectRatio)
+        hedef = QtCore.QRect(QtCore.QPoint(0, 0), boyut)
+        hedef.moveCenter(self.rect().center())
+        p.drawImage(hedef, self._kare)
+        if self._cizilmedi:
+            # Gösterim hızı ve gecikme ekrana çizilen karelerden ölçülür
+            self._cizilmedi = False
+            self.gosterilen += 1
+            self.gosterim.tik()
+            if self._gonderim == self._gonderim:
+                gecikme = (time.time() - self._gonderim) * 1000
+                if self.gecikme_ms != self.gecikme_ms:
+                    self.gecikme_ms = gecikme
+                else:
+                    self.gecikme_ms += GECIKME_ALFA * (gecikme - self.gecikme_ms)
+
+        ist = self._isci.istatistik()
+        gecikme = "-" if self.gecikme_ms != self.gecikme_ms else f"{self.gecikme_ms:.0f} ms"
+        metin = (f"çözme {ist['cozum_fps']:.1f} fps\ngösterim {self.gosterim.hiz():.1f} fps\n"
+                 f"gecikme {gecikme}  düşen {ist['dusen'] + ist['atlanan']}")
+        alan = self.rect().adjusted(4, 2, -4, -2)
+        p.fillRect(p.boundingRect(alan, QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop, metin),
+                   QtGui.QColor(0, 0, 0, 140))
+        p.drawText(alan, QtCore.Qt.AlignLeft | QtCore.Qt.AlignTop, metin)
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+DOLPA Underwater Technologies
+Komut Kuyruğu
+
+Araca giden komutlar öncelik sırasıyla kuyruğa alınır. Her komutun bir sıra
+numarası (`sira`) vardır ve aracın onayı (aynı istek_id ile gelen yanıt)
+beklenir. Aynı anda en fazla `pencere` komut onay bekler; böylece art arda
+gelen komutlar için her gidiş-dönüş ayrı ayrı beklenmez. Süresinde
+onaylanmayan komut aynı sıra numarasıyla yeniden gönderilir, araç
+tekrarları bu numaradan ayırt eder.
+
+Öncelik sınıfları:
+
+    ACIL    acil yüzeye çıkış / durdurma; kuyruğun önüne geçer ve pencere
+            doluyken de beklemeden gönderilir
+    NORMAL  kalibrasyon, takip başlatma gibi kısa komutlar
+    TOPLU   çok noktalı görev yüklemeleri
+"""
+
+import heapq
+import itertools
+import time
+
+# Öncelik sınıfları (küçük olan önce)
+ACIL = 0
+NORMAL = 1
+TOPLU = 2
+
+# Komut durumları
+KUYRUKTA = "kuyrukta"
+GONDERILDI = "gonderildi"
+YENIDEN = "yeniden"
+ONAYLANDI = "onaylandi"
+REDDEDILDI = "reddedildi"
+BASARISIZ = "basarisiz"
+BAGLI_DEGIL = "bagli_degil"
+
+PENCERE = 4          # aynı anda onay bekleyen en fazla komut
+ZAMAN_ASIMI = 2.0    # bir denemenin onay süresi (saniye)
+DENEME = 3           # komut başına en fazla gönderim
+
+_ZAMAN_ASIMI_HATASI = "zaman aşımı"  # VehicleSession.istek'in zaman aşımı hatası
+
+
+class Command:
+    """Kuyruktaki tek komut."""
+
+    __slots__ = ("sira", "tur", "veri", "oncelik", "deneme", "gonderim")
+
+    def __init__(self, sira, tur, veri, oncelik):
+        self.sira = sira
+        self.tur = tur
+        self.veri = veri
+        self.oncelik = oncelik
+        self.deneme = 0
+        self.gonderim = 0.0
+
+
+class CommandQueue:
+    """Öncelikli, pencereli ve onaylı komut gönderimi.
+
+    Gönderim `oturum.istek` üzerinden yapılır; zaman aşımını oturum izler.
+    Her durum değişikliği `dinleyici(komut, durum, ayrinti)` ile bildirilir.
+    Oturumla aynı thread'de kullanılmalıdır. Bağlantı koparsa onay bekleyen
+    ve kuyruktaki komutlar `bosalt` ile düşürülür; aracın durumu bilinmediği
+    için yeniden bağlanınca kendiliğinden gönderilmezler.
+    """
+
+    def __init__(self, oturum, dinleyici, pencere=PENCERE, zaman_asimi=ZAMAN_ASIMI,
+                 deneme=DENEME):
+        if pencere < 1 or deneme < 1:
+            raise ValueError("komut penceresi ve deneme sayısı en az 1 olmalı")
+        self.oturum = oturum
+        self.dinleyici = dinleyici
+        self.pencere = pencere
+        self.zaman_asimi = zaman_asimi
+        self.deneme = deneme
+        self._sira = itertools.count(1)
+        self._kuyruk = []   # (öncelik, sıra, komut)
+        self._ucusta = {}   # sıra -> onay bekleyen komut
+        self.onaylanan = 0
+        self.yeniden_gonderilen = 0
+        self.basarisiz = 0
+
+    def __len__(self):
+        return len(self._kuyruk)
+
+    @property
+    def ucusta(self):
+        return len(self._ucusta)
+
+    def ekle(self, tur, veri, oncelik=NORMAL):
+        komut = Command(next(self._sira), tur, veri, oncelik)
+        if not self.oturum.bagli_mi():
+            self.basarisiz += 1
+            self.dinleyici(komut, BAGLI_DEGIL, "")
+            return komut
+        heapq.heappush(self._kuyruk, (oncelik, komut.sira, komut))
+        self._pompala()
+        if komut.deneme == 0:
+            # Pencere dolu: onay bekleyenlerden biri bitince gönderilecek
+            self.dinleyici(komut, KUYRUKTA, f"{len(self._kuyruk)} komut bekliyor")
+        return komut
+
+    def bosalt(self, sebep):
+        """Kuyruktaki komutları düşür (onay bekleyenleri oturum iptal eder)."""
+        kuyruk, self._kuyruk = self._kuyruk, []
+        for _, _, komut in sorted(kuyruk):
+            self.basarisiz += 1
+            self.dinleyici(komut, BAGLI_DEGIL, sebep)
+
+    def _pompala(self):
+        while self._kuyruk:
+            oncelik, _, komut = self._kuyruk[0]
+            if oncelik != ACIL and len(self._ucusta) >= self.pencere:
+                return
+            heapq.heappop(self._kuyruk)
+            self._gonder(komut)
+
+    def _gonder(self, komut):
+        komut.deneme += 1
+        komut.gonderim = time.monotonic()
+        self._ucusta[komut.sira] = komut
+        if komut.deneme == 1:
+            self.dinleyici(komut, GONDERILDI, "")
+        else:
+            self.yeniden_gonderilen += 1
+            self.dinleyici(komut, YENIDEN, f"{komut.deneme}/{self.deneme}")
+        self.oturum.istek(dict(komut.veri, sira=komut.sira),
+                          lambda yanit, hata: self._yanit(komut, yanit, hata),
+                          self.zaman_asimi)
+
+    def _yanit(self, komut, yanit, hata):
+        self._ucusta.pop(komut.sira, None)
+        if hata is None:
+            durum = yanit.get("durum", "tamam") if isinstance(yanit, dict) else "tamam"
+            if durum == "tamam":
+                self.onaylanan += 1
+                gecen = (time.monotonic() - komut.gonderim) * 1000
+                self.dinleyici(komut, ONAYLANDI, f"{gecen:.0f} ms")
+            else:
+                self.basarisiz += 1
+                self.dinleyici(komut, REDDEDILDI, str(yanit.get("hata") or durum))
+        elif hata == _ZAMAN_ASIMI_HATASI and komut.deneme < self.deneme:
+            heapq.heappush(self._kuyruk, (komut.oncelik, komut.sira, komut))
+        else:
+            self.basarisiz += 1
+            self.dinleyici(komut, BASARISIZ, hata)
+        if self.oturum.bagli_mi():
+            self._pompala()
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+"""
+DOLPA Underwater Technologies
+Tanılama Modu
+
+İstasyonun takıldığı anları yakalamak için isteğe bağlı araçlar (komut
+satırında `--tanilama` ya da `DOLPA_TANILAMA=1`):
+
+    StallWatchdog  GUI olay döngüsü gecikmesini sık tetiklenen bir QTimer ile
+                   ölçer; nabız eşikten uzun süre gelmezse ayrı bir thread GUI
+                   thread'inin o anki yığınını günlüğe yazar
+    SlotTimer      zamanlayıcı ve buton slotlarının süresini tutar, eşiği
+                   aşan çağrıyı günlüğe yazar
+    Profiler       istek üzerine cProfile (GUI thread'i) ve tracemalloc
+                   görüntülerini dosyaya döker
+
+Tüm mesajlar `yaz(mesaj, seviye)` ile (terminal günlüğü) gider; yığınlar ve
+profil özetleri ayrıntı seviyesindedir, dosyada her zaman bulunur.
+"""
+
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+import traceback
+
+import numpy as np
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+import linkmetrics
+import terminal_log
+
+NABIZ_MS = 20                 # olay döngüsü nabız aralığı
+TAKILMA_ESIGI_MS = 200.0      # bundan uzun nabızsızlık takılma sayılır
+SLOT_ESIGI_MS = 50.0          # bundan uzun süren slot günlüğe yazılır
+BELLEK_CERCEVESI = 25         # tracemalloc'un tuttuğu yığın derinliği
+OZET_SATIRI = 15              # profil/bellek özetindeki satır sayısı
+
+# Kısayollar (ana pencerede)
+PROFIL_KISAYOLU = "Ctrl+Shift+P"
+BELLEK_KISAYOLU = "Ctrl+Shift+M"
+OZET_KISAYOLU = "Ctrl+Shift+T"
+
+
+def etkin_mi(bayrak=False):
+    """Komut satırı bayrağı ya da DOLPA_TANILAMA ortam değişkeni."""
+    return bool(bayrak) or os.environ.get("DOLPA_TANILAMA", "") not in ("", "0")
+
+
+class StallWatchdog(QtCore.QObject):
+    """GUI olay döngüsü gecikmesi ve takılmalarda GUI thread'inin yığını.
+
+    GUI thread'inde oluşturulmalıdır. Gecikmeler linkmetrics'in log ölçekli
+    kovalarında birikir; izleyici thread yalnızca son nabzın zamanını okur.
+    """
+
+    def __init__(self, yaz, esik_ms=TAKILMA_ESIGI_MS, aralik_ms=NABIZ_MS, parent=None):
+        super().__init__(parent)
+        self.yaz = yaz
+        self.esik_ms = esik_ms
+        self.aralik_ms = aralik_ms
+        self.gecikme_kovalari = np.zeros(len(linkmetrics.KOVALAR_MS) + 1, dtype=np.int64)
+        self.en_buyuk_ms = 0.0
+        self.takilma = 0
+        self._gui_thread = threading.get_ident()
+        self._son = None         # son nabzın zamanı (GUI thread'i yazar)
+        self._raporlanan = None  # yığını yazılmış takılmanın nabzı
+        self._dur = threading.Event()
+        self._thread = None
+        self._timer = QtCore.QTimer(self)
+        self._timer.setTimerType(QtCore.Qt.PreciseTimer)
+        self._timer.timeout.connect(self._nabiz)
+
+    def baslat(self):
+        self._son = time.monotonic()
+        self._timer.start(self.aralik_ms)
+        self._dur.clear()
+        self._thread = threading.Thread(target=self._izle, name="StallWatchdog", daemon=True)
+        self._thread.start()
+
+    def durdur(self):
+        self._timer.stop()
+        if self._thread is not None:
+            self._dur.set()
+            self._thread.join()
+            self._thread = None
+
+    def _nabiz(self):
+        simdi = time.monotonic()
+        gecikme = max(0.0, (simdi - self._son) * 1000 - self.aralik_ms)
+        self._son = simdi
+        self.gecikme_kovalari[int(np.searchsorted(linkmetrics.KOVALAR_MS, gecikme))] += 1
+        self.en_buyuk_ms = max(self.en_buyuk_ms, gecikme)
+        if gecikme >= self.esik_ms:
+            self.takilma += 1
+            self.yaz(f"Tanılama: GUI thread'i {gecikme:.0f} ms takıldı.", terminal_log.UYARI)
+
+    def _izle(self):
+        # Takılma sürerken bir kez yığın alınır; GUI dönünce _nabiz süreyi yazar
+        while not self._dur.wait(self.esik_ms / 4000):
+            son = self._son
+            gecen = (time.monotonic() - son) * 1000 - self.aralik_ms
+            if son == self._raporlanan or gecen < self.esik_ms:
+                continue
+            self._raporlanan = son
+            cerceve = sys._current_frames().get(self._gui_thread)
+            yigin = "".join(traceback.format_stack(cerceve)) if cerceve else "(yığın alınamadı)\n"
+            self.yaz(f"Tanılama: GUI thread'i {gecen:.0f} ms'dir yanıt vermiyor, yığın:\n"
+                     f"{yigin.rstrip()}", terminal_log.HATA_AYIKLAMA)
+
+    def ozet(self):
+        adet = int(self.gecikme_kovalari.sum())
+        if adet == 0:
+            return "Olay döngüsü: ölçüm yok"
+        p50 = linkmetrics.yuzdelik(self.gecikme_kovalari, 50)
+        p99 = linkmetrics.yuzdelik(self.gecikme_kovalari, 99)
+        return (f"Olay döngüsü gecikmesi: p50 {p50:.1f} ms, p99 {p99:.1f} ms, "
+                f"en büyük {self.en_buyuk_ms:.0f} ms, {self.takilma} takılma ({adet} nabız)")
+
+
+class SlotTimer:
+    """Argümansız slotları sarıp çağrı sayısı, toplam ve en büyük süreyi tutar."""
+
+    def __init__(self, yaz, esik_ms=SLOT_ESIGI_MS):
+        self.yaz = yaz
+        self.esik_ms = esik_ms
+        self.sureler = {}  # ad -> [çağrı, toplam ms, en büyük ms]
+
+    def sar(self, fonk, ad=None):
+        ad = ad or fonk.__name__
+        kayit = self.sureler.setdefault(ad, [0, 0.0, 0.0])
+
+        # Sarmalayıcı argüman almaz; PyQt sinyal argümanlarını (clicked'in
+        # checked'i gibi) göndermez
+        def sarili():
+            t0 = time.perf_counter()
+            try:
+                return fonk()
+            finally:
+                ms = (time.perf_counter() - t0) * 1000
+                kayit[0] += 1
+                kayit[1] += ms
+                kayit[2] = max(kayit[2], ms)
+                if ms >= self.esik_ms:
+                    self.yaz(f"Tanılama: {ad} {ms:.0f} ms sürdü.", terminal_log.UYARI)
+
+        sarili.__name__ = ad
+        return sarili
+
+    def ozet(self):
+        satirlar = []
+        for ad, (adet, toplam, en_buyuk) in sorted(
+                self.sureler.items(), key=lambda k: -k[1][1]):
+            if adet:
+                satirlar.append(f"  {ad}: {adet} çağrı, ort. {toplam / adet:.2f} ms, "
+                                f"en büyük {en_buyuk:.1f} ms, toplam {toplam:.0f} ms")
+        return "\n".join(["Slot süreleri:"] + satirlar) if satirlar else "Slot süreleri: çağrı yok"
+
+
+class Profiler:
+    """İstek üzerine cProfile ve tracemalloc görüntülerini `klasor`e döker.
+
+    cProfile yalnızca başlatıldığı thread'i (GUI) ölçer. tracemalloc ilk
+    istekte başlar; sonraki her istekte görüntü alınır ve bir öncekiyle
+    kıyaslanır.
+    """
+
+    def __init__(self, yaz, klasor):
+        self.yaz = yaz
+        self.klasor = klasor
+        self._profil = None
+        self._onceki_bellek = None
+        self._sira = itertools.count(1)
+
+    def _yol(self, onek, uzanti):
+        os.makedirs(self.klasor, exist_ok=True)
+        zaman = time.strftime("%Y%m%d_%H%M%S")
+        return os.path.join(self.klasor, f"{onek}_{zaman}_{next(self._sira)}.{uzanti}")
+
+    @property
+    def profil_aktif(self):
+        return self._profil is not None
+
+    def profil_degistir(self):
+        """Profil kapalıysa başlat, açıksa durdurup dosyaya yaz."""
+        if self._profil is None:
+            self._profil = cProfile.Profile()
+            self._profil.enable()
+            self.yaz(f"Tanılama: profil başladı, durdurmak için {PROFIL_KISAYOLU}.")
+            return None
+        profil, self._profil = self._profil, None
+        profil.disable()
+        try:
+            yol = self._yol("profil", "prof")
+            profil.dump_stats(yol)
+        except OSError as e:
+            self.yaz(f"Tanılama: profil yazılamadı: {e}", terminal_log.HATA)
+            return None
+        metin = io.StringIO()
+        pstats.Stats(profil, stream=metin).sort_stats("cumulative").print_stats(OZET_SATIRI)
+        self.yaz(f"Tanılama: profil yazıldı: {yol}")
+        self.yaz(metin.getvalue().strip(), terminal_log.HATA_AYIKLAMA)
+        return yol
+
+    def bellek_dok(self):
+        """tracemalloc'u başlat ya da görüntüyü dosyaya yaz."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(BELLEK_CERCEVESI)
+            self._onceki_bellek = None
+            self.yaz(f"Tanılama: bellek izleme başladı, görüntü için {BELLEK_KISAYOLU}.")
+            return None
+        goruntu = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__),))
+        try:
+            yol = self._yol("bellek", "tracemalloc")
+            goruntu.dump(yol)
+        except OSError as e:
+            self.yaz(f"Tanılama: bellek görüntüsü yazılamadı: {e}", terminal_log.HATA)
+            return None
+        if self._onceki_bellek is None:
+            baslik = "En çok bellek ayıran satırlar:"
+            istatistik = goruntu.statistics("lineno")
+        else:
+            baslik = "Önceki görüntüden beri en çok büyüyen satırlar:"
+            istatistik = goruntu.compare_to(self._onceki_bellek, "lineno")
+        self._onceki_bellek = goruntu
+        guncel, tepe = tracemalloc.get_traced_memory()
+        self.yaz(f"Tanılama: bellek görüntüsü yazıldı: {yol} "
+                 f"(şu an {guncel / 1e6:.1f} MB, tepe {tepe / 1e6:.1f} MB)")
+        self.yaz("\n".join([baslik] + [str(s) for s in istatistik[:OZET_SATIRI]]),
+                 terminal_log.HATA_AYIKLAMA)
+        return yol
+
+    def kapat(self):
+        if self._profil is not None:
+            self.profil_degistir()
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+            self._onceki_bellek = None
+
+
+class Diagnostics(QtCore.QObject):
+    """Tanılama modunun parçalarını bir arada kurar; GUI thread'inde oluşturulur."""
+
+    def __init__(self, yaz, klasor, takilma_esigi_ms=TAKILMA_ESIGI_MS,
+                 slot_esigi_ms=SLOT_ESIGI_MS, parent=None):
+        super().__init__(parent)
+        self.yaz = yaz
+        self.bekci = StallWatchdog(yaz, takilma_esigi_ms, parent=self)
+        self.zamanlayici = SlotTimer(yaz, slot_esigi_ms)
+        self.profil = Profiler(yaz, klasor)
+        self._kisayollar = []
+
+    def sar(self, fonk, ad=None):
+        return self.zamanlayici.sar(fonk, ad)
+
+    def kisayollari_kur(self, pencere):
+        for tus, islev in ((PROFIL_KISAYOLU, self.profil.profil_degistir),
+                           (BELLEK_KISAYOLU, self.profil.bellek_dok),
+                           (OZET_KISAYOLU, self.ozet_yaz)):
+            kisayol = QtWidgets.QShortcut(QtGui.QKeySequence(tus), pencere)
+            kisayol.setContext(QtCore.Qt.ApplicationShortcut)
+            kisayol.activated.connect(islev)
+            self._kisayollar.append(kisayol)
+
+    def baslat(self):
+        self.bekci.baslat()
+        self.yaz(f"Tanılama modu açık: takılma eşiği {self.bekci.esik_ms:.0f} ms, "
+                 f"slot eşiği {self.zamanlayici.esik_ms:.0f} ms. {PROFIL_KISAYOLU} profil, "
+                 f"{BELLEK_KISAYOLU} bellek, {OZET_KISAYOLU} özet.")
+
+    def ozet(self):
+        return f"{self.bekci.ozet()}\n{self.zamanlayici.ozet()}"
+
+    def ozet_yaz(self):
+        self.yaz(f"Tanılama özeti:\n{self.ozet()}")
+
+    def durdur(self):
+        self.bekci.durdur()
+        self.profil.kapat()
+        self.ozet_yaz()
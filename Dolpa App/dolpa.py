@@ -1,11 +1,29 @@
 from PyQt5 import QtCore, QtGui, QtWidgets
 from PyQt5 import QtWebEngineWidgets
 import os
-import math
-import socket
 import json
+import math
 import subprocess
 import sys
+import time
+import argparse
+import functools
+import anomaly
+import camera
+import commands
+import diagnostics
+import network
+import recorder
+import replay
+import layout
+import linkmetrics
+import mapview
+import mission
+import telemetry
+import terminal_log
+import tiles
+import viewmodel
+import numpy as np
 from styles import *
 
 def resource_path(relative_path):
@@ -25,12 +43,39 @@ def load_config():
         else:
             # Default config settings
             default_config = {
-                "arac_ip": "192.168.1.10",
-                "arac_port": 5000,
+                "araclar": [{"ad": "DOLPA-1", "ip": "192.168.1.10", "port": 5000}],  # ad, ip, port, isteğe bağlı kamera
                 "pencere_boyutu": {"width": 960, "height": 587},
                 "minimum_boyut": {"width": 800, "height": 500},
                 "baglanti_kontrol_araligi": 15000,  # 15 saniye (daha az sık kontrol)
-                "datetime_guncelleme_araligi": 1000
+                "datetime_guncelleme_araligi": 1000,
+                "telemetri_hizi": 10,  # Hz
+                "telemetri_kapasitesi": 131072,  # örnek
+                "kayit": True,
+                "kayit_klasoru": "kayitlar",
+                "log_dosyasi": "kayitlar/terminal.log",
+                "terminal_satir_siniri": 2000,
+                "karo_deposu": "harita/karolar.mbtiles",
+                "karo_adresi": "https://tile.openstreetmap.org/{z}/{x}/{y}.png",
+                "karo_indir": True,
+                "harita_guncelleme_hizi": 4,  # Hz
+                "gorev_derinligi": 5.0,  # metre
+                "gorev_hizi": 1.0,  # m/s
+                "tarama_deseni": "serit",  # serit / spiral
+                "tarama_araligi": 20.0,  # metre
+                "anomali_kanallari": ["kablo_sinyali", "derinlik", "yunuslama", "yalpa"],
+                "anomali_esigi": 4.0,  # standart sapma
+                "anomali_araligi": 100,  # ms
+                "komut_penceresi": 4,  # aynı anda onay bekleyen en fazla komut
+                "komut_zaman_asimi": 2.0,  # saniye
+                "komut_deneme": 3,
+                "metrik_araligi": 1000,  # ms
+                "rtt_yoklama_araligi": 5000,  # ms, başka istek RTT ölçmediyse yoklanır; 0 kapalı
+                "metrik_portu": None,  # örn. 9108: http://127.0.0.1:9108/metrics
+                "metrik_dosyasi": None,  # örn. "kayitlar/baglanti.json"
+                "tanilama_klasoru": "kayitlar/tanilama",  # --tanilama: profil ve bellek dökümleri
+                "takilma_esigi": 200,  # ms, GUI thread yığını yazılır
+                "slot_esigi": 50,  # ms, yavaş slot uyarısı
+                "kamera_adresi": "http://192.168.1.10:8080/akis"  # MJPEG (http://) ya da ham (tcp://)
             }
             # Create default config file
             with open(config_path, 'w', encoding='utf-8') as f:
@@ -40,18 +85,117 @@ def load_config():
         print(f"Config yüklenirken hata: {e}")
         # In case of error, return default settings
         return {
-            "arac_ip": "192.168.1.10",
-            "arac_port": 5000,
+            "araclar": [{"ad": "DOLPA-1", "ip": "192.168.1.10", "port": 5000}],  # ad, ip, port, isteğe bağlı kamera
             "pencere_boyutu": {"width": 960, "height": 587},
             "minimum_boyut": {"width": 800, "height": 500},
             "baglanti_kontrol_araligi": 15000,  # 15 saniye (daha az sık kontrol)
-            "datetime_guncelleme_araligi": 1000
+            "datetime_guncelleme_araligi": 1000,
+            "telemetri_hizi": 10,  # Hz
+            "telemetri_kapasitesi": 131072,  # örnek
+            "kayit": True,
+            "kayit_klasoru": "kayitlar",
+            "log_dosyasi": "kayitlar/terminal.log",
+            "terminal_satir_siniri": 2000,
+            "karo_deposu": "harita/karolar.mbtiles",
+            "karo_adresi": "https://tile.openstreetmap.org/{z}/{x}/{y}.png",
+            "karo_indir": True,
+            "harita_guncelleme_hizi": 4,  # Hz
+            "gorev_derinligi": 5.0,  # metre
+            "gorev_hizi": 1.0,  # m/s
+            "tarama_deseni": "serit",  # serit / spiral
+            "tarama_araligi": 20.0,  # metre
+            "anomali_kanallari": ["kablo_sinyali", "derinlik", "yunuslama", "yalpa"],
+            "anomali_esigi": 4.0,  # standart sapma
+            "anomali_araligi": 100,  # ms
+            "komut_penceresi": 4,  # aynı anda onay bekleyen en fazla komut
+            "komut_zaman_asimi": 2.0,  # saniye
+            "komut_deneme": 3,
+            "metrik_araligi": 1000,  # ms
+            "rtt_yoklama_araligi": 5000,  # ms, başka istek RTT ölçmediyse yoklanır; 0 kapalı
+            "metrik_portu": None,  # örn. 9108: http://127.0.0.1:9108/metrics
+            "metrik_dosyasi": None,  # örn. "kayitlar/baglanti.json"
+            "tanilama_klasoru": "kayitlar/tanilama",  # --tanilama: profil ve bellek dökümleri
+            "takilma_esigi": 200,  # ms, GUI thread yığını yazılır
+            "slot_esigi": 50,  # ms, yavaş slot uyarısı
+            "kamera_adresi": "http://192.168.1.10:8080/akis"  # MJPEG (http://) ya da ham (tcp://)
         }
 
+def araclari_oku(config):
+    """Config'deki araç listesi: [{"ad", "ip", "port", "kamera"}]; hatalıysa ValueError.
+
+    `araclar` yoksa eski tek araçlı `arac_ip`/`arac_port` anahtarları okunur.
+    """
+    araclar = config.get("araclar")
+    if araclar is None:
+        if "arac_ip" not in config or "arac_port" not in config:
+            raise ValueError("config'de 'araclar' listesi yok")
+        araclar = [{"ad": "DOLPA", "ip": config["arac_ip"], "port": config["arac_port"]}]
+    if not araclar:
+        raise ValueError("araç listesi boş")
+    sonuc = []
+    for sira, arac in enumerate(araclar, 1):
+        ad = str(arac.get("ad") or f"Araç {sira}")
+        if any(a["ad"] == ad for a in sonuc):
+            raise ValueError(f"'{ad}' adı birden çok araçta kullanılmış")
+        if "ip" not in arac or "port" not in arac:
+            raise ValueError(f"'{ad}' için ip ve port gerekli")
+        sonuc.append({"ad": ad, "ip": arac["ip"], "port": int(arac["port"]),
+                      "kamera": arac.get("kamera")})
+    return sonuc
+
 # Global config values
 CONFIG = load_config()
-ARAC_IP = CONFIG["arac_ip"]
-ARAC_PORT = CONFIG["arac_port"]
+ARACLAR = araclari_oku(CONFIG)
+TELEMETRI_HIZI = CONFIG.get("telemetri_hizi", 10)
+TELEMETRI_KAPASITESI = CONFIG.get("telemetri_kapasitesi", 131072)
+
+KOMUT_PENCERESI = CONFIG.get("komut_penceresi", commands.PENCERE)
+KOMUT_ZAMAN_ASIMI = CONFIG.get("komut_zaman_asimi", commands.ZAMAN_ASIMI)
+KOMUT_DENEME = CONFIG.get("komut_deneme", commands.DENEME)
+RTT_YOKLAMA_ARALIGI = CONFIG.get("rtt_yoklama_araligi", network.OLCUM_ARALIGI)
+
+# Terminalde komut adları
+KOMUT_ADLARI = {
+    "gorev": "Görev",
+    "kalibrasyon": "Kalibrasyon komutu",
+    "acil": "Acil çıkış komutu",
+}
+
+# Komut durumuna göre terminal mesajı ve seviyesi
+KOMUT_MESAJLARI = {
+    commands.KUYRUKTA: ("{ad} kuyruğa alındı ({ayrinti}).", terminal_log.BILGI),
+    commands.GONDERILDI: ("{ad} araca gönderildi, onay bekleniyor.", terminal_log.BILGI),
+    commands.YENIDEN: ("{ad} onaylanmadı, yeniden gönderiliyor ({ayrinti}).", terminal_log.UYARI),
+    commands.ONAYLANDI: ("{ad} araç tarafından onaylandı ({ayrinti}).", terminal_log.BILGI),
+    commands.REDDEDILDI: ("HATA: {ad} araç tarafından reddedildi: {ayrinti}", terminal_log.HATA),
+    commands.BASARISIZ: ("HATA: {ad} iletilemedi: {ayrinti}", terminal_log.HATA),
+    commands.BAGLI_DEGIL: ("HATA: Araç bağlı değil, {ad} gönderilemedi!", terminal_log.HATA),
+}
+
+def _ms(deger):
+    # Süre etiketi; ölçüm yoksa (NaN) tire
+    if deger != deger:
+        return "-"
+    return f"{deger:.0f} ms" if deger >= 10 else f"{deger:.1f} ms"
+
+def koordinatlari_oku(metin):
+    """Satır ya da ';' ile ayrılmış `enlem,boylam` çiftleri; hatalıysa ValueError."""
+    noktalar = []
+    for parca in metin.replace(";", "\n").splitlines():
+        if not parca.strip():
+            continue
+        degerler = parca.split(",")
+        if len(degerler) != 2:
+            raise ValueError(f"'{parca.strip()}' enlem,boylam biçiminde değil")
+        noktalar.append((float(degerler[0]), float(degerler[1])))
+    return noktalar
+
+def ekran_yenileme_hizi():
+    """Birincil ekranın yenileme hızı (Hz); bilinmiyorsa 60."""
+    ekran = QtGui.QGuiApplication.primaryScreen()
+    if ekran and ekran.refreshRate() > 0:
+        return ekran.refreshRate()
+    return 60.0
 
 class ResponsiveMainWindow(QtWidgets.QMainWindow):
     def __init__(self):
@@ -59,18 +203,19 @@ class ResponsiveMainWindow(QtWidgets.QMainWindow):
         self.ui = None
     
     def resizeEvent(self, event):
-        if self.ui and hasattr(self.ui, 'main_window_width') and hasattr(self.ui, 'main_window_height'):
-            # Yeni boyutları al
-            new_width = event.size().width()
-            new_height = event.size().height()
-            
-            # Tüm widget'ları yeniden boyutlandır
-            self.ui.update_widget_geometries(new_width, new_height)
+        if self.ui and hasattr(self.ui, 'yerlesim'):
+            # Sürükleme sırasında gelen boyutlar kare başına tek geçişte uygulanır
+            self.ui.yerlesim.planla(event.size().width(), event.size().height())
         
         super().resizeEvent(event)
 
 
 class Ui_MainWindow(object):
+    def __init__(self, oynatma=None, tanilama=False):
+        # Oynatma modu: {"yol": ..., "hiz": 1.0 | None, "baslangic": saniye}
+        self.oynatma = oynatma
+        self.tanilama_modu = tanilama
+
     def setupUi(self, MainWindow):
         MainWindow.setObjectName("MainWindow")
         # upload icon
@@ -103,58 +248,29 @@ class Ui_MainWindow(object):
         self.centralwidget.setObjectName("centralwidget")
         
         # Status Bar
-        status_bar_height = int(self.main_window_height * 0.068)  # 40px -> %6.8
         self.statusBar = QtWidgets.QWidget(self.centralwidget)
-        self.statusBar.setGeometry(QtCore.QRect(0, 0, self.main_window_width, status_bar_height))
-        self.statusBar.setStyleSheet("background-color: #0d447d;")
         self.statusBar.setObjectName("statusBar")
         
         # Date time labels 
-        datetime_width = int(self.main_window_width * 0.208)  # 200px -> %20.8
-        datetime_height = int(status_bar_height * 0.5)  # %50 of status bar
-        datetime_y = int(status_bar_height * 0.25)  # %25 of status bar
         self.labelDateTime = QtWidgets.QLabel(self.statusBar)
-        self.labelDateTime.setGeometry(QtCore.QRect(10, datetime_y, datetime_width, datetime_height))
-        self.labelDateTime.setStyleSheet("color: white; font-weight: bold; font-size: 12px;")
         self.labelDateTime.setObjectName("labelDateTime")
         
         # Battery status label 
-        battery_width = int(self.main_window_width * 0.104)  # 100px -> %10.4
-        battery_x = int(self.main_window_width * 0.885)  # %88.5 konumda
         self.labelBattery = QtWidgets.QLabel(self.statusBar)
-        self.labelBattery.setGeometry(QtCore.QRect(battery_x, datetime_y, battery_width, datetime_height))
-        self.labelBattery.setStyleSheet("color: white; font-weight: bold; font-size: 12px;")
         self.labelBattery.setAlignment(QtCore.Qt.AlignRight)
         self.labelBattery.setText("Şarj: ?")
         self.labelBattery.setObjectName("labelBattery")
+
+        # Telemetry label (between date time and battery)
+        self.labelTelemetri = QtWidgets.QLabel(self.statusBar)
+        self.labelTelemetri.setAlignment(QtCore.Qt.AlignCenter)
+        self.labelTelemetri.setObjectName("labelTelemetri")
         
         # Mission Selection Area
-        gorev_grup_width = int(self.main_window_width * 0.708)  # 680px -> %70.8
-        gorev_grup_height = int(self.main_window_height * 0.29)  # 170px -> %29
-        gorev_y = int(self.main_window_height * 0.085)  # %8.5 y konumu
         self.gorevSecimiAlani = QtWidgets.QGroupBox(self.centralwidget)
-        self.gorevSecimiAlani.setGeometry(QtCore.QRect(10, gorev_y, gorev_grup_width, gorev_grup_height))
         self.gorevSecimiAlani.setObjectName("gorevSecimiAlani")
-        
-        # Locating widgets
-        margin = int(gorev_grup_width * 0.03) 
-        dalış_width = int(gorev_grup_width * 0.20)  
-        koordinat_width = int(gorev_grup_width * 0.17)    
-        buton_width_big = int(gorev_grup_width * 0.14)  
-        buton_width_small = int(gorev_grup_width * 0.11)  
-        anomali_width = int(gorev_grup_width * 0.14)  
-        nesne_width = int(gorev_grup_width * 0.20)  
-        
-        # Y Axis positions
-        ust_satir_y = int(gorev_grup_height * 0.18)  
-        alt_satir_y = int(gorev_grup_height * 0.53)  
-        widget_height = int(gorev_grup_height * 0.24)  
-        
+
         self.textEditBaslangicKonumu = QtWidgets.QTextEdit(self.gorevSecimiAlani)
-        self.textEditBaslangicKonumu.setGeometry(QtCore.QRect(
-            int(gorev_grup_width * 0.29), ust_satir_y, koordinat_width, widget_height)) 
-        self.textEditBaslangicKonumu.setGeometry(QtCore.QRect(
-            int(gorev_grup_width * 0.29), ust_satir_y, koordinat_width, widget_height)) 
         self.textEditBaslangicKonumu.setInputMethodHints(QtCore.Qt.ImhHiddenText|QtCore.Qt.ImhMultiLine)
         self.textEditBaslangicKonumu.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
         self.textEditBaslangicKonumu.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
@@ -164,8 +280,6 @@ class Ui_MainWindow(object):
         self.textEditBaslangicKonumu.setObjectName("textEditBaslangicKonumu")
         
         self.labelAnomali_1 = QtWidgets.QLabel(self.gorevSecimiAlani)
-        self.labelAnomali_1.setGeometry(QtCore.QRect(
-            int(gorev_grup_width * 0.29), alt_satir_y, anomali_width, widget_height))  
         self.labelAnomali_1.setToolTip("")
         self.labelAnomali_1.setWhatsThis("")
         self.labelAnomali_1.setAccessibleDescription("")
@@ -175,8 +289,6 @@ class Ui_MainWindow(object):
         self.labelAnomali_1.setTextFormat(QtCore.Qt.AutoText)
         self.labelAnomali_1.setObjectName("labelAnomali_1")
         self.labelAnomali_4 = QtWidgets.QLabel(self.gorevSecimiAlani)
-        self.labelAnomali_4.setGeometry(QtCore.QRect(
-            int(gorev_grup_width * 0.81), alt_satir_y, anomali_width, widget_height))  
         self.labelAnomali_4.setToolTip("")
         self.labelAnomali_4.setWhatsThis("")
         self.labelAnomali_4.setAccessibleDescription("")
@@ -186,16 +298,12 @@ class Ui_MainWindow(object):
         self.labelAnomali_4.setTextFormat(QtCore.Qt.AutoText)
         self.labelAnomali_4.setObjectName("labelAnomali_4")
         self.labelNesneGorevi = QtWidgets.QLabel(self.gorevSecimiAlani)
-        self.labelNesneGorevi.setGeometry(QtCore.QRect(
-            int(gorev_grup_width * 0.07), alt_satir_y, nesne_width, widget_height)) 
         self.labelNesneGorevi.setFrameShape(QtWidgets.QFrame.WinPanel)
         self.labelNesneGorevi.setTextFormat(QtCore.Qt.AutoText)
         self.labelNesneGorevi.setAlignment(QtCore.Qt.AlignCenter)
         self.labelNesneGorevi.setWordWrap(True)
         self.labelNesneGorevi.setObjectName("labelNesneGorevi")
         self.labelAnomali_3 = QtWidgets.QLabel(self.gorevSecimiAlani)
-        self.labelAnomali_3.setGeometry(QtCore.QRect(
-            int(gorev_grup_width * 0.63), alt_satir_y, anomali_width, widget_height))  
         self.labelAnomali_3.setToolTip("")
         self.labelAnomali_3.setWhatsThis("")
         self.labelAnomali_3.setAccessibleDescription("")
@@ -205,14 +313,10 @@ class Ui_MainWindow(object):
         self.labelAnomali_3.setTextFormat(QtCore.Qt.AutoText)
         self.labelAnomali_3.setObjectName("labelAnomali_3")
         self.labelDalisGorevi = QtWidgets.QLabel(self.gorevSecimiAlani)
-        self.labelDalisGorevi.setGeometry(QtCore.QRect(
-            int(gorev_grup_width * 0.07), ust_satir_y, dalış_width, widget_height)) 
         self.labelDalisGorevi.setFrameShape(QtWidgets.QFrame.WinPanel)
         self.labelDalisGorevi.setAlignment(QtCore.Qt.AlignCenter)
         self.labelDalisGorevi.setObjectName("labelDalisGorevi")
         self.textEditBitisKonumu = QtWidgets.QTextEdit(self.gorevSecimiAlani)
-        self.textEditBitisKonumu.setGeometry(QtCore.QRect(
-            int(gorev_grup_width * 0.48), ust_satir_y, koordinat_width, widget_height))  
         self.textEditBitisKonumu.setInputMethodHints(QtCore.Qt.ImhHiddenText|QtCore.Qt.ImhMultiLine)
         self.textEditBitisKonumu.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
         self.textEditBitisKonumu.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
@@ -221,8 +325,6 @@ class Ui_MainWindow(object):
         self.textEditBitisKonumu.setOverwriteMode(False)
         self.textEditBitisKonumu.setObjectName("textEditBitisKonumu")
         self.labelAnomali_2 = QtWidgets.QLabel(self.gorevSecimiAlani)
-        self.labelAnomali_2.setGeometry(QtCore.QRect(
-            int(gorev_grup_width * 0.46), alt_satir_y, anomali_width, widget_height))  
         self.labelAnomali_2.setToolTip("")
         self.labelAnomali_2.setWhatsThis("")
         self.labelAnomali_2.setAccessibleDescription("")
@@ -231,130 +333,81 @@ class Ui_MainWindow(object):
         self.labelAnomali_2.setText("")
         self.labelAnomali_2.setTextFormat(QtCore.Qt.AutoText)
         self.labelAnomali_2.setObjectName("labelAnomali_2")
-        
-        radio_x = int(gorev_grup_width * 0.029)  
-        radio_width = int(gorev_grup_width * 0.029)  
-        radio_height = int(gorev_grup_height * 0.118)  
-        radio_dalis_y = int(gorev_grup_height * 0.235)  
-        radio_nesne_y = int(gorev_grup_height * 0.588)  
-        
+
         self.btnDalis = QtWidgets.QRadioButton(self.gorevSecimiAlani)
-        self.btnDalis.setGeometry(QtCore.QRect(radio_x, radio_dalis_y, radio_width, radio_height))
         self.btnDalis.setText("")
         self.btnDalis.setObjectName("btnDalis")
         self.btnNesne = QtWidgets.QRadioButton(self.gorevSecimiAlani)
-        self.btnNesne.setGeometry(QtCore.QRect(radio_x, radio_nesne_y, radio_width, radio_height))
         self.btnNesne.setText("")
         self.btnNesne.setObjectName("btnNesne")
         self.kontrolAlani = QtWidgets.QGroupBox(self.centralwidget)
-        kontrol_grup_width = int(self.main_window_width * 0.272)  
-        kontrol_grup_height = int(self.main_window_height * 0.138)  
-        kontrol_y = int(self.main_window_height * 0.392) 
-        self.kontrolAlani.setGeometry(QtCore.QRect(10, kontrol_y, kontrol_grup_width, kontrol_grup_height))
         self.kontrolAlani.setObjectName("kontrolAlani")
-        
-        
-        kontrol_margin = int(kontrol_grup_width * 0.08)  
-        head_label_width = int(kontrol_grup_width * 0.42)  
-        durum_label_width = int(kontrol_grup_width * 0.35)  
-        
+
         self.labelAracErisimHead = QtWidgets.QLabel(self.kontrolAlani)
-        self.labelAracErisimHead.setGeometry(QtCore.QRect(
-            kontrol_margin, int(kontrol_grup_height * 0.25), head_label_width, 16))  
         self.labelAracErisimHead.setObjectName("labelAracErisimHead")
         self.labelAracDurum = QtWidgets.QLabel(self.kontrolAlani)
-        self.labelAracDurum.setGeometry(QtCore.QRect(
-            int(kontrol_grup_width * 0.55), int(kontrol_grup_height * 0.25), durum_label_width, 16))  
         self.labelAracDurum.setObjectName("labelAracDurum")
         self.labelAktifGorevHead = QtWidgets.QLabel(self.kontrolAlani)
-        self.labelAktifGorevHead.setGeometry(QtCore.QRect(
-            kontrol_margin, int(kontrol_grup_height * 0.60), head_label_width, 16))  
         self.labelAktifGorevHead.setObjectName("labelAktifGorevHead")
         self.labelAracDurum_2 = QtWidgets.QLabel(self.kontrolAlani)
-        self.labelAracDurum_2.setGeometry(QtCore.QRect(
-            int(kontrol_grup_width * 0.55), int(kontrol_grup_height * 0.60), durum_label_width, 16))  
         self.labelAracDurum_2.setObjectName("labelAracDurum_2")
+        self.comboBoxArac = QtWidgets.QComboBox(self.kontrolAlani)
+        self.comboBoxArac.setObjectName("comboBoxArac")
+        self.labelBaglanti = QtWidgets.QLabel(self.kontrolAlani)
+        self.labelBaglanti.setObjectName("labelBaglanti")
+        self.groupBoxKamera = QtWidgets.QGroupBox(self.centralwidget)
+        self.groupBoxKamera.setObjectName("groupBoxKamera")
+
+        self.widgetKamera = camera.VideoWidget(self.groupBoxKamera)
+        self.widgetKamera.setObjectName("widgetKamera")
         self.groupBoxGPS = QtWidgets.QGroupBox(self.centralwidget)
-        gps_grup_width = int(self.main_window_width * 0.261)  
-        gps_grup_height = int(self.main_window_height * 0.436)  
-        gps_x = int(self.main_window_width * 0.729)  
-        self.groupBoxGPS.setGeometry(QtCore.QRect(gps_x, gorev_y, gps_grup_width, gps_grup_height))
         self.groupBoxGPS.setObjectName("groupBoxGPS")
-        
-        
-        map_width = int(gps_grup_width * 0.916) 
-        map_height = int(gps_grup_height * 0.898) 
-        map_margin = int(gps_grup_width * 0.04)  
-        map_y = int(gps_grup_height * 0.059)  
+
         self.widgetForOpenStreetMap = QtWebEngineWidgets.QWebEngineView(self.groupBoxGPS)
-        self.widgetForOpenStreetMap.setGeometry(QtCore.QRect(map_margin, map_y, map_width, map_height))
         self.widgetForOpenStreetMap.setObjectName("widgetForOpenStreetMap")
         self.groupBoxTerminal = QtWidgets.QGroupBox(self.centralwidget)
-        terminal_grup_width = int(self.main_window_width * 0.521)  
-        terminal_grup_height = int(self.main_window_height * 0.359) 
-        terminal_y = int(self.main_window_height * 0.545) 
-        self.groupBoxTerminal.setGeometry(QtCore.QRect(10, terminal_y, terminal_grup_width, terminal_grup_height))
         self.groupBoxTerminal.setObjectName("groupBoxTerminal")
-        
-        
-        terminal_text_width = int(terminal_grup_width * 0.96)  
-        terminal_text_height = int(terminal_grup_height * 0.858)  
-        terminal_text_margin = int(terminal_grup_width * 0.02) 
-        terminal_text_y = int(terminal_grup_height * 0.095)  
-        self.terminalTextEdit = QtWidgets.QTextEdit(self.groupBoxTerminal)
-        self.terminalTextEdit.setGeometry(QtCore.QRect(terminal_text_margin, terminal_text_y, terminal_text_width, terminal_text_height))
+
+        self.terminalTextEdit = QtWidgets.QPlainTextEdit(self.groupBoxTerminal)
         self.terminalTextEdit.setReadOnly(True)
         self.terminalTextEdit.setObjectName("terminalTextEdit")
+
+        # Log level filter (top right of the terminal box)
+        self.comboBoxLogSeviye = QtWidgets.QComboBox(self.groupBoxTerminal)
+        self.comboBoxLogSeviye.setObjectName("comboBoxLogSeviye")
         self.groupBoxTest = QtWidgets.QGroupBox(self.centralwidget)
-        test_grup_width = int(self.main_window_width * 0.261)  
-        test_grup_height = int(self.main_window_height * 0.155) 
-        test_y = int(self.main_window_height * 0.545)  
-        self.groupBoxTest.setGeometry(QtCore.QRect(gps_x, test_y, test_grup_width, test_grup_height))
         self.groupBoxTest.setObjectName("groupBoxTest")
-        
-        
-        test_button_width = int(test_grup_width * 0.35) 
-        test_label_width = int(test_grup_width * 0.54) 
-        test_button_height = int(test_grup_height * 0.35) 
-        test_label_height = int(test_grup_height * 0.35) 
-        test_margin = int(test_grup_width * 0.04)  
-        test_label_x = int(test_grup_width * 0.43) 
-        
-        
-        kalibrasyon_y = int(test_grup_height * 0.25)  
+
         self.pushButtonKalibre = QtWidgets.QPushButton(self.groupBoxTest)
-        self.pushButtonKalibre.setGeometry(QtCore.QRect(test_margin, kalibrasyon_y, test_button_width, test_button_height))
         self.pushButtonKalibre.setObjectName("pushButtonKalibre")
         
         self.labelKalibreText = QtWidgets.QLabel(self.groupBoxTest)
-        self.labelKalibreText.setGeometry(QtCore.QRect(test_label_x, kalibrasyon_y, test_label_width, test_label_height))
         self.labelKalibreText.setScaledContents(False)
         self.labelKalibreText.setWordWrap(True)
         self.labelKalibreText.setObjectName("labelKalibreText")
-        
-        
-        sizdirmazlik_y = int(test_grup_height * 0.63)  
+
         self.pushButtonSizdirmazlik = QtWidgets.QPushButton(self.groupBoxTest)
-        self.pushButtonSizdirmazlik.setGeometry(QtCore.QRect(test_margin, sizdirmazlik_y, test_button_width, test_button_height))
         self.pushButtonSizdirmazlik.setDefault(False)
         self.pushButtonSizdirmazlik.setObjectName("pushButtonSizdirmazlik")
         
         self.labelSizdirmazlikText = QtWidgets.QLabel(self.groupBoxTest)
-        self.labelSizdirmazlikText.setGeometry(QtCore.QRect(test_label_x, sizdirmazlik_y, test_label_width, test_label_height))
         self.labelSizdirmazlikText.setScaledContents(False)
         self.labelSizdirmazlikText.setWordWrap(True)
         self.labelSizdirmazlikText.setObjectName("labelSizdirmazlikText")
+
+        self.pushButtonAcil = QtWidgets.QPushButton(self.centralwidget)
+        self.pushButtonAcil.setObjectName("pushButtonAcil")
         self.pushButtonRotaCiz = QtWidgets.QPushButton(self.gorevSecimiAlani)
-        self.pushButtonRotaCiz.setGeometry(QtCore.QRect(
-            int(gorev_grup_width * 0.67), ust_satir_y, buton_width_big, widget_height))
         self.pushButtonRotaCiz.setText("Rota Çiz")
         self.pushButtonRotaCiz.setObjectName("pushButtonRotaCiz")
         self.pushButtonGonder = QtWidgets.QPushButton(self.gorevSecimiAlani)
-        self.pushButtonGonder.setGeometry(QtCore.QRect(
-            int(gorev_grup_width * 0.83), ust_satir_y, buton_width_small, widget_height)) 
         self.pushButtonGonder.setText("Gönder")
         self.pushButtonGonder.setObjectName("pushButtonGonder")
         MainWindow.setCentralWidget(self.centralwidget)
+
+        # Tüm konum ve boyutlar layout.YERLESIM tablosundan okunur
+        self.yerlesim = layout.LayoutEngine(self, int(1000 / ekran_yenileme_hizi()), parent=MainWindow)
+        self.yerlesim.uygula(self.main_window_width, self.main_window_height)
        
 
         self.retranslateUi(MainWindow)
@@ -364,7 +417,19 @@ class Ui_MainWindow(object):
         
         map_path = resource_path("map.html")
         if os.path.exists(map_path):
-            self.widgetForOpenStreetMap.load(QtCore.QUrl.fromLocalFile(map_path))
+            # Sayfa, Leaflet ve karolar dolpa:// üzerinden; internet olmadan da çalışır
+            self.karo_deposu = tiles.TileStore(
+                resource_path(CONFIG.get("karo_deposu", "harita/karolar.mbtiles")))
+            self.karo_onbellegi = tiles.TileCache(
+                self.karo_deposu, CONFIG.get("karo_adresi", tiles.VARSAYILAN_ADRES),
+                CONFIG.get("karo_indir", True))
+            self.sema_isleyici = mapview.DolpaSchemeHandler(
+                os.path.dirname(map_path), self.karo_onbellegi, MainWindow)
+            mapview.kur(self.widgetForOpenStreetMap, self.sema_isleyici, self.harita)
+            app = QtWidgets.QApplication.instance()
+            if app:
+                app.aboutToQuit.connect(self.sema_isleyici.kapat)
+            self.widgetForOpenStreetMap.load(QtCore.QUrl(mapview.SAYFA_ADRESI))
         else:
            
             self.widgetForOpenStreetMap.setHtml("<html><body><h3>Harita dosyası bulunamadı</h3></body></html>")
@@ -389,6 +454,7 @@ class Ui_MainWindow(object):
         self.labelAracDurum.setText(_translate("MainWindow", "Bağlı Değil"))
         self.labelAktifGorevHead.setText(_translate("MainWindow", "AKTİF GÖREV:"))
         self.labelAracDurum_2.setText(_translate("MainWindow", "-"))
+        self.groupBoxKamera.setTitle(_translate("MainWindow", "Kamera"))
         self.groupBoxGPS.setTitle(_translate("MainWindow", "GPS"))
         self.groupBoxTerminal.setTitle(_translate("MainWindow", "Terminal"))
         self.groupBoxTest.setTitle(_translate("MainWindow", "Test"))
@@ -396,32 +462,283 @@ class Ui_MainWindow(object):
         self.pushButtonKalibre.setText(_translate("MainWindow", "Kalibrasyon"))
         self.pushButtonSizdirmazlik.setText(_translate("MainWindow", "Sızdırmazlık"))
         self.labelSizdirmazlikText.setText(_translate("MainWindow", "Sızdırmazlık Testi"))
+        self.pushButtonAcil.setText(_translate("MainWindow", "ACİL ÇIKIŞ"))
+        self.pushButtonAcil.setToolTip(_translate(
+            "MainWindow", "Seçili araca acil yüzeye çıkış komutu; bekleyen komutların önüne geçer"))
         
 
     def ekle_islevsellik(self):
+        # Durum widget'larına yazılanlar kare başına tek seferde uygulanır
+        self.gorunum = viewmodel.ViewModel()
+
         self.btnDalis.toggled.connect(self.update_active_gorev)
         self.btnNesne.toggled.connect(self.update_active_gorev)
 
+        # Terminal: sınırlı görünüm, toplu güncelleme, tüm günlük dosyada
+        log_dosyasi = CONFIG.get("log_dosyasi", "kayitlar/terminal.log")
+        self.terminal_log = terminal_log.TerminalLog(
+            self.terminalTextEdit,
+            CONFIG.get("terminal_satir_siniri", 2000),
+            resource_path(log_dosyasi) if log_dosyasi else None)
+        for seviye, ad in terminal_log.SEVIYE_ADLARI.items():
+            self.comboBoxLogSeviye.addItem(ad, seviye)
+        self.comboBoxLogSeviye.setCurrentIndex(self.comboBoxLogSeviye.findData(terminal_log.BILGI))
+        self.comboBoxLogSeviye.currentIndexChanged.connect(
+            lambda _: self.terminal_log.seviye_ayarla(self.comboBoxLogSeviye.currentData()))
+
+        # Tanılama modu: olay döngüsü bekçisi, slot süreleri, istek üzerine profil.
+        # Bekçi olay döngüsü dönmeye başlayınca kurulur, açılış takılma sayılmaz
+        self.tanilama = None
+        if self.tanilama_modu:
+            self.tanilama = diagnostics.Diagnostics(
+                self.terminale_yaz,
+                resource_path(CONFIG.get("tanilama_klasoru", "kayitlar/tanilama")),
+                CONFIG.get("takilma_esigi", diagnostics.TAKILMA_ESIGI_MS),
+                CONFIG.get("slot_esigi", diagnostics.SLOT_ESIGI_MS))
+            self.tanilama.kisayollari_kur(self.centralwidget)
+            QtCore.QTimer.singleShot(0, self.tanilama.baslat)
+
+        # Dalış kaydı: her aracın gelen/giden tüm çerçeveleri kendi dosyasına
+        self.kaydediciler = {}
+        if CONFIG.get("kayit", True) and not self.oynatma:
+            zaman = time.strftime("%Y%m%d_%H%M%S")
+            for arac in ARACLAR:
+                ek = ""
+                if len(ARACLAR) > 1:
+                    ek = "_" + "".join(c if c.isalnum() or c in "-." else "_" for c in arac["ad"])
+                kayit_yolu = os.path.join(
+                    resource_path(CONFIG.get("kayit_klasoru", "kayitlar")),
+                    f"dalis_{zaman}{ek}.dkyt")
+                try:
+                    kaydedici = recorder.DiveRecorder(
+                        kayit_yolu, lambda mesaj: self.terminale_yaz(mesaj, terminal_log.HATA))
+                    kaydedici.baslat()
+                    self.kaydediciler[arac["ad"]] = kaydedici
+                    self.terminale_yaz(f"Dalış kaydı: {kayit_yolu}")
+                except OSError as e:
+                    self.terminale_yaz(f"Dalış kaydı başlatılamadı: {e}", terminal_log.HATA)
+
+        # Tüm araçların soketleri tek ağ thread'inde; her aracın kendi
+        # telemetri tamponu var. Oynatma modunda araç yerine kayıt aynı yoldan beslenir
+        self.filo = network.FleetManager()
+        if self.oynatma:
+            oturum = replay.ReplaySession(
+                self.oynatma["yol"], self.oynatma["hiz"], self.oynatma["baslangic"])
+            oturum.oynatma_bitti.connect(self.oynatma_bitti)
+            self._oynatma_kisayollari = []
+            for tus, fark in (("Ctrl+Right", replay.ATLAMA_ADIMI), ("Ctrl+Left", -replay.ATLAMA_ADIMI)):
+                kisayol = QtWidgets.QShortcut(QtGui.QKeySequence(tus), self.centralwidget)
+                kisayol.setContext(QtCore.Qt.ApplicationShortcut)
+                kisayol.activated.connect(functools.partial(oturum.atla, fark))
+                self._oynatma_kisayollari.append(kisayol)
+            hiz = "en yüksek" if self.oynatma["hiz"] is None else f"{self.oynatma['hiz']:g}x"
+            self.terminale_yaz(f"Oynatma modu ({hiz}): {self.oynatma['yol']}")
+            self.araclar = [{"ad": "Oynatma", "ip": None, "port": None, "kamera": None}]
+            self.filo.ekle("Oynatma", network.NetworkWorker(
+                None, None, TELEMETRI_HIZI, TELEMETRI_KAPASITESI, oturum=oturum,
+                komut_penceresi=KOMUT_PENCERESI, komut_zaman_asimi=KOMUT_ZAMAN_ASIMI,
+                komut_deneme=KOMUT_DENEME, olcum_araligi=RTT_YOKLAMA_ARALIGI))
+        else:
+            self.araclar = ARACLAR
+            for arac in ARACLAR:
+                self.filo.ekle(arac["ad"], network.NetworkWorker(
+                    arac["ip"], arac["port"], TELEMETRI_HIZI, TELEMETRI_KAPASITESI,
+                    self.kaydediciler.get(arac["ad"]), komut_penceresi=KOMUT_PENCERESI,
+                    komut_zaman_asimi=KOMUT_ZAMAN_ASIMI, komut_deneme=KOMUT_DENEME,
+                    olcum_araligi=RTT_YOKLAMA_ARALIGI))
+        for sira, isci in enumerate(self.filo.isciler):
+            self.comboBoxArac.addItem("")
+            self.filo_durumu_guncelle(sira, False)
+            isci.baglanti_durumu.connect(functools.partial(self.filo_durumu_guncelle, sira))
+        self.ag_iscisi = self.filo.isciler[0]
+        self.ag_iscisi.baglanti_durumu.connect(self.arac_baglanti_guncelle)
+        self.ag_iscisi.sarj_durumu.connect(self.update_battery_status)
+        self.ag_iscisi.komut_sonucu.connect(self.komut_sonucu_geldi)
+        self.filo.baslat()
+
+        # Anomali tespiti kendi thread'inde; GUI'ye yalnızca sıralama değişince düşer.
+        # Bilinmeyen kanal işçi thread'inde KeyError ile sessizce ölmesin diye burada elenir
+        anomali_kanallari = []
+        for kanal in CONFIG.get("anomali_kanallari", anomaly.VARSAYILAN_KANALLAR):
+            if kanal in telemetry.KANALLAR:
+                anomali_kanallari.append(kanal)
+            else:
+                self.terminale_yaz(f"Bilinmeyen anomali kanalı yok sayıldı: {kanal}", terminal_log.UYARI)
+        self.anomali_iscisi = anomaly.AnomalyWorker(
+            self.ag_iscisi.telemetri,
+            anomali_kanallari,
+            CONFIG.get("anomali_araligi", 100),
+            CONFIG.get("anomali_esigi", anomaly.Z_ESIGI))
+        self.anomali_iscisi.anomaliler_degisti.connect(self.anomalileri_goster)
+        self.anomali_iscisi.baslat()
+
+        # Kamera akışı kendi thread'inde okunur; panel yalnızca en yeni kareyi çizer
+        self.kamera_iscisi = None
+        if not self.oynatma:
+            self.kamera_ac(self.araclar[0]["kamera"] or CONFIG.get("kamera_adresi"))
+        # Bağlantı ölçümleri: seçili araç panelde, tüm araçlar dışa aktarımda
+        self.baglanti_izleyici = linkmetrics.LinkMonitor(
+            {ad: isci.olcum for ad, isci in zip(self.filo.adlar, self.filo.isciler)})
+        self.metrik_sunucusu = None
+        if CONFIG.get("metrik_portu"):
+            try:
+                self.metrik_sunucusu = linkmetrics.MetricsServer(
+                    self.baglanti_izleyici, port=CONFIG["metrik_portu"]).baslat()
+                self.terminale_yaz(
+                    f"Bağlantı ölçümleri: http://{self.metrik_sunucusu.host}:"
+                    f"{self.metrik_sunucusu.port}/metrics")
+            except OSError as e:
+                self.terminale_yaz(f"Ölçüm sunucusu başlatılamadı: {e}", terminal_log.UYARI)
+        metrik_dosyasi = CONFIG.get("metrik_dosyasi")
+        self.metrik_dosyasi = resource_path(metrik_dosyasi) if metrik_dosyasi else None
+        app = QtWidgets.QApplication.instance()
+        if app:
+            app.aboutToQuit.connect(self.filo.durdur, QtCore.Qt.DirectConnection)
+            if self.metrik_sunucusu is not None:
+                app.aboutToQuit.connect(self.metrik_sunucusu.durdur)
+            app.aboutToQuit.connect(self.anomali_iscisi.durdur, QtCore.Qt.DirectConnection)
+            app.aboutToQuit.connect(self.kamera_kapat)
+            for kaydedici in self.kaydediciler.values():
+                app.aboutToQuit.connect(kaydedici.durdur)
+            if self.tanilama is not None:
+                app.aboutToQuit.connect(self.tanilama.durdur)
+            app.aboutToQuit.connect(self.terminal_log.kapat)
+        self.comboBoxArac.currentIndexChanged.connect(self.araci_sec)
+        self._kontrol_bekliyor = False
+        self._istatistik_onceki = {}
         
         self.connection_timer = QtCore.QTimer()
-        self.connection_timer.timeout.connect(self.check_arac_baglanti)
+        self.connection_timer.timeout.connect(self._izlenen(self.check_arac_baglanti))
         self.connection_timer.start(CONFIG["baglanti_kontrol_araligi"])
 
        
         self.datetime_timer = QtCore.QTimer()
-        self.datetime_timer.timeout.connect(self.update_datetime)
+        self.datetime_timer.timeout.connect(self._izlenen(self.update_datetime))
         self.datetime_timer.start(CONFIG["datetime_guncelleme_araligi"])
         
         
         self.update_datetime()
 
-        
+        # Telemetri ne hızda gelirse gelsin ekran yenileme hızından sık çizilmez
+        self._cizilen_telemetri = None
+        self.render_timer = QtCore.QTimer()
+        self.render_timer.timeout.connect(self._izlenen(self.kare_ciz))
+        self.render_timer.start(int(1000 / ekran_yenileme_hizi()))
+        
+        # Araç izi haritaya paketler hâlinde, en fazla harita_guncelleme_hizi Hz'de gider
+        self.harita = mapview.MapBridge()
+        self._iz_sayac = 0
+        self.harita_timer = QtCore.QTimer()
+        self.harita_timer.timeout.connect(self._izlenen(self.iz_guncelle))
+        self.harita_timer.start(int(1000 / CONFIG.get("harita_guncelleme_hizi", 4)))
+
+        self.baglanti_timer = QtCore.QTimer()
+        self.baglanti_timer.timeout.connect(self._izlenen(self.baglanti_olc))
+        self.baglanti_timer.start(CONFIG.get("metrik_araligi", 1000))
+
+        # Arayüz/harita/anomali/kamera sayaçları yalnızca tanılama modunda günlüğe yazılır
+        self.istatistik_timer = None
+        if self.tanilama is not None:
+            self.istatistik_timer = QtCore.QTimer()
+            self.istatistik_timer.timeout.connect(self._izlenen(self.istatistikleri_yaz))
+            self.istatistik_timer.start(1000)
+
         self._arac_bagli_onceki = None
         self.check_arac_baglanti()
 
-        self.pushButtonRotaCiz.clicked.connect(self.rota_ciz_butonuna_basildi)
-        self.pushButtonGonder.clicked.connect(self.rota_ve_gorev_gonder)
-        self.pushButtonKalibre.clicked.connect(self.kalibrasyon_butonuna_basildi)
+        self.pushButtonRotaCiz.clicked.connect(self._izlenen(self.rota_ciz_butonuna_basildi))
+        self.pushButtonGonder.clicked.connect(self._izlenen(self.rota_ve_gorev_gonder))
+        self.pushButtonKalibre.clicked.connect(self._izlenen(self.kalibrasyon_butonuna_basildi))
+        self.pushButtonAcil.clicked.connect(self._izlenen(self.acil_cikis_butonuna_basildi))
+
+    def _izlenen(self, slot):
+        # Tanılama modunda slotun süresi ölçülür
+        return slot if self.tanilama is None else self.tanilama.sar(slot)
+
+    def kamera_ac(self, adres):
+        """Paneli `adres`teki akışa bağla; adres aynıysa bir şey yapılmaz."""
+        if self.kamera_iscisi is not None and self.kamera_iscisi.adres == adres:
+            return
+        self.kamera_kapat()
+        if not adres:
+            return
+        try:
+            self.kamera_iscisi = camera.CameraWorker(adres)
+        except ValueError as e:
+            self.terminale_yaz(f"Kamera açılamadı: {e}", terminal_log.UYARI)
+            self.widgetKamera.ayir(f"Kamera açılamadı: {e}")
+            return
+        self.widgetKamera.baglan(self.kamera_iscisi)
+        self.kamera_iscisi.baslat()
+
+    def kamera_kapat(self):
+        # Panel de boşaltılır; kamerasız araca geçince eski kare kalmasın
+        if self.kamera_iscisi is not None:
+            self.kamera_iscisi.durdur()
+            self.kamera_iscisi = None
+            self.widgetKamera.ayir()
+
+    def filo_durumu_guncelle(self, sira, bagli):
+        ad = self.filo.adlar[sira]
+        self.comboBoxArac.setItemText(sira, ad if bagli else f"{ad} (bağlı değil)")
+
+    def baglanti_olc(self):
+        durumlar = self.baglanti_izleyici.guncelle()
+        for sira, ad in enumerate(self.filo.adlar):
+            durum = durumlar[ad]
+            self.comboBoxArac.setItemData(
+                sira, f"RTT p95 {_ms(durum['rtt_p95_ms'])}, "
+                      f"{durum['gelen_bps'] / 1000:.1f} kB/s, {durum['gelen_hz']:.0f} msj/s",
+                QtCore.Qt.ToolTipRole)
+        durum = durumlar[self.filo.adlar[self.comboBoxArac.currentIndex()]]
+        kuyruk = durum["kuyruklar"]
+        self.gorunum.metin(
+            self.labelBaglanti,
+            f"RTT p50/p95/p99: {_ms(durum['rtt_p50_ms'])} / {_ms(durum['rtt_p95_ms'])} / "
+            f"{_ms(durum['rtt_p99_ms'])}\n"
+            f"↓ {durum['gelen_bps'] / 1000:.1f} kB/s {durum['gelen_hz']:.0f} msj/s   "
+            f"↑ {durum['giden_bps'] / 1000:.1f} kB/s {durum['giden_hz']:.0f} msj/s\n"
+            f"Kopma {durum['yeniden_baglanma']} · Çözme hatası "
+            f"{durum['cozme_hatasi']} · Zaman aşımı {durum['zaman_asimi']}\n"
+            f"Kuyruk: komut {kuyruk['komut']} · onay {kuyruk['onay']} · "
+            f"istek {kuyruk['istek']} · soket {kuyruk['soket']} B")
+        self.gorunum.ayarla(
+            self.labelBaglanti, "toolTip",
+            f"Son {self.baglanti_izleyici.pencere_s:.0f} s, {durum['rtt_ornek']} RTT ölçümü")
+        self.gorunum.durum(self.labelBaglanti, KALITE, durum["kalite"])
+        if self.metrik_dosyasi:
+            try:
+                self.baglanti_izleyici.json_yaz(self.metrik_dosyasi)
+            except OSError as e:
+                self.terminale_yaz(f"Ölçüm dosyası yazılamadı: {e}", terminal_log.HATA)
+                self.metrik_dosyasi = None
+
+    def araci_sec(self, sira):
+        yeni = self.filo.isciler[sira]
+        eski = self.ag_iscisi
+        if yeni is eski:
+            return
+        eski.baglanti_durumu.disconnect(self.arac_baglanti_guncelle)
+        eski.sarj_durumu.disconnect(self.update_battery_status)
+        eski.komut_sonucu.disconnect(self.komut_sonucu_geldi)
+        yeni.baglanti_durumu.connect(self.arac_baglanti_guncelle)
+        yeni.sarj_durumu.connect(self.update_battery_status)
+        yeni.komut_sonucu.connect(self.komut_sonucu_geldi)
+        self.ag_iscisi = yeni
+
+        # Telemetri, iz ve anomaliler yeni aracın tamponundan baştan okunur
+        self._cizilen_telemetri = None
+        self._kontrol_bekliyor = False
+        self._arac_bagli_onceki = None
+        self._iz_sayac = 0
+        self.harita.iz_temizle()
+        self.anomali_iscisi.sifirla(yeni.telemetri)
+        self.update_battery_status(None)
+        if not self.oynatma:
+            self.kamera_ac(self.araclar[sira]["kamera"] or CONFIG.get("kamera_adresi"))
+        self.terminale_yaz(f"Seçili araç: {self.filo.adlar[sira]}")
+        self.check_arac_baglanti()
+        self.baglanti_olc()
 
     def update_active_gorev(self):
         if self.btnDalis.isChecked() and self.labelAracDurum_2.text() != "Dalış Görevi":
@@ -440,121 +757,197 @@ class Ui_MainWindow(object):
             self.pushButtonGonder.setEnabled(True)
 
     def check_arac_baglanti(self):
-        arac_bagli = self.is_arac_connected()
-        
+        # Önceki kontrol hâlâ ağ thread'inde sürüyorsa yenisini kuyruğa ekleme
+        if self._kontrol_bekliyor:
+            return
+        self._kontrol_bekliyor = True
+        self.ag_iscisi.baglanti_kontrol_et()
+
+    def istatistikleri_yaz(self):
+        # Tanılama modunda saniyede bir (istatistik_timer); yalnızca değişen satırlar yazılır
+        dedektor = self.anomali_iscisi.dedektor
+        satirlar = {
+            "arayuz": "Arayüz güncellemeleri: {istenen} istek, {uygulanan} uygulandı, "
+                      "{bastirilan} değişmediği için atlandı, {birlestirilen} birleştirildi".format(
+                          **self.gorunum.istatistik()),
+            "harita": "Harita izi: {gelen} nokta, {ince} köşe saklanıyor, {goruntu} köşe çiziliyor".format(
+                **self.harita.istatistik()),
+            "anomali": f"Anomali tespiti: {dedektor.ornek} örnek, {dedektor.olay} olay, "
+                       f"{self.anomali_iscisi.sure_s * 1000:.0f} ms işlem",
+        }
+        if self.kamera_iscisi is not None:
+            satirlar["kamera"] = (
+                "Kamera: {alinan} kare alındı, {atlanan} çözülmeden atlandı, {dusen} gösterilmeden "
+                "düştü, {hatali} hatalı, son çözme {cozme_ms:.1f} ms".format(
+                    **self.kamera_iscisi.istatistik()))
+        for ad, satir in satirlar.items():
+            if self._istatistik_onceki.get(ad) != satir:
+                self._istatistik_onceki[ad] = satir
+                self.terminale_yaz(satir, terminal_log.HATA_AYIKLAMA)
+
+    def arac_baglanti_guncelle(self, arac_bagli):
+        self._kontrol_bekliyor = False
+
         if arac_bagli != getattr(self, "_arac_bagli_onceki", None):
             if arac_bagli:
-                self.labelAracDurum.setText("Bağlı")
-                self.labelAracDurum.setStyleSheet(CONNECTED_STYLE)
                 self.terminale_yaz("Araç bağlantısı sağlandı.")
-                self.update_battery_status()
             else:
-                self.labelAracDurum.setText("Bağlı Değil")
-                self.labelAracDurum.setStyleSheet(DISCONNECTED_STYLE)
-                self.terminale_yaz("Araç bağlantısı yok.")
-                self.labelBattery.setStyleSheet(f"color: {BATTERY_WHITE}; font-weight: bold; font-size: 12px;")
-                self.labelBattery.setText("🔋 ?")
+                self.terminale_yaz("Araç bağlantısı yok.", terminal_log.UYARI)
             self._arac_bagli_onceki = arac_bagli
+
+        if arac_bagli:
+            self.gorunum.metin(self.labelAracDurum, "Bağlı")
+            self.gorunum.durum(self.labelAracDurum, DURUM, DURUM_BAGLI)
         else:
-            if arac_bagli:
-                self.labelAracDurum.setText("Bağlı")
-                self.labelAracDurum.setStyleSheet(CONNECTED_STYLE)
-                self.update_battery_status()
-            else:
-                self.labelAracDurum.setText("Bağlı Değil")
-                self.labelAracDurum.setStyleSheet(DISCONNECTED_STYLE)
-                self.labelBattery.setStyleSheet(f"color: {BATTERY_WHITE}; font-weight: bold; font-size: 12px;")
-                self.labelBattery.setText("🔋 ?")
+            self.gorunum.metin(self.labelAracDurum, "Bağlı Değil")
+            self.gorunum.durum(self.labelAracDurum, DURUM, DURUM_KOPUK)
+            self.update_battery_status(None)
 
-    def is_arac_connected(self):
-        """Araç bağlantısını kontrol et - optimize edilmiş versiyon"""
-        try:
-            with socket.create_connection((ARAC_IP, ARAC_PORT), timeout=0.5) as s:
-                return True
-        except (socket.timeout, socket.error, ConnectionRefusedError, OSError):
-            return False
+    def kare_ciz(self):
+        # Render zamanlayıcısı: önce son telemetri, sonra biriken tüm değişiklikler
+        self.telemetri_ciz()
+        self.gorunum.uygula()
+
+    def telemetri_ciz(self):
+        sayac, telemetri = self.ag_iscisi.son_telemetri()
+        if sayac == self._cizilen_telemetri:
+            return
+        self._cizilen_telemetri = sayac
+
+        if not telemetri:
+            self.gorunum.metin(self.labelTelemetri, "")
+            return
+
+        parcalar = []
+        if "derinlik" in telemetri:
+            parcalar.append(f"Derinlik: {telemetri['derinlik']:.1f} m")
+        if "yon" in telemetri:
+            parcalar.append(f"Yön: {telemetri['yon']:.0f}°")
+        if "yunuslama" in telemetri and "yalpa" in telemetri:
+            parcalar.append(f"Yunuslama/Yalpa: {telemetri['yunuslama']:.1f}°/{telemetri['yalpa']:.1f}°")
+        if "enlem" in telemetri and "boylam" in telemetri:
+            parcalar.append(f"GPS: {telemetri['enlem']:.5f}, {telemetri['boylam']:.5f}")
+        sizinti = bool(telemetri.get("sizinti"))
+        if sizinti:
+            parcalar.insert(0, "⚠ SIZINTI")
+        self.gorunum.durum(self.labelTelemetri, SIZINTI, sizinti)
+        self.gorunum.metin(self.labelTelemetri, "   ".join(parcalar))
+
+        if "sarj" in telemetri:
+            self.update_battery_status(int(round(telemetri["sarj"])))
+
+    def iz_guncelle(self):
+        self._iz_sayac, (enlemler, boylamlar) = self.ag_iscisi.telemetri.since(
+            self._iz_sayac, "enlem", "boylam")
+        gecerli = ~(np.isnan(enlemler) | np.isnan(boylamlar))
+        self.harita.iz_ekle(enlemler[gecerli], boylamlar[gecerli])
+        self.harita.gonder()
 
-    def terminale_yaz(self, mesaj):
-        self.terminalTextEdit.append(mesaj)
+    def anomalileri_goster(self, anomaliler):
+        etiketler = (self.labelAnomali_1, self.labelAnomali_2,
+                     self.labelAnomali_3, self.labelAnomali_4)
+        for i, etiket in enumerate(etiketler):
+            if i >= len(anomaliler):
+                self.gorunum.metin(etiket, "")
+                self.gorunum.ayarla(etiket, "toolTip", "")
+                continue
+            olay = anomaliler[i]
+            saat = time.strftime("%H:%M:%S", time.localtime(olay["zaman"])) \
+                if olay["zaman"] == olay["zaman"] else "--:--:--"
+            self.gorunum.metin(
+                etiket,
+                f"{olay['kanal']} {olay['puan']:.1f}σ {saat}\n"
+                f"{olay['enlem']:.6f}, {olay['boylam']:.6f}")
+            self.gorunum.ayarla(
+                etiket, "toolTip",
+                f"{olay['kanal']} = {olay['deger']:.3f} (z = {olay['z']:+.1f})")
 
-    def draw_route_on_map(self, start_lat, start_lng, end_lat, end_lng):
-        js = f"drawRoute({start_lat}, {start_lng}, {end_lat}, {end_lng});"
-        self.widgetForOpenStreetMap.page().runJavaScript(js)
+    def terminale_yaz(self, mesaj, seviye=terminal_log.BILGI):
+        self.terminal_log.yaz(mesaj, seviye)
+
+    def draw_route_on_map(self, gorev):
+        # Önceki rota ve işaretler sayfada yenileriyle değiştirilir
+        self.harita.rota_ciz(np.column_stack([gorev.enlemler, gorev.boylamlar]))
+        self.harita.isaret_koy("baslangic", gorev.enlemler[0], gorev.boylamlar[0], "Başlangıç")
+        self.harita.isaret_koy("bitis", gorev.enlemler[-1], gorev.boylamlar[-1], "Bitiş")
+
+    def gorev_olustur(self):
+        """Koordinat alanlarından dalış görevi; hatalı girişte ValueError.
+
+        Başlangıç alanına bir ya da birkaç `enlem,boylam` satırı, bitiş
+        alanına son nokta yazılır. Bitiş boşsa ve başlangıçta en az üç nokta
+        varsa bunlar poligon sayılır ve üzerinde tarama deseni üretilir.
+        """
+        noktalar = koordinatlari_oku(self.textEditBaslangicKonumu.toPlainText())
+        bitis = koordinatlari_oku(self.textEditBitisKonumu.toPlainText())
+        derinlik = CONFIG.get("gorev_derinligi", mission.VARSAYILAN_DERINLIK)
+        hiz = CONFIG.get("gorev_hizi", mission.VARSAYILAN_HIZ)
+        if not bitis and len(noktalar) >= 3:
+            if CONFIG.get("tarama_deseni", "serit") == "spiral":
+                desen = mission.spiral_tarama
+            else:
+                desen = mission.serit_tarama
+            return desen(noktalar, CONFIG.get("tarama_araligi", 20.0), derinlik=derinlik, hiz=hiz)
+        noktalar += bitis
+        return mission.Mission([n[0] for n in noktalar], [n[1] for n in noktalar], derinlik, hiz)
 
     def rota_ciz_butonuna_basildi(self):
         if not self.btnDalis.isChecked():
-            self.terminale_yaz("Önce 'Dalış Görevi'ni seçmelisiniz!")
+            self.terminale_yaz("Önce 'Dalış Görevi'ni seçmelisiniz!", terminal_log.UYARI)
             return
-        start = self.textEditBaslangicKonumu.toPlainText().split(",")
-        end = self.textEditBitisKonumu.toPlainText().split(",")
-        if len(start) == 2 and len(end) == 2:
-            try:
-                start_lat, start_lng = float(start[0]), float(start[1])
-                end_lat, end_lng = float(end[0]), float(end[1])
-                self.draw_route_on_map(start_lat, start_lng, end_lat, end_lng)
-                mesafe = self.haversine(start_lat, start_lng, end_lat, end_lng)
-                self.terminale_yaz(f"Rota çizildi: {start_lat},{start_lng} -> {end_lat},{end_lng} (Mesafe: {mesafe:.2f} m)")
-            except ValueError:
-                self.terminale_yaz("Hatalı koordinat girişi!")
+        try:
+            gorev = self.gorev_olustur()
+        except ValueError as e:
+            self.terminale_yaz(f"Hatalı koordinat girişi! {e}", terminal_log.UYARI)
+            return
+        self.draw_route_on_map(gorev)
+        self.terminale_yaz(
+            f"Rota çizildi: {gorev.enlemler[0]:.6f},{gorev.boylamlar[0]:.6f} -> "
+            f"{gorev.enlemler[-1]:.6f},{gorev.boylamlar[-1]:.6f}, {len(gorev)} nokta "
+            f"(Mesafe: {gorev.uzunluk():.2f} m, tahmini süre: {gorev.sure() / 60:.1f} dk)")
 
     def rota_ve_gorev_gonder(self):
-        
-        if not self.is_arac_connected():
-            self.terminale_yaz("HATA: Araç bağlı değil, bilgi gönderilemedi!")
-            return
         if self.btnDalis.isChecked():
-            start = self.textEditBaslangicKonumu.toPlainText().split(",")
-            end = self.textEditBitisKonumu.toPlainText().split(",")
             try:
-                start_lat, start_lng = float(start[0]), float(start[1])
-                end_lat, end_lng = float(end[0]), float(end[1])
-                veri = {
-                    "gorev": "dalis",
-                    "baslangic": [start_lat, start_lng],
-                    "bitis": [end_lat, end_lng]
-                }
-            except Exception:
-                self.terminale_yaz("Koordinatlar eksik veya hatalı!")
+                veri = self.gorev_olustur().mesaj()
+            except ValueError:
+                self.terminale_yaz("Koordinatlar eksik veya hatalı!", terminal_log.UYARI)
                 return
+            # Çok noktalı görev yüklemesi acil komutların önüne geçmez
+            oncelik = commands.TOPLU
         elif self.btnNesne.isChecked():
             veri = {
                 "gorev": "kablo",
                 "komut": "basla"
             }
+            oncelik = commands.NORMAL
+            # Yeni takipte önceki anomaliler listeden silinir
+            self.anomali_iscisi.sifirla()
         else:
-            self.terminale_yaz("Önce görev seçmelisiniz!")
+            self.terminale_yaz("Önce görev seçmelisiniz!", terminal_log.UYARI)
             return
 
-        try:
-            mesaj = json.dumps(veri).encode("utf-8")
-            with socket.create_connection((ARAC_IP, ARAC_PORT), timeout=2) as s:
-                s.sendall(mesaj)
-            self.terminale_yaz("Görev araca gönderildi.")
-        except Exception as e:
-            self.terminale_yaz(f"Veri gönderilemedi: {e}")
-
-    def haversine(self, lat1, lon1, lat2, lon2):
-        R = 6371000
-        phi1 = math.radians(lat1)
-        phi2 = math.radians(lat2)
-        dphi = math.radians(lat2 - lat1)
-        dlambda = math.radians(lon2 - lon1)
-        a = math.sin(dphi/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin(dlambda/2)**2
-        c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
-        return R * c 
+        self.ag_iscisi.komut_gonder("gorev", veri, oncelik)
 
     def kalibrasyon_butonuna_basildi(self):
-        if not self.is_arac_connected():
-            self.terminale_yaz("HATA: Araç bağlı değil, kalibrasyon başlatılamadı!")
+        self.ag_iscisi.komut_gonder("kalibrasyon", {"komut": "kalibrasyon"})
+
+    def acil_cikis_butonuna_basildi(self):
+        self.ag_iscisi.komut_gonder("acil", {"komut": "acil_cikis"}, commands.ACIL)
+
+    def oynatma_bitti(self, istatistik):
+        if "hata" in istatistik:
+            self.terminale_yaz(f"Kayıt oynatılamadı: {istatistik['hata']}", terminal_log.HATA)
             return
-        try:
-            veri = {"komut": "kalibrasyon"}
-            mesaj = json.dumps(veri).encode("utf-8")
-            with socket.create_connection((ARAC_IP, ARAC_PORT), timeout=2) as s:
-                s.sendall(mesaj)
-            self.terminale_yaz("Kalibrasyon komutu araca gönderildi.")
-        except Exception as e:
-            self.terminale_yaz(f"Kalibrasyon komutu gönderilemedi: {e}")
+        self.terminale_yaz(
+            f"Oynatma bitti: {istatistik['cerceve']} çerçeve, {istatistik['sure_s']:.1f} s, "
+            f"{istatistik['cerceve_s']:.0f} çerçeve/s, "
+            f"en büyük gecikme {istatistik['maks_gecikme_ms']:.1f} ms")
+
+    def komut_sonucu_geldi(self, tur, sira, durum, ayrinti):
+        mesaj, seviye = KOMUT_MESAJLARI[durum]
+        self.terminale_yaz(
+            f"[#{sira}] " + mesaj.format(ad=KOMUT_ADLARI.get(tur, tur), ayrinti=ayrinti), seviye)
 
     def update_datetime(self):
         """Tarih ve saat güncelle - optimize edilmiş"""
@@ -562,207 +955,78 @@ class Ui_MainWindow(object):
             import datetime
             now = datetime.datetime.now()
             datetime_str = now.strftime("%d.%m.%Y %H:%M:%S")
-            self.labelDateTime.setText(datetime_str)
+            self.gorunum.metin(self.labelDateTime, datetime_str)
         except Exception:
             pass
 
-    def update_battery_status(self):
-        try:
-            veri = {"komut": "sarj_durumu"}
-            mesaj = json.dumps(veri).encode("utf-8")
-            
-            with socket.create_connection((ARAC_IP, ARAC_PORT), timeout=1) as s:
-                s.sendall(mesaj)
-                response = s.recv(1024).decode("utf-8")
-                data = json.loads(response)
-                
-                if "sarj" in data:
-                    sarj_yuzdesi = data["sarj"]
-                    if sarj_yuzdesi > 50:
-                        color = BATTERY_GREEN
-                    elif sarj_yuzdesi > 20:
-                        color = BATTERY_ORANGE
-                    else:
-                        color = BATTERY_RED
-                    
-                    self.labelBattery.setStyleSheet(f"color: {color}; font-weight: bold; font-size: 12px;")
-                    self.labelBattery.setText(f"🔋 {sarj_yuzdesi}%")
-                else:
-                    self.labelBattery.setStyleSheet(f"color: {BATTERY_WHITE}; font-weight: bold; font-size: 12px;")
-                    self.labelBattery.setText("🔋 ?")
-        except Exception:
-            self.labelBattery.setStyleSheet(f"color: {BATTERY_WHITE}; font-weight: bold; font-size: 12px;")
-            self.labelBattery.setText("🔋 ?")
+    def update_battery_status(self, sarj_yuzdesi):
+        if sarj_yuzdesi is None:
+            self.gorunum.durum(self.labelBattery, SEVIYE, SEVIYE_BILINMIYOR)
+            self.gorunum.metin(self.labelBattery, "🔋 ?")
+            return
+
+        if sarj_yuzdesi > 50:
+            seviye = SEVIYE_YUKSEK
+        elif sarj_yuzdesi > 20:
+            seviye = SEVIYE_ORTA
+        else:
+            seviye = SEVIYE_DUSUK
+
+        self.gorunum.durum(self.labelBattery, SEVIYE, seviye)
+        self.gorunum.metin(self.labelBattery, f"🔋 {sarj_yuzdesi}%")
 
     def apply_styles(self, MainWindow):
-        MainWindow.setStyleSheet(MAIN_WINDOW_STYLE)
-        
-        self.statusBar.setStyleSheet(STATUS_BAR_STYLE)
-        
-        self.labelDateTime.setStyleSheet(DATETIME_LABEL_STYLE)
-        
-        self.labelBattery.setStyleSheet(BATTERY_LABEL_STYLE)
-        
-        self.labelDalisGorevi.setStyleSheet(GOREV_LABEL_STYLE)
-        self.labelNesneGorevi.setStyleSheet(GOREV_LABEL_STYLE)
-        
-        self.textEditBaslangicKonumu.setStyleSheet(KOORDINAT_TEXT_STYLE)
-        self.textEditBitisKonumu.setStyleSheet(KOORDINAT_TEXT_STYLE)
-        
-        self.labelAnomali_1.setStyleSheet(ANOMALI_LABEL_STYLE)
-        self.labelAnomali_2.setStyleSheet(ANOMALI_LABEL_STYLE)
-        self.labelAnomali_3.setStyleSheet(ANOMALI_LABEL_STYLE)
-        self.labelAnomali_4.setStyleSheet(ANOMALI_LABEL_STYLE)
-        
-        self.pushButtonRotaCiz.setStyleSheet(BUTTON_STYLE)
-        self.pushButtonGonder.setStyleSheet(BUTTON_STYLE)
-        self.pushButtonKalibre.setStyleSheet(BUTTON_STYLE)
-        self.pushButtonSizdirmazlik.setStyleSheet(BUTTON_STYLE)
-        
-        self.btnDalis.setStyleSheet(RADIO_BUTTON_STYLE)
-        self.btnNesne.setStyleSheet(RADIO_BUTTON_STYLE)
-        
-        self.labelAracErisimHead.setStyleSheet(BASLIK_LABEL_STYLE)
-        self.labelAktifGorevHead.setStyleSheet(BASLIK_LABEL_STYLE)
-        self.labelKalibreText.setStyleSheet(BASLIK_LABEL_STYLE)
-        self.labelSizdirmazlikText.setStyleSheet(BASLIK_LABEL_STYLE)
-        
-        self.gorevSecimiAlani.setStyleSheet(GROUP_BOX_STYLE)
-        self.kontrolAlani.setStyleSheet(GROUP_BOX_STYLE)
-        self.groupBoxGPS.setStyleSheet(GROUP_BOX_STYLE)
-        self.groupBoxTerminal.setStyleSheet(GROUP_BOX_STYLE)
-        self.groupBoxTest.setStyleSheet(GROUP_BOX_STYLE)
-        
-        self.terminalTextEdit.setStyleSheet(TERMINAL_TEXT_STYLE)
-        
-        self.labelAracDurum.setStyleSheet(DURUM_LABEL_STYLE)
-        self.labelAracDurum_2.setStyleSheet(GOREV_DURUM_LABEL_STYLE)
+        # Tek derlenmiş stil; durum değişiklikleri yalnızca özellik değiştirir
+        MainWindow.setStyleSheet(UYGULAMA_STILI)
 
-    def update_widget_geometries(self, new_width, new_height):
-        status_bar_height = int(new_height * 0.068)
-        self.statusBar.setGeometry(QtCore.QRect(0, 0, new_width, status_bar_height))
-        
-        datetime_width = int(new_width * 0.208)
-        datetime_height = int(status_bar_height * 0.5)
-        datetime_y = int(status_bar_height * 0.25)
-        self.labelDateTime.setGeometry(QtCore.QRect(10, datetime_y, datetime_width, datetime_height))
-        
-        battery_width = int(new_width * 0.104)
-        battery_x = int(new_width * 0.885)
-        self.labelBattery.setGeometry(QtCore.QRect(battery_x, datetime_y, battery_width, datetime_height))
-        
-        gorev_grup_width = int(new_width * 0.708)
-        gorev_grup_height = int(new_height * 0.29)
-        gorev_y = int(new_height * 0.085)
-        self.gorevSecimiAlani.setGeometry(QtCore.QRect(10, gorev_y, gorev_grup_width, gorev_grup_height))
-        
-        self.update_gorev_widget_geometries(gorev_grup_width, gorev_grup_height)
-        
-        kontrol_grup_width = int(new_width * 0.272)
-        kontrol_grup_height = int(new_height * 0.138)
-        kontrol_y = int(new_height * 0.392)
-        self.kontrolAlani.setGeometry(QtCore.QRect(10, kontrol_y, kontrol_grup_width, kontrol_grup_height))
-        
-        self.update_kontrol_widget_geometries(kontrol_grup_width, kontrol_grup_height)
-        
-        gps_grup_width = int(new_width * 0.261)
-        gps_grup_height = int(new_height * 0.436)
-        gps_x = int(new_width * 0.729)
-        self.groupBoxGPS.setGeometry(QtCore.QRect(gps_x, gorev_y, gps_grup_width, gps_grup_height))
-        
-        map_width = int(gps_grup_width * 0.916)
-        map_height = int(gps_grup_height * 0.898)
-        map_margin = int(gps_grup_width * 0.04)
-        map_y = int(gps_grup_height * 0.059)
-        self.widgetForOpenStreetMap.setGeometry(QtCore.QRect(map_margin, map_y, map_width, map_height))
-        
-        terminal_grup_width = int(new_width * 0.521)
-        terminal_grup_height = int(new_height * 0.359)
-        terminal_y = int(new_height * 0.545)
-        self.groupBoxTerminal.setGeometry(QtCore.QRect(10, terminal_y, terminal_grup_width, terminal_grup_height))
-        
-        terminal_text_width = int(terminal_grup_width * 0.96)
-        terminal_text_height = int(terminal_grup_height * 0.858)
-        terminal_text_margin = int(terminal_grup_width * 0.02)
-        terminal_text_y = int(terminal_grup_height * 0.095)
-        self.terminalTextEdit.setGeometry(QtCore.QRect(terminal_text_margin, terminal_text_y, terminal_text_width, terminal_text_height))
-        
-        test_grup_width = int(new_width * 0.261)
-        test_grup_height = int(new_height * 0.155)
-        test_y = int(new_height * 0.545)
-        self.groupBoxTest.setGeometry(QtCore.QRect(gps_x, test_y, test_grup_width, test_grup_height))
-        
-        self.update_test_widget_geometries(test_grup_width, test_grup_height)
-    
-    def update_gorev_widget_geometries(self, gorev_grup_width, gorev_grup_height):
-        koordinat_width = int(gorev_grup_width * 0.17)
-        buton_width_big = int(gorev_grup_width * 0.14)
-        buton_width_small = int(gorev_grup_width * 0.11)
-        anomali_width = int(gorev_grup_width * 0.14)
-        nesne_width = int(gorev_grup_width * 0.20)
-        dalış_width = int(gorev_grup_width * 0.20)
-        
-        ust_satir_y = int(gorev_grup_height * 0.18)  
-        alt_satir_y = int(gorev_grup_height * 0.53)  
-        widget_height = int(gorev_grup_height * 0.24)  
-        
-        self.textEditBaslangicKonumu.setGeometry(QtCore.QRect(int(gorev_grup_width * 0.29), ust_satir_y, koordinat_width, widget_height))
-        self.textEditBitisKonumu.setGeometry(QtCore.QRect(int(gorev_grup_width * 0.48), ust_satir_y, koordinat_width, widget_height))
-        
-        self.labelAnomali_1.setGeometry(QtCore.QRect(int(gorev_grup_width * 0.29), alt_satir_y, anomali_width, widget_height))
-        self.labelAnomali_2.setGeometry(QtCore.QRect(int(gorev_grup_width * 0.46), alt_satir_y, anomali_width, widget_height))
-        self.labelAnomali_3.setGeometry(QtCore.QRect(int(gorev_grup_width * 0.63), alt_satir_y, anomali_width, widget_height))
-        self.labelAnomali_4.setGeometry(QtCore.QRect(int(gorev_grup_width * 0.81), alt_satir_y, anomali_width, widget_height))
-        
-        self.labelNesneGorevi.setGeometry(QtCore.QRect(int(gorev_grup_width * 0.07), alt_satir_y, nesne_width, widget_height))
-        self.labelDalisGorevi.setGeometry(QtCore.QRect(int(gorev_grup_width * 0.07), ust_satir_y, dalış_width, widget_height))
-        
-        self.pushButtonRotaCiz.setGeometry(QtCore.QRect(int(gorev_grup_width * 0.67), ust_satir_y, buton_width_big, widget_height))
-        self.pushButtonGonder.setGeometry(QtCore.QRect(int(gorev_grup_width * 0.83), ust_satir_y, buton_width_small, widget_height))
-        
-        radio_x = int(gorev_grup_width * 0.029)
-        radio_width = int(gorev_grup_width * 0.029)
-        radio_height = int(gorev_grup_height * 0.118)
-        radio_dalis_y = int(gorev_grup_height * 0.235)
-        radio_nesne_y = int(gorev_grup_height * 0.588)
-        self.btnDalis.setGeometry(QtCore.QRect(radio_x, radio_dalis_y, radio_width, radio_height))
-        self.btnNesne.setGeometry(QtCore.QRect(radio_x, radio_nesne_y, radio_width, radio_height))
-    
-    def update_kontrol_widget_geometries(self, kontrol_grup_width, kontrol_grup_height):
-        kontrol_margin = int(kontrol_grup_width * 0.08)
-        head_label_width = int(kontrol_grup_width * 0.42)
-        durum_label_width = int(kontrol_grup_width * 0.35)
-        
-        self.labelAracErisimHead.setGeometry(QtCore.QRect(kontrol_margin, int(kontrol_grup_height * 0.25), head_label_width, 16))
-        self.labelAracDurum.setGeometry(QtCore.QRect(int(kontrol_grup_width * 0.55), int(kontrol_grup_height * 0.25), durum_label_width, 16))
-        self.labelAktifGorevHead.setGeometry(QtCore.QRect(kontrol_margin, int(kontrol_grup_height * 0.60), head_label_width, 16))
-        self.labelAracDurum_2.setGeometry(QtCore.QRect(int(kontrol_grup_width * 0.55), int(kontrol_grup_height * 0.60), durum_label_width, 16))
-    
-    def update_test_widget_geometries(self, test_grup_width, test_grup_height):
-        test_button_width = int(test_grup_width * 0.35)
-        test_label_width = int(test_grup_width * 0.54)
-        test_button_height = int(test_grup_height * 0.35)
-        test_label_height = int(test_grup_height * 0.35)
-        test_margin = int(test_grup_width * 0.04)
-        test_label_x = int(test_grup_width * 0.43)
-        
-        kalibrasyon_y = int(test_grup_height * 0.25)
-        sizdirmazlik_y = int(test_grup_height * 0.63)
-        
-        self.pushButtonKalibre.setGeometry(QtCore.QRect(test_margin, kalibrasyon_y, test_button_width, test_button_height))
-        self.labelKalibreText.setGeometry(QtCore.QRect(test_label_x, kalibrasyon_y, test_label_width, test_label_height))
-        self.pushButtonSizdirmazlik.setGeometry(QtCore.QRect(test_margin, sizdirmazlik_y, test_button_width, test_button_height))
-        self.labelSizdirmazlikText.setGeometry(QtCore.QRect(test_label_x, sizdirmazlik_y, test_label_width, test_label_height))
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="DOLPA Yer Kontrol İstasyonu")
+    parser.add_argument("--oynat", metavar="KAYIT",
+                        help="araç yerine bir dalış kaydını oynat (.dkyt)")
+    parser.add_argument("--hiz", default="1",
+                        help="oynatma hızı çarpanı (1, 10, ...) ya da 'max' (varsayılan: 1)")
+    parser.add_argument("--baslangic", type=float, default=0.0, metavar="SANIYE",
+                        help="oynatmaya kaydın başından bu kadar saniye sonra başla "
+                             "(oynatırken Ctrl+Sağ/Sol ile ileri/geri sarılır)")
+    parser.add_argument("--tanilama", action="store_true",
+                        help="takılma bekçisi, slot süreleri ve profil kısayolları "
+                             "(DOLPA_TANILAMA=1 ile de açılır)")
+    args, _ = parser.parse_known_args(argv)
+    if args.hiz == "max":
+        args.hiz = None
+    else:
+        try:
+            args.hiz = float(args.hiz)
+        except ValueError:
+            parser.error("--hiz bir sayı ya da 'max' olmalı")
+        # 0 sıfıra bölme, negatif geri akan hedef zaman demek; nan/inf de reddedilir
+        if not (math.isfinite(args.hiz) and args.hiz > 0):
+            parser.error("--hiz sıfırdan büyük sonlu bir sayı ya da 'max' olmalı")
+    if not (math.isfinite(args.baslangic) and args.baslangic >= 0):
+        parser.error("--baslangic sıfır ya da pozitif sonlu bir sayı olmalı")
+    if args.oynat:
+        # Bozuk/eksik kayıt ağ thread'inde değil, burada anlaşılır bir hatayla durur
+        try:
+            recorder.DiveRecording(args.oynat).close()
+        except (OSError, ValueError) as e:
+            parser.error(f"--oynat: kayıt açılamadı: {e}")
+    return args
 
 if __name__ == "__main__":
     import sys
-    
+
+    args = parse_args(sys.argv[1:])
+    oynatma = None
+    if args.oynat:
+        oynatma = {"yol": args.oynat, "hiz": args.hiz, "baslangic": args.baslangic}
+
+    mapview.sema_kaydet()
     app = QtWidgets.QApplication(sys.argv)
     app.setAttribute(QtCore.Qt.AA_EnableHighDpiScaling, True)
     app.setAttribute(QtCore.Qt.AA_UseHighDpiPixmaps, True)
     
     MainWindow = ResponsiveMainWindow()
-    ui = Ui_MainWindow()
+    ui = Ui_MainWindow(oynatma, diagnostics.etkin_mi(args.tanilama))
     ui.setupUi(MainWindow)
     
     MainWindow.show()
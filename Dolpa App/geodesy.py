@@ -0,0 +1,144 @@
+# -*- coding: utf-8 -*-
+"""
+DOLPA Underwater Technologies
+Jeodezi Hesapları
+
+Rota uzunluğu, kablo takibinde çapraz iz hatası, hedefe uzaklık ve iz
+istatistikleri için NumPy ile vektörleştirilmiş fonksiyonlar. Tüm
+fonksiyonlar tek değer de dizi de alır ve NumPy yayınlama (broadcasting)
+kurallarıyla çalışır. Açılar derece, uzaklıklar metredir.
+
+Küresel hesaplar (haversine ve türevleri) ortalama yarıçaplı küre
+kullanır; `enu` ise WGS84 elipsoidi üzerinden gerçek yerel doğu-kuzey-yukarı
+koordinatlarını verir.
+"""
+
+import numpy as np
+
+DUNYA_YARICAPI = 6371000.0  # metre (küre)
+
+# WGS84
+WGS84_A = 6378137.0
+WGS84_F = 1 / 298.257223563
+WGS84_B = WGS84_A * (1 - WGS84_F)
+WGS84_E2 = WGS84_F * (2 - WGS84_F)
+WGS84_EP2 = WGS84_E2 / (1 - WGS84_E2)
+
+
+def _sonuc(deger):
+    # Tek değer girişinde float döndür
+    return deger.item() if np.ndim(deger) == 0 else deger
+
+
+def mesafe(enlem1, boylam1, enlem2, boylam2, r=DUNYA_YARICAPI):
+    """İki nokta arasındaki büyük daire uzaklığı (haversine)."""
+    phi1 = np.radians(enlem1)
+    phi2 = np.radians(enlem2)
+    dphi = phi2 - phi1
+    dlambda = np.radians(np.subtract(boylam2, boylam1))
+    a = np.sin(dphi / 2) ** 2 + np.cos(phi1) * np.cos(phi2) * np.sin(dlambda / 2) ** 2
+    return _sonuc(2 * r * np.arctan2(np.sqrt(a), np.sqrt(1 - a)))
+
+
+def yon(enlem1, boylam1, enlem2, boylam2):
+    """Birinci noktadan ikinciye başlangıç yönü (0-360, kuzeyden saat yönünde)."""
+    phi1 = np.radians(enlem1)
+    phi2 = np.radians(enlem2)
+    dlambda = np.radians(np.subtract(boylam2, boylam1))
+    y = np.sin(dlambda) * np.cos(phi2)
+    x = np.cos(phi1) * np.sin(phi2) - np.sin(phi1) * np.cos(phi2) * np.cos(dlambda)
+    return _sonuc(np.degrees(np.arctan2(y, x)) % 360.0)
+
+
+def hedef(enlem, boylam, yon_derece, uzaklik, r=DUNYA_YARICAPI):
+    """Noktadan verilen yönde `uzaklik` metre gidilince varılan (enlem, boylam)."""
+    phi1 = np.radians(enlem)
+    lambda1 = np.radians(boylam)
+    theta = np.radians(yon_derece)
+    delta = np.divide(uzaklik, r)
+    sin_phi2 = np.sin(phi1) * np.cos(delta) + np.cos(phi1) * np.sin(delta) * np.cos(theta)
+    phi2 = np.arcsin(np.clip(sin_phi2, -1.0, 1.0))
+    lambda2 = lambda1 + np.arctan2(np.sin(theta) * np.sin(delta) * np.cos(phi1),
+                                   np.cos(delta) - np.sin(phi1) * sin_phi2)
+    boylam2 = (np.degrees(lambda2) + 540.0) % 360.0 - 180.0
+    return _sonuc(np.degrees(phi2)), _sonuc(boylam2)
+
+
+def capraz_mesafe(enlem, boylam, enlem1, boylam1, enlem2, boylam2, r=DUNYA_YARICAPI):
+    """Noktanın 1 -> 2 büyük dairesine işaretli uzaklığı (sağda pozitif)."""
+    d13 = np.asarray(mesafe(enlem1, boylam1, enlem, boylam, r)) / r
+    theta13 = np.radians(yon(enlem1, boylam1, enlem, boylam))
+    theta12 = np.radians(yon(enlem1, boylam1, enlem2, boylam2))
+    return _sonuc(np.arcsin(np.clip(np.sin(d13) * np.sin(theta13 - theta12), -1.0, 1.0)) * r)
+
+
+def boyuna_mesafe(enlem, boylam, enlem1, boylam1, enlem2, boylam2, r=DUNYA_YARICAPI):
+    """1 noktasından, noktanın 1 -> 2 büyük dairesindeki izdüşümüne uzaklık
+    (izdüşüm 1'in gerisindeyse negatif)."""
+    d13 = np.asarray(mesafe(enlem1, boylam1, enlem, boylam, r)) / r
+    theta13 = np.radians(yon(enlem1, boylam1, enlem, boylam))
+    theta12 = np.radians(yon(enlem1, boylam1, enlem2, boylam2))
+    dxt = np.arcsin(np.clip(np.sin(d13) * np.sin(theta13 - theta12), -1.0, 1.0))
+    cos_dxt = np.cos(dxt)
+    dat = np.arccos(np.clip(np.cos(d13) / np.where(cos_dxt == 0, 1.0, cos_dxt), -1.0, 1.0))
+    return _sonuc(np.where(np.cos(theta13 - theta12) < 0, -dat, dat) * r)
+
+
+def yol_uzunlugu(enlemler, boylamlar, r=DUNYA_YARICAPI):
+    """Ardışık noktalardan oluşan yolun toplam uzunluğu."""
+    enlemler = np.asarray(enlemler, dtype=np.float64)
+    boylamlar = np.asarray(boylamlar, dtype=np.float64)
+    if len(enlemler) < 2:
+        return 0.0
+    return float(np.sum(mesafe(enlemler[:-1], boylamlar[:-1], enlemler[1:], boylamlar[1:], r)))
+
+
+def ecef(enlem, boylam, yukseklik=0.0):
+    """WGS84 coğrafi koordinatlardan yer merkezli (x, y, z)."""
+    phi = np.radians(enlem)
+    lam = np.radians(boylam)
+    sin_phi = np.sin(phi)
+    n = WGS84_A / np.sqrt(1 - WGS84_E2 * sin_phi ** 2)
+    x = (n + yukseklik) * np.cos(phi) * np.cos(lam)
+    y = (n + yukseklik) * np.cos(phi) * np.sin(lam)
+    z = (n * (1 - WGS84_E2) + yukseklik) * sin_phi
+    return x, y, z
+
+
+def ecef_ters(x, y, z):
+    """Yer merkezli (x, y, z)'den WGS84 (enlem, boylam, yükseklik); Bowring yöntemi."""
+    p = np.hypot(x, y)
+    theta = np.arctan2(z * WGS84_A, p * WGS84_B)
+    phi = np.arctan2(z + WGS84_EP2 * WGS84_B * np.sin(theta) ** 3,
+                     p - WGS84_E2 * WGS84_A * np.cos(theta) ** 3)
+    n = WGS84_A / np.sqrt(1 - WGS84_E2 * np.sin(phi) ** 2)
+    yukseklik = p / np.cos(phi) - n
+    return _sonuc(np.degrees(phi)), _sonuc(np.degrees(np.arctan2(y, x))), _sonuc(yukseklik)
+
+
+def _enu_eksenleri(enlem0, boylam0):
+    phi = np.radians(enlem0)
+    lam = np.radians(boylam0)
+    return np.sin(phi), np.cos(phi), np.sin(lam), np.cos(lam)
+
+
+def enu(enlem, boylam, enlem0, boylam0, yukseklik=0.0, yukseklik0=0.0):
+    """Noktaların (enlem0, boylam0) başlangıçlı yerel (doğu, kuzey, yukarı) koordinatları."""
+    x, y, z = ecef(enlem, boylam, yukseklik)
+    x0, y0, z0 = ecef(enlem0, boylam0, yukseklik0)
+    dx, dy, dz = x - x0, y - y0, z - z0
+    sp, cp, sl, cl = _enu_eksenleri(enlem0, boylam0)
+    dogu = -sl * dx + cl * dy
+    kuzey = -sp * cl * dx - sp * sl * dy + cp * dz
+    yukari = cp * cl * dx + cp * sl * dy + sp * dz
+    return _sonuc(dogu), _sonuc(kuzey), _sonuc(yukari)
+
+
+def enu_ters(dogu, kuzey, enlem0, boylam0, yukari=0.0, yukseklik0=0.0):
+    """Yerel (doğu, kuzey, yukarı) koordinatlardan (enlem, boylam, yükseklik)."""
+    x0, y0, z0 = ecef(enlem0, boylam0, yukseklik0)
+    sp, cp, sl, cl = _enu_eksenleri(enlem0, boylam0)
+    dx = -sl * dogu - sp * cl * kuzey + cp * cl * yukari
+    dy = cl * dogu - sp * sl * kuzey + cp * sl * yukari
+    dz = cp * kuzey + sp * yukari
+    return ecef_ters(x0 + dx, y0 + dy, z0 + dz)
@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+DOLPA Underwater Technologies
+Yerleşim Tablosu
+
+Ana penceredeki tüm widget'ların konumu ve boyutu tek bir tabloda, üst
+widget'a oranla tanımlanır. Hem setupUi hem yeniden boyutlandırma bu tabloyu
+okur. Yeniden boyutlandırmalar kare başına tek yerleşim geçişine indirgenir
+ve dikdörtgeni değişmeyen widget'lara dokunulmaz.
+"""
+
+from PyQt5 import QtCore
+
+# (widget, üst widget, (x, y, genişlik, yükseklik))
+# float değerler üst widget'ın genişliğine (x, genişlik) ya da yüksekliğine
+# (y, yükseklik) oranıdır; int değerler sabit pikseldir. Üst widget None ise
+# ana pencere. Üstler çocuklarından önce gelmelidir.
+YERLESIM = (
+    # Durum çubuğu
+    ("statusBar",               None,               (0, 0, 1.0, 0.068)),
+    ("labelDateTime",           "statusBar",        (10, 0.25, 0.208, 0.5)),
+    ("labelBattery",            "statusBar",        (0.885, 0.25, 0.104, 0.5)),
+    ("labelTelemetri",          "statusBar",        (0.23, 0.25, 0.64, 0.5)),
+
+    # Görev seçimi
+    ("gorevSecimiAlani",        None,               (10, 0.085, 0.708, 0.29)),
+    ("btnDalis",                "gorevSecimiAlani", (0.029, 0.235, 0.029, 0.118)),
+    ("btnNesne",                "gorevSecimiAlani", (0.029, 0.588, 0.029, 0.118)),
+    ("labelDalisGorevi",        "gorevSecimiAlani", (0.07, 0.18, 0.20, 0.24)),
+    ("labelNesneGorevi",        "gorevSecimiAlani", (0.07, 0.53, 0.20, 0.24)),
+    ("textEditBaslangicKonumu", "gorevSecimiAlani", (0.29, 0.18, 0.17, 0.24)),
+    ("textEditBitisKonumu",     "gorevSecimiAlani", (0.48, 0.18, 0.17, 0.24)),
+    ("pushButtonRotaCiz",       "gorevSecimiAlani", (0.67, 0.18, 0.14, 0.24)),
+    ("pushButtonGonder",        "gorevSecimiAlani", (0.83, 0.18, 0.11, 0.24)),
+    ("labelAnomali_1",          "gorevSecimiAlani", (0.29, 0.53, 0.14, 0.24)),
+    ("labelAnomali_2",          "gorevSecimiAlani", (0.46, 0.53, 0.14, 0.24)),
+    ("labelAnomali_3",          "gorevSecimiAlani", (0.63, 0.53, 0.14, 0.24)),
+    ("labelAnomali_4",          "gorevSecimiAlani", (0.81, 0.53, 0.14, 0.24)),
+
+    # Kontrol alanı
+    ("kontrolAlani",            None,               (10, 0.392, 0.521, 0.138)),
+    ("labelAracErisimHead",     "kontrolAlani",     (0.042, 0.25, 0.219, 16)),
+    ("labelAracDurum",          "kontrolAlani",     (0.287, 0.25, 0.183, 16)),
+    ("labelAktifGorevHead",     "kontrolAlani",     (0.042, 0.60, 0.219, 16)),
+    ("labelAracDurum_2",        "kontrolAlani",     (0.287, 0.60, 0.183, 16)),
+    ("comboBoxArac",            "kontrolAlani",     (0.287, 0.02, 0.219, 18)),
+    ("labelBaglanti",           "kontrolAlani",     (0.50, 0.17, 0.49, 0.8)),
+
+    # Kamera
+    ("groupBoxKamera",          None,               (0.542, 0.392, 0.176, 0.512)),
+    ("widgetKamera",            "groupBoxKamera",   (0.04, 0.07, 0.92, 0.9)),
+
+    # GPS
+    ("groupBoxGPS",             None,               (0.729, 0.085, 0.261, 0.436)),
+    ("widgetForOpenStreetMap",  "groupBoxGPS",      (0.04, 0.059, 0.916, 0.898)),
+
+    # Terminal
+    ("groupBoxTerminal",        None,               (10, 0.545, 0.521, 0.359)),
+    ("terminalTextEdit",        "groupBoxTerminal", (0.02, 0.095, 0.96, 0.858)),
+    ("comboBoxLogSeviye",       "groupBoxTerminal", (0.80, 0, 0.18, 0.095)),
+
+    # Test
+    ("groupBoxTest",            None,               (0.729, 0.545, 0.261, 0.155)),
+    ("pushButtonKalibre",       "groupBoxTest",     (0.04, 0.25, 0.35, 0.35)),
+    ("labelKalibreText",        "groupBoxTest",     (0.43, 0.25, 0.54, 0.35)),
+    ("pushButtonSizdirmazlik",  "groupBoxTest",     (0.04, 0.63, 0.35, 0.35)),
+    ("labelSizdirmazlikText",   "groupBoxTest",     (0.43, 0.63, 0.54, 0.35)),
+
+    # Acil çıkış
+    ("pushButtonAcil",          None,               (0.729, 0.72, 0.261, 0.06)),
+)
+
+
+def _olcek(deger, boyut):
+    return int(boyut * deger) if isinstance(deger, float) else deger
+
+
+def hesapla(genislik, yukseklik, tablo=YERLESIM):
+    """Pencere boyutu için {widget adı: (x, y, genişlik, yükseklik)}."""
+    dikdortgenler = {}
+    for ad, ust, (x, y, gen, yuk) in tablo:
+        if ust is None:
+            ust_g, ust_y = genislik, yukseklik
+        else:
+            ust_g, ust_y = dikdortgenler[ust][2:]
+        dikdortgenler[ad] = (_olcek(x, ust_g), _olcek(y, ust_y), _olcek(gen, ust_g), _olcek(yuk, ust_y))
+    return dikdortgenler
+
+
+class LayoutEngine(QtCore.QObject):
+    """Tablodan yerleşim uygulayan, yeniden boyutlandırmaları birleştiren motor.
+
+    `planla` her resizeEvent'te çağrılabilir; yalnızca son boyut saklanır ve
+    bir kare süresi sonra tek geçişte uygulanır.
+    """
+
+    def __init__(self, ui, aralik_ms=16, tablo=YERLESIM, parent=None):
+        super().__init__(parent)
+        self.ui = ui
+        self.tablo = tablo
+        # Tablo bir kez çözülür: (widget, üstün sıra numarası ya da -1, oranlar)
+        sira = {ad: i for i, (ad, _, _) in enumerate(tablo)}
+        self._derli = [(getattr(ui, ad), -1 if ust is None else sira[ust], oranlar)
+                       for ad, ust, oranlar in tablo]
+        self._son = [None] * len(tablo)  # son uygulanan dikdörtgenler
+        self._bekleyen = None    # (genişlik, yükseklik)
+        self.gecis = 0           # yapılan yerleşim geçişi
+        self.istek = 0           # gelen yeniden boyutlandırma
+        self.uygulanan = 0       # setGeometry çağrısı
+        self.atlanan = 0         # dikdörtgeni değişmediği için atlanan
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(aralik_ms)
+        self._timer.timeout.connect(self._bekleyeni_uygula)
+
+    def planla(self, genislik, yukseklik):
+        self.istek += 1
+        self._bekleyen = (genislik, yukseklik)
+        if not self._timer.isActive():
+            self._timer.start()
+
+    def bekleyen_var(self):
+        return self._bekleyen is not None
+
+    def uygula(self, genislik, yukseklik):
+        """Yerleşimi hemen uygula; kuyruktaki yeniden boyutlandırmayı iptal eder."""
+        self._timer.stop()
+        self._bekleyen = None
+        self.gecis += 1
+        son = self._son
+        for i, (widget, ust, (x, y, gen, yuk)) in enumerate(self._derli):
+            if ust < 0:
+                ust_g, ust_y = genislik, yukseklik
+            else:
+                ust_g, ust_y = son[ust][2], son[ust][3]
+            dikdortgen = (_olcek(x, ust_g), _olcek(y, ust_y), _olcek(gen, ust_g), _olcek(yuk, ust_y))
+            if son[i] == dikdortgen:
+                self.atlanan += 1
+                continue
+            widget.setGeometry(*dikdortgen)
+            son[i] = dikdortgen
+            self.uygulanan += 1
+
+    def _bekleyeni_uygula(self):
+        if self._bekleyen is not None:
+            self.uygula(*self._bekleyen)
@@ -0,0 +1,260 @@
+# -*- coding: utf-8 -*-
+"""
+DOLPA Underwater Technologies
+Bağlantı Ölçümleri
+
+Her araç oturumu kendi sayaçlarını tutar: gelen/giden bayt ve mesaj,
+yeniden bağlanma, çözme hatası, zaman aşımı ve istek-yanıt gidiş-dönüş
+süreleri (RTT). RTT'ler log ölçekli sabit kovalı bir histogramda birikir;
+örnek başına iş sabittir ve yüzdelikler kovalardan tahmin edilir.
+
+Sayaçlar ağ thread'inde artar. GUI tarafındaki LinkMonitor saniyede bir
+anlık görüntü alır; hızlar ve yüzdelikler son `pencere_s` saniyedeki
+farktan hesaplanır, böylece bağlantı kopmadan önceki bozulma görülür.
+Aynı görüntüden Prometheus metin biçimi ve JSON üretilir; isteğe bağlı
+olarak yerel bir HTTP ucundan (MetricsServer) ya da periyodik bir JSON
+dosyasından dışa verilir.
+"""
+
+import collections
+import http.server
+import json
+import math
+import os
+import threading
+import time
+
+import numpy as np
+
+# RTT kova üst sınırları (ms): 0.25 ms'den ~65 s'ye, her kova bir öncekinin √2 katı
+KOVALAR_MS = 0.25 * np.sqrt(2.0) ** np.arange(37)
+PENCERE_S = 30.0
+
+# Bağlantı kalitesi (p95 RTT, ms); pencerede RTT ölçümü yoksa bilinmiyor
+KALITE_IYI = "iyi"
+KALITE_ZAYIF = "zayif"
+KALITE_KOTU = "kotu"
+KALITE_BILINMIYOR = "bilinmiyor"
+ZAYIF_RTT_MS = 250.0
+KOTU_RTT_MS = 1000.0
+
+# Anlık görüntüdeki sayaçlar; Prometheus adları ve açıklamaları
+SAYACLAR = (
+    ("gelen_bayt", "received_bytes_total", "Araçtan alınan bayt"),
+    ("giden_bayt", "sent_bytes_total", "Araca gönderilen bayt"),
+    ("gelen_mesaj", "received_messages_total", "Araçtan alınan mesaj"),
+    ("giden_mesaj", "sent_messages_total", "Araca gönderilen mesaj"),
+    ("yeniden_baglanma", "reconnects_total", "İlk bağlantıdan sonraki bağlanmalar"),
+    ("cozme_hatasi", "decode_errors_total", "Çerçeve çözme hataları"),
+    ("zaman_asimi", "request_timeouts_total", "Yanıtı zamanında gelmeyen istekler"),
+)
+KUYRUKLAR = (
+    ("komut", "command_queue_depth", "Gönderilmeyi bekleyen komut"),
+    ("onay", "commands_in_flight", "Onay bekleyen komut"),
+    ("istek", "pending_requests", "Yanıt bekleyen istek"),
+    ("soket", "socket_send_buffer_bytes", "Sokette gönderilmeyi bekleyen bayt"),
+)
+
+
+class LinkMetrics:
+    """Tek oturumun bağlantı sayaçları ve RTT histogramı.
+
+    Yalnızca oturumun thread'inde yazılır; `goruntu` başka thread'den
+    çağrılabilir (tutarlılık kova düzeyindedir).
+    """
+
+    def __init__(self):
+        self.rtt_kovalari = np.zeros(len(KOVALAR_MS) + 1, dtype=np.int64)  # son kova: +Inf
+        self.rtt_toplam_ms = 0.0
+        self.rtt_sayisi = 0
+        self.gelen_bayt = 0
+        self.giden_bayt = 0
+        self.gelen_mesaj = 0
+        self.giden_mesaj = 0
+        self.baglanma = 0
+        self.cozme_hatasi = 0
+        self.zaman_asimi = 0
+        self.kuyruklar = dict.fromkeys((k for k, _, _ in KUYRUKLAR), 0)
+
+    @property
+    def yeniden_baglanma(self):
+        return max(self.baglanma - 1, 0)
+
+    def rtt_ekle(self, ms):
+        self.rtt_kovalari[int(np.searchsorted(KOVALAR_MS, ms))] += 1
+        self.rtt_toplam_ms += ms
+        self.rtt_sayisi += 1
+
+    def goruntu(self):
+        """Sayaçların kopyası (sözlük)."""
+        goruntu = {ad: getattr(self, ad) for ad, _, _ in SAYACLAR}
+        goruntu["kuyruklar"] = dict(self.kuyruklar)
+        goruntu["rtt_kovalari"] = self.rtt_kovalari.copy()
+        goruntu["rtt_toplam_ms"] = self.rtt_toplam_ms
+        return goruntu
+
+
+def yuzdelik(kovalar, yuzde):
+    """Kova sayılarından yüzdelik tahmini (ms); örnek yoksa NaN.
+
+    Kova içinde log ölçekte doğrusal dağılım varsayılır.
+    """
+    toplam = int(kovalar.sum())
+    if toplam == 0:
+        return math.nan
+    hedef = yuzde / 100.0 * toplam
+    birikimli = np.cumsum(kovalar)
+    i = int(np.searchsorted(birikimli, hedef))
+    if i >= len(KOVALAR_MS):
+        return float(KOVALAR_MS[-1])
+    ust = KOVALAR_MS[i]
+    alt = ust / math.sqrt(2.0)
+    onceki = birikimli[i - 1] if i else 0
+    oran = (hedef - onceki) / max(kovalar[i], 1)
+    return float(alt * (ust / alt) ** oran)
+
+
+class LinkMonitor:
+    """Araçların ölçümlerinden pencere bazlı durum, Prometheus metni ve JSON.
+
+    `olcumler` araç adından LinkMetrics'e; `guncelle` GUI thread'inden
+    periyodik çağrılır.
+    """
+
+    def __init__(self, olcumler, pencere_s=PENCERE_S):
+        self.olcumler = dict(olcumler)
+        self.pencere_s = pencere_s
+        self._gecmis = {ad: collections.deque() for ad in self.olcumler}
+        self.durumlar = {}      # ad -> son hesaplanan durum
+        self.prometheus = ""    # son Prometheus metni (thread'ler arası tek atama)
+
+    def guncelle(self, simdi=None):
+        simdi = time.monotonic() if simdi is None else simdi
+        goruntuler = {}
+        for ad, olcum in self.olcumler.items():
+            goruntu = olcum.goruntu()
+            goruntuler[ad] = goruntu
+            gecmis = self._gecmis[ad]
+            gecmis.append((simdi, goruntu))
+            while len(gecmis) > 2 and simdi - gecmis[1][0] >= self.pencere_s:
+                gecmis.popleft()
+            self.durumlar[ad] = self._durum(gecmis[0], (simdi, goruntu))
+        self.prometheus = self._prometheus(goruntuler)
+        return self.durumlar
+
+    def _durum(self, eski, yeni):
+        (t0, g0), (t1, g1) = eski, yeni
+        sure = max(t1 - t0, 1e-9)
+        kovalar = g1["rtt_kovalari"] - g0["rtt_kovalari"]
+        durum = {
+            "rtt_p50_ms": yuzdelik(kovalar, 50),
+            "rtt_p95_ms": yuzdelik(kovalar, 95),
+            "rtt_p99_ms": yuzdelik(kovalar, 99),
+            "rtt_ornek": int(kovalar.sum()),
+            "gelen_bps": (g1["gelen_bayt"] - g0["gelen_bayt"]) / sure,
+            "giden_bps": (g1["giden_bayt"] - g0["giden_bayt"]) / sure,
+            "gelen_hz": (g1["gelen_mesaj"] - g0["gelen_mesaj"]) / sure,
+            "giden_hz": (g1["giden_mesaj"] - g0["giden_mesaj"]) / sure,
+            "pencere_zaman_asimi": g1["zaman_asimi"] - g0["zaman_asimi"],
+            "yeniden_baglanma": g1["yeniden_baglanma"],
+            "cozme_hatasi": g1["cozme_hatasi"],
+            "zaman_asimi": g1["zaman_asimi"],
+            "kuyruklar": g1["kuyruklar"],
+        }
+        p95 = durum["rtt_p95_ms"]
+        if durum["rtt_ornek"] == 0:
+            # Yüzdelikler NaN; NaN karşılaştırması hep False olduğundan "iyi" görünmesin.
+            # Yanıtsız kalan istek varsa bağlantı kötü, yoksa (sessiz/kopuk) bilinmiyor
+            durum["kalite"] = KALITE_KOTU if durum["pencere_zaman_asimi"] else KALITE_BILINMIYOR
+        elif p95 > KOTU_RTT_MS:
+            durum["kalite"] = KALITE_KOTU
+        elif p95 > ZAYIF_RTT_MS or durum["pencere_zaman_asimi"]:
+            durum["kalite"] = KALITE_ZAYIF
+        else:
+            durum["kalite"] = KALITE_IYI
+        return durum
+
+    def _prometheus(self, goruntuler):
+        satirlar = [
+            "# HELP dolpa_rtt_seconds İstek-yanıt gidiş-dönüş süresi",
+            "# TYPE dolpa_rtt_seconds histogram",
+        ]
+        sinirlar = [f"{s / 1000:.6g}" for s in KOVALAR_MS] + ["+Inf"]
+        for ad, g in goruntuler.items():
+            etiket = _etiket(ad)
+            birikimli = np.cumsum(g["rtt_kovalari"])
+            for sinir, adet in zip(sinirlar, birikimli.tolist()):
+                satirlar.append(f'dolpa_rtt_seconds_bucket{{arac="{etiket}",le="{sinir}"}} {adet}')
+            satirlar.append(f'dolpa_rtt_seconds_sum{{arac="{etiket}"}} {g["rtt_toplam_ms"] / 1000:.6f}')
+            satirlar.append(f'dolpa_rtt_seconds_count{{arac="{etiket}"}} {int(birikimli[-1])}')
+        for alan, metrik, aciklama in SAYACLAR:
+            satirlar.append(f"# HELP dolpa_{metrik} {aciklama}")
+            satirlar.append(f"# TYPE dolpa_{metrik} counter")
+            for ad, g in goruntuler.items():
+                satirlar.append(f'dolpa_{metrik}{{arac="{_etiket(ad)}"}} {g[alan]}')
+        for alan, metrik, aciklama in KUYRUKLAR:
+            satirlar.append(f"# HELP dolpa_{metrik} {aciklama}")
+            satirlar.append(f"# TYPE dolpa_{metrik} gauge")
+            for ad, g in goruntuler.items():
+                satirlar.append(f'dolpa_{metrik}{{arac="{_etiket(ad)}"}} {g["kuyruklar"][alan]}')
+        return "\n".join(satirlar) + "\n"
+
+    def json_yaz(self, yol):
+        """Son durumları JSON dosyasına yaz (önce geçici dosyaya, sonra yerine)."""
+        veri = {
+            "zaman": time.time(),
+            "pencere_s": self.pencere_s,
+            "araclar": {ad: {k: (None if isinstance(v, float) and math.isnan(v) else v)
+                             for k, v in durum.items()}
+                        for ad, durum in self.durumlar.items()},
+        }
+        klasor = os.path.dirname(yol)
+        if klasor:
+            os.makedirs(klasor, exist_ok=True)
+        gecici = yol + ".tmp"
+        with open(gecici, "w", encoding="utf-8") as f:
+            json.dump(veri, f, ensure_ascii=False, indent=2)
+        os.replace(gecici, yol)
+
+
+def _etiket(ad):
+    # Prometheus etiket değerinde kaçış
+    return ad.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class MetricsServer:
+    """LinkMonitor'ın Prometheus metnini yerel bir HTTP ucunda (/metrics) sunar."""
+
+    def __init__(self, izleyici, host="127.0.0.1", port=9108):
+        class _Isleyici(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/", "/metrics"):
+                    self.send_error(404)
+                    return
+                govde = izleyici.prometheus.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(govde)))
+                self.end_headers()
+                self.wfile.write(govde)
+
+            def log_message(self, *args):
+                pass
+
+        self._sunucu = http.server.ThreadingHTTPServer((host, port), _Isleyici)
+        self._sunucu.daemon_threads = True
+        self.host, self.port = self._sunucu.server_address[:2]
+        self._thread = None
+
+    def baslat(self):
+        self._thread = threading.Thread(
+            target=self._sunucu.serve_forever, name="MetricsServer", daemon=True)
+        self._thread.start()
+        return self
+
+    def durdur(self):
+        if self._thread is not None:
+            self._sunucu.shutdown()
+            self._sunucu.server_close()
+            self._thread.join()
+            self._thread = None
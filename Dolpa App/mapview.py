@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+DOLPA Underwater Technologies
+Harita Görünümü
+
+Harita sayfası, Leaflet ve karolar internetten değil `dolpa://` adresinden
+yüklenir:
+
+    dolpa://harita/map.html           uygulama klasöründeki sayfa
+    dolpa://leaflet/<dosya>           harita/leaflet/ altındaki Leaflet kopyası
+    dolpa://karo/<z>/<x>/<y>.png      tiles.TileCache
+    dolpa://qt/qwebchannel.js         Qt'nin kaynaklarındaki QWebChannel istemcisi
+
+Bellekteki karolar hemen yanıtlanır; depo okuması ve indirme GUI thread'ini
+bekletmemek için thread havuzunda yapılır.
+
+Python ile sayfa arasındaki trafik QWebChannel üzerinden MapBridge ile
+akar. Konumlar tek tek JavaScript metni olarak değil, paketler hâlinde
+(base64 kodlu float64 dizisi) gönderilir; sayfa tek bir kalıcı iz çizgisini
+uzatır, rota ve işaretleri her seferinde yenisiyle değiştirir. İz sayfaya
+sadeleştirilmiş olarak gider (bkz. track.Track).
+"""
+
+from PyQt5 import QtCore
+from PyQt5.QtWebChannel import QWebChannel
+from PyQt5.QtWebEngineCore import QWebEngineUrlRequestJob, QWebEngineUrlScheme, QWebEngineUrlSchemeHandler
+import base64
+import concurrent.futures
+import mimetypes
+import os
+
+import numpy as np
+
+import track
+
+SEMA = b"dolpa"
+SAYFA_ADRESI = "dolpa://harita/map.html"
+
+
+def sema_kaydet():
+    """`dolpa` şemasını kaydet; QApplication oluşturulmadan önce çağrılmalı."""
+    sema = QWebEngineUrlScheme(SEMA)
+    sema.setSyntax(QWebEngineUrlScheme.Syntax.Host)
+    sema.setFlags(QWebEngineUrlScheme.SecureScheme | QWebEngineUrlScheme.LocalAccessAllowed
+                  | QWebEngineUrlScheme.CorsEnabled)
+    QWebEngineUrlScheme.registerScheme(sema)
+
+
+def _sonuc(gelecek):
+    # İptal edilen ya da hata veren iş "bulunamadı" olarak yanıtlanır
+    if gelecek.cancelled() or gelecek.exception() is not None:
+        return None
+    return gelecek.result()
+
+
+def kur(gorunum, isleyici, kopru=None):
+    """İşleyiciyi görünümün profiline, köprüyü sayfanın kanalına kur."""
+    sayfa = gorunum.page()
+    profil = sayfa.profile()
+    if profil.urlSchemeHandler(SEMA) is not None:
+        profil.removeUrlScheme(SEMA)
+    profil.installUrlSchemeHandler(SEMA, isleyici)
+    if kopru is not None:
+        kanal = QWebChannel(sayfa)
+        kanal.registerObject("kopru", kopru)
+        sayfa.setWebChannel(kanal)
+
+
+def paketle(enlemler, boylamlar):
+    """Konumları sayfaya gidecek tek metne çevir: [e0, b0, e1, b1, ...] float64."""
+    noktalar = np.empty(2 * len(enlemler), dtype="<f8")
+    noktalar[0::2] = enlemler
+    noktalar[1::2] = boylamlar
+    return base64.b64encode(noktalar.tobytes()).decode("ascii")
+
+
+class DolpaSchemeHandler(QWebEngineUrlSchemeHandler):
+    """`dolpa://` isteklerini yerel dosyalardan ve karo önbelleğinden yanıtlar."""
+
+    _karo_hazir = QtCore.pyqtSignal(int, object)  # iş numarası, bayt ya da None
+
+    def __init__(self, kok, onbellek, parent=None, paralel=4):
+        super().__init__(parent)
+        self.kok = kok
+        self.onbellek = onbellek
+        self._havuz = concurrent.futures.ThreadPoolExecutor(max_workers=paralel,
+                                                            thread_name_prefix="karo")
+        self._isler = {}
+        self._sira = 0
+        self._dosyalar = {}  # yol -> (mime, bayt); sayfa ve Leaflet küçük, bir kez okunur
+        self._karo_hazir.connect(self._karoyu_yanitla)
+
+    def requestStarted(self, istek):
+        url = istek.requestUrl()
+        host = url.host()
+        yol = url.path().lstrip("/")
+        if host == "karo":
+            self._karo_istegi(istek, yol)
+        elif host in ("harita", "leaflet"):
+            klasor = self.kok if host == "harita" else os.path.join(self.kok, "harita", "leaflet")
+            self._dosya_istegi(istek, klasor, yol)
+        elif host == "qt" and yol == "qwebchannel.js":
+            self._kaynak_istegi(istek, ":/qtwebchannel/qwebchannel.js", b"application/javascript")
+        else:
+            istek.fail(QWebEngineUrlRequestJob.UrlNotFound)
+
+    def _yanitla(self, istek, mime, veri):
+        tampon = QtCore.QBuffer(parent=istek)
+        tampon.setData(veri)
+        tampon.open(QtCore.QIODevice.ReadOnly)
+        istek.reply(mime, tampon)
+
+    def _dosya_istegi(self, istek, klasor, yol):
+        tam_yol = os.path.normpath(os.path.join(klasor, yol))
+        if not tam_yol.startswith(os.path.normpath(klasor) + os.sep):
+            istek.fail(QWebEngineUrlRequestJob.RequestDenied)
+            return
+        kayit = self._dosyalar.get(tam_yol)
+        if kayit is None:
+            try:
+                with open(tam_yol, "rb") as f:
+                    veri = f.read()
+            except OSError:
+                istek.fail(QWebEngineUrlRequestJob.UrlNotFound)
+                return
+            mime = (mimetypes.guess_type(tam_yol)[0] or "application/octet-stream").encode()
+            kayit = self._dosyalar[tam_yol] = (mime, veri)
+        self._yanitla(istek, *kayit)
+
+    def _kaynak_istegi(self, istek, yol, mime):
+        kayit = self._dosyalar.get(yol)
+        if kayit is None:
+            dosya = QtCore.QFile(yol)
+            if not dosya.open(QtCore.QIODevice.ReadOnly):
+                istek.fail(QWebEngineUrlRequestJob.UrlNotFound)
+                return
+            kayit = self._dosyalar[yol] = (mime, bytes(dosya.readAll()))
+            dosya.close()
+        self._yanitla(istek, *kayit)
+
+    def _karo_istegi(self, istek, yol):
+        try:
+            z, x, y = (int(p) for p in yol.rsplit(".", 1)[0].split("/"))
+        except ValueError:
+            istek.fail(QWebEngineUrlRequestJob.UrlInvalid)
+            return
+        veri = self.onbellek.bellekte(z, x, y)
+        if veri is not None:
+            self._yanitla(istek, b"image/png", veri)
+            return
+
+        # İş, yanıt gelmeden sayfa tarafından iptal edilip silinebilir
+        self._sira += 1
+        sira = self._sira
+        self._isler[sira] = istek
+        istek.destroyed.connect(lambda *_: self._isler.pop(sira, None))
+        gelecek = self._havuz.submit(self.onbellek.karo, z, x, y)
+        gelecek.add_done_callback(lambda g: self._karo_hazir.emit(sira, _sonuc(g)))
+
+    def _karoyu_yanitla(self, sira, veri):
+        istek = self._isler.pop(sira, None)
+        if istek is None:
+            return
+        try:
+            if veri is None:
+                istek.fail(QWebEngineUrlRequestJob.UrlNotFound)
+            else:
+                self._yanitla(istek, b"image/png", veri)
+        except RuntimeError:
+            # Qt nesnesi bu arada silinmiş
+            pass
+
+    def kapat(self):
+        self._havuz.shutdown(wait=False, cancel_futures=True)
+
+
+class MapBridge(QtCore.QObject):
+    """Sayfaya QWebChannel ile bağlanan harita köprüsü.
+
+    `iz_ekle` ile gelen konumlar track.Track ile sadeleştirilir; `gonder`
+    çağıran zamanlayıcının hızında yalnızca yeni köşeleri ve güncel başı tek
+    paket olarak yollar. Her paketin son noktası baştır ve sayfada bir
+    sonraki paketle değiştirilir. Sayfa hazır olmadan (ya da yeniden
+    yüklendiğinde) gelen veriler kaybolmaz: sayfa `hazir` dediğinde iz, rota
+    ve işaretler baştan gönderilir.
+    """
+
+    # Python -> sayfa
+    iz_eklendi = QtCore.pyqtSignal(str)               # paketle() çıktısı
+    iz_temizlendi = QtCore.pyqtSignal()
+    rota_degisti = QtCore.pyqtSignal(str)             # paketle() çıktısı, boşsa rota silinir
+    isaret_degisti = QtCore.pyqtSignal(str, float, float, str)  # ad, enlem, boylam, etiket
+    isaret_silindi = QtCore.pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.sayfa_hazir = False
+        self.iz = track.Track()
+        self._yeni = False       # son gönderimden beri iz değişti mi
+        self._rota = None
+        self._isaretler = {}     # ad -> (enlem, boylam, etiket)
+        self.paket = 0           # gönderilen iz paketi
+        self.nokta = 0           # gönderilen iz noktası
+
+    @QtCore.pyqtSlot()
+    def hazir(self):
+        """Sayfa kanala bağlandığında sayfadan çağrılır."""
+        self.sayfa_hazir = True
+        self._izi_yeniden_gonder()
+        if self._rota is not None:
+            self.rota_degisti.emit(self._rota)
+        for ad, (enlem, boylam, etiket) in self._isaretler.items():
+            self.isaret_degisti.emit(ad, enlem, boylam, etiket)
+
+    @QtCore.pyqtSlot(int)
+    def zoom_degisti(self, zoom):
+        """Harita yakınlığı değişince sayfadan çağrılır."""
+        if self.iz.zoom_ayarla(zoom) and self.sayfa_hazir:
+            self._izi_yeniden_gonder()
+
+    def _izi_yeniden_gonder(self):
+        self.iz_temizlendi.emit()
+        self._gonder(self.iz.tamami())
+
+    def iz_ekle(self, enlemler, boylamlar):
+        """Ize nokta ekle; sayfaya bir sonraki `gonder` ile gider."""
+        if len(enlemler):
+            self.iz.ekle(enlemler, boylamlar)
+            self._yeni = True
+
+    def bekleyen_var(self):
+        return self._yeni
+
+    def gonder(self):
+        """Son gönderimden beri değişen izi tek paket olarak gönder; gönderilen nokta sayısı."""
+        if not self._yeni or not self.sayfa_hazir:
+            return 0
+        return self._gonder(self.iz.delta())
+
+    def _gonder(self, noktalar):
+        self._yeni = False
+        if noktalar is None:
+            return 0
+        enlemler, boylamlar = noktalar
+        self.iz_eklendi.emit(paketle(enlemler, boylamlar))
+        self.paket += 1
+        self.nokta += len(enlemler)
+        return len(enlemler)
+
+    def iz_temizle(self):
+        self.iz.temizle()
+        self._yeni = False
+        if self.sayfa_hazir:
+            self.iz_temizlendi.emit()
+
+    def rota_ciz(self, noktalar):
+        """Rotayı [(enlem, boylam), ...] ile değiştir; boş liste rotayı siler."""
+        noktalar = np.asarray(noktalar, dtype=np.float64).reshape(-1, 2)
+        self._rota = paketle(noktalar[:, 0], noktalar[:, 1])
+        if self.sayfa_hazir:
+            self.rota_degisti.emit(self._rota)
+
+    def isaret_koy(self, ad, enlem, boylam, etiket=""):
+        """`ad` adlı işareti koy ya da yerini değiştir."""
+        self._isaretler[ad] = (float(enlem), float(boylam), etiket)
+        if self.sayfa_hazir:
+            self.isaret_degisti.emit(ad, float(enlem), float(boylam), etiket)
+
+    def isaret_kaldir(self, ad):
+        if self._isaretler.pop(ad, None) is not None and self.sayfa_hazir:
+            self.isaret_silindi.emit(ad)
+
+    def istatistik(self):
+        return {
+            "gelen": self.iz.ince.gelen,
+            "ince": len(self.iz.ince),
+            "goruntu": len(self.iz.goruntu) if self.iz.goruntu is not None else 0,
+            "gonderilen": self.nokta,
+        }
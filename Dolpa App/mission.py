@@ -0,0 +1,224 @@
+# -*- coding: utf-8 -*-
+"""
+DOLPA Underwater Technologies
+Görev Planlama
+
+Bir dalış görevi sıralı yol noktalarından oluşur. Her noktanın derinliği
+ve o noktaya giden bacağın hızı vardır. Noktalar NumPy dizilerinde tutulur;
+uzunluk ve süre tahmini geodesy ile tek seferde hesaplanır.
+
+Tarama desenleri bir poligon (enlem, boylam köşeleri) üzerinde, yerel ENU
+düzleminde vektörleştirilmiş olarak üretilir; binlerce bacaklı bir desen
+milisaniyeler içinde hazırlanır:
+
+    serit_tarama   çim biçme (lawnmower) deseni, şeritler `aci` yönünde
+    spiral_tarama  merkezden dışa Arşimet spirali (poligon içindeki en
+                   büyük daireyi kaplar)
+
+Araca gönderimde noktalar kompakt ikili kayıtlar olarak (bkz. NOKTA)
+base64 ile JSON mesajına gömülür.
+"""
+
+import base64
+import math
+
+import numpy as np
+
+import geodesy
+
+# Yol noktası kaydı (big-endian): enlem, boylam (1e-7 derece), derinlik (cm), hız (cm/s)
+NOKTA = np.dtype([("enlem", ">i4"), ("boylam", ">i4"), ("derinlik", ">u2"), ("hiz", ">u2")])
+BICIM = 1
+
+VARSAYILAN_DERINLIK = 5.0  # metre
+VARSAYILAN_HIZ = 1.0       # m/s
+SPIRAL_ADIMI = 36          # spiralin dış kısmında tur başına nokta
+
+
+class Mission:
+    """Yol noktaları, nokta başına derinlik ve bacak hızı.
+
+    `hizlar[i]`, (i-1). noktadan i. noktaya giden bacağın hızıdır; ilk
+    noktanınki kullanılmaz.
+    """
+
+    def __init__(self, enlemler, boylamlar, derinlik=VARSAYILAN_DERINLIK, hiz=VARSAYILAN_HIZ):
+        self.enlemler = np.asarray(enlemler, dtype=np.float64).ravel()
+        self.boylamlar = np.asarray(boylamlar, dtype=np.float64).ravel()
+        if len(self.enlemler) != len(self.boylamlar):
+            raise ValueError("enlem ve boylam sayıları farklı")
+        if len(self.enlemler) < 2:
+            raise ValueError("görev en az iki nokta içermeli")
+        n = len(self.enlemler)
+        self.derinlikler = np.broadcast_to(np.asarray(derinlik, dtype=np.float64), (n,)).copy()
+        self.hizlar = np.broadcast_to(np.asarray(hiz, dtype=np.float64), (n,)).copy()
+        if np.any(self.hizlar[1:] <= 0):
+            raise ValueError("bacak hızları pozitif olmalı")
+
+    def __len__(self):
+        return len(self.enlemler)
+
+    @property
+    def bacak_sayisi(self):
+        return len(self.enlemler) - 1
+
+    def bacak_uzunluklari(self):
+        """Her bacağın derinlik farkı dahil uzunluğu (metre)."""
+        yatay = geodesy.mesafe(self.enlemler[:-1], self.boylamlar[:-1],
+                               self.enlemler[1:], self.boylamlar[1:])
+        return np.hypot(yatay, np.diff(self.derinlikler))
+
+    def uzunluk(self):
+        return float(np.sum(self.bacak_uzunluklari()))
+
+    def sure(self):
+        """Tahmini süre (saniye); dönüşler ve dalış/çıkış hariç."""
+        return float(np.sum(self.bacak_uzunluklari() / self.hizlar[1:]))
+
+    def paketle(self):
+        """Noktaları kompakt ikili kayıtlara çevir (nokta başına NOKTA.itemsize bayt)."""
+        kayitlar = np.empty(len(self), dtype=NOKTA)
+        kayitlar["enlem"] = np.round(self.enlemler * 1e7)
+        kayitlar["boylam"] = np.round(self.boylamlar * 1e7)
+        kayitlar["derinlik"] = np.clip(np.round(self.derinlikler * 100), 0, 65535)
+        kayitlar["hiz"] = np.clip(np.round(self.hizlar * 100), 0, 65535)
+        return kayitlar.tobytes()
+
+    @classmethod
+    def coz(cls, veri):
+        """`paketle` çıktısından görev oluştur."""
+        kayitlar = np.frombuffer(veri, dtype=NOKTA)
+        return cls(kayitlar["enlem"] / 1e7, kayitlar["boylam"] / 1e7,
+                   kayitlar["derinlik"] / 100.0, kayitlar["hiz"] / 100.0)
+
+    def mesaj(self):
+        """Araca gönderilecek görev mesajı.
+
+        Eski araç yazılımları için ilk ve son nokta `baslangic`/`bitis`
+        olarak da yazılır.
+        """
+        return {
+            "gorev": "dalis",
+            "baslangic": [float(self.enlemler[0]), float(self.boylamlar[0])],
+            "bitis": [float(self.enlemler[-1]), float(self.boylamlar[-1])],
+            "bicim": BICIM,
+            "nokta_sayisi": len(self),
+            "noktalar": base64.b64encode(self.paketle()).decode("ascii"),
+        }
+
+
+def _yerel_poligon(poligon):
+    # Poligon köşelerini merkezlerine göre ENU düzlemine taşı
+    kose = np.asarray(poligon, dtype=np.float64).reshape(-1, 2)
+    if len(kose) >= 2 and np.array_equal(kose[0], kose[-1]):
+        kose = kose[:-1]
+    if len(kose) < 3:
+        raise ValueError("poligon en az üç köşe içermeli")
+    enlem0, boylam0 = float(kose[:, 0].mean()), float(kose[:, 1].mean())
+    x, y, _ = geodesy.enu(kose[:, 0], kose[:, 1], enlem0, boylam0)
+    return np.asarray(x), np.asarray(y), enlem0, boylam0
+
+
+def _cografi(x, y, enlem0, boylam0):
+    enlemler, boylamlar, _ = geodesy.enu_ters(x, y, enlem0, boylam0)
+    return enlemler, boylamlar
+
+
+def serit_tarama(poligon, aralik, aci=None, derinlik=VARSAYILAN_DERINLIK, hiz=VARSAYILAN_HIZ):
+    """Poligonu `aralik` metre arayla şerit şerit tarayan görev.
+
+    `aci` şeritlerin yönüdür (derece, kuzeyden saat yönünde); verilmezse en
+    uzun kenarın yönü seçilir, böylece dönüş sayısı azalır. İçbükey
+    poligonlarda aynı şeritteki parçalar arasındaki geçiş poligon dışından
+    olabilir.
+    """
+    if aralik <= 0:
+        raise ValueError("tarama aralığı pozitif olmalı")
+    x, y, enlem0, boylam0 = _yerel_poligon(poligon)
+    x2, y2 = np.roll(x, -1), np.roll(y, -1)
+    if aci is None:
+        en_uzun = int(np.argmax(np.hypot(x2 - x, y2 - y)))
+        egim = math.atan2(y2[en_uzun] - y[en_uzun], x2[en_uzun] - x[en_uzun])
+    else:
+        egim = math.pi / 2 - math.radians(aci)  # pusula açısı -> x ekseninden açı
+
+    # Şeritler yatay olacak şekilde döndür
+    c, s = math.cos(-egim), math.sin(-egim)
+    rx, ry = c * x - s * y, s * x + c * y
+    rx2, ry2 = np.roll(rx, -1), np.roll(ry, -1)
+    seviyeler = np.arange(ry.min() + aralik / 2, ry.max(), aralik)
+    if not len(seviyeler):
+        seviyeler = np.array([(ry.min() + ry.max()) / 2])
+
+    # Her şerit (satır) ile her kenarın (sütun) kesişimi
+    sy = seviyeler[:, None]
+    kesisir = (ry <= sy) != (ry2 <= sy)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kx = rx + (sy - ry) * (rx2 - rx) / (ry2 - ry)
+    kx = np.sort(np.where(kesisir, kx, np.nan), axis=1)
+    if kx.shape[1] % 2:
+        kx = np.concatenate([kx, np.full((len(kx), 1), np.nan)], axis=1)
+    baslar, sonlar = kx[:, 0::2], kx[:, 1::2]
+
+    # Tek numaralı şeritler ters yönde gezilir (NaN'lar maske ile atılır)
+    tek = np.arange(len(seviyeler)) % 2 == 1
+    baslar[tek], sonlar[tek] = sonlar[tek, ::-1], baslar[tek, ::-1]
+    gecerli = ~(np.isnan(baslar) | np.isnan(sonlar))
+    satir = np.broadcast_to(seviyeler[:, None], baslar.shape)[gecerli]
+    px = np.column_stack([baslar[gecerli], sonlar[gecerli]]).ravel()
+    py = np.repeat(satir, 2)
+    if not len(px):
+        raise ValueError("poligon tarama aralığından dar")
+
+    # Geri döndür ve coğrafi koordinata çevir
+    c, s = math.cos(egim), math.sin(egim)
+    enlemler, boylamlar = _cografi(c * px - s * py, s * px + c * py, enlem0, boylam0)
+    return Mission(enlemler, boylamlar, derinlik, hiz)
+
+
+def _icinde(px, py, x, y):
+    # Işın atma ile nokta-poligon testi
+    x2, y2 = np.roll(x, -1), np.roll(y, -1)
+    kesisir = (y > py) != (y2 > py)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        kx = x + (py - y) * (x2 - x) / (y2 - y)
+    return bool(np.count_nonzero(kesisir & (px < kx)) % 2)
+
+
+def _parca_mesafesi(px, py, ax, ay, bx, by):
+    # Noktanın [a, b] parçalarına düzlemde uzaklığı (dizi parçalar)
+    dx, dy = bx - ax, by - ay
+    uzunluk2 = dx * dx + dy * dy
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t = np.where(uzunluk2 > 0, ((px - ax) * dx + (py - ay) * dy) / uzunluk2, 0.0)
+    t = np.clip(t, 0.0, 1.0)
+    return np.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+
+def spiral_tarama(poligon, aralik, derinlik=VARSAYILAN_DERINLIK, hiz=VARSAYILAN_HIZ):
+    """Poligon merkezinden dışa, kollar arası `aralik` metre olan spiral görev.
+
+    Spiral, merkez etrafında poligonun içinde kalan en büyük daireyle
+    sınırlıdır; merkez poligon dışındaysa ValueError.
+    """
+    if aralik <= 0:
+        raise ValueError("tarama aralığı pozitif olmalı")
+    x, y, enlem0, boylam0 = _yerel_poligon(poligon)
+    if not _icinde(0.0, 0.0, x, y):
+        raise ValueError("poligon merkezi poligonun dışında; spiral çizilemez")
+    yaricap = float(np.min(_parca_mesafesi(0.0, 0.0, x, y, np.roll(x, -1), np.roll(y, -1))))
+    if yaricap < aralik / 2:
+        raise ValueError("poligon tarama aralığından dar")
+
+    # r = b * teta. Merkeze yakın noktalar yay boyunca aralik/2 arayla
+    # (yay ~ b * teta^2 / 2), dışarıda tur başına SPIRAL_ADIMI nokta.
+    b = aralik / (2 * math.pi)
+    teta_son = yaricap / b
+    adim = 2 * math.pi / SPIRAL_ADIMI
+    teta_gecis = min(aralik / 2 / (b * adim), teta_son)
+    ic = np.sqrt(2 * np.arange(0.0, b * teta_gecis ** 2 / 2, aralik / 2) / b)
+    teta = np.concatenate([ic, np.arange(teta_gecis, teta_son, adim), [teta_son]])
+    r = b * teta
+    enlemler, boylamlar = _cografi(r * np.cos(teta), r * np.sin(teta), enlem0, boylam0)
+    return Mission(enlemler, boylamlar, derinlik, hiz)
+
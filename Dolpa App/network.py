@@ -0,0 +1,433 @@
+# -*- coding: utf-8 -*-
+"""
+DOLPA Underwater Technologies
+Araç Ağ İşçisi - tüm soket işlemleri GUI thread'i dışında yapılır
+"""
+
+from PyQt5 import QtCore, QtNetwork
+import itertools
+import time
+import commands
+import linkmetrics
+import protocol
+import recorder
+import telemetry
+
+# Yeniden bağlanma bekleme süreleri (saniye)
+BACKOFF_BASLANGIC = 0.5
+BACKOFF_UST_SINIR = 30.0
+
+# Bu süre içinde telemetri geldiyse şarj ayrıca sorgulanmaz (saniye)
+TELEMETRI_TAZELIK = 2.0
+
+# Bağlantı ölçümü için gidiş-dönüş yoklaması aralığı (ms); arada başka bir
+# istek RTT ölçtüyse yoklama gönderilmez
+OLCUM_ARALIGI = 5000
+
+# Bir okumada işlenen en fazla bayt; kalanı olay döngüsünde sıraya girer ki
+# aynı thread'deki diğer oturumlar bekletilmesin
+OKUMA_BUTCESI = 256 * 1024
+
+
+class VehicleSession(QtCore.QObject):
+    """Araçla tek ve kalıcı TCP oturumu.
+
+    İstekler `istek_id` alanıyla etiketlenir, yanıtlar aynı kimlikle eşleştirilip
+    geri çağrıya iletilir. Kimliği olmayan mesajlar `mesaj_alindi` ile yayınlanır.
+    Bağlantı koparsa üstel geri çekilmeyle yeniden bağlanılır. Kaydedici
+    verilirse gelen ve giden tüm çerçeve yükleri ona da aktarılır. Trafik,
+    hata ve istek-yanıt süreleri `olcum`da (linkmetrics.LinkMetrics) sayılır. Sahibi olan
+    thread'de (NetworkWorker) oluşturulmalı ve kullanılmalıdır.
+    """
+
+    baglanti_degisti = QtCore.pyqtSignal(bool)
+    mesaj_alindi = QtCore.pyqtSignal(object)
+
+    def __init__(self, ip, port, parent=None, kaydedici=None):
+        super().__init__(parent)
+        self.ip = ip
+        self.port = port
+        self.kaydedici = kaydedici
+        self._soket = None
+        self._bagli = False
+        self._kapaniyor = False
+        self._cozucu = protocol.FrameDecoder(
+            yuk_dinleyici=self._gelen_kaydet if kaydedici else None)
+        self._istek_sayaci = itertools.count(1)
+        self._bekleyenler = {}  # istek_id -> (geri_cagir, son_zaman, gonderim_zamani)
+        self.olcum = linkmetrics.LinkMetrics()
+        self._backoff = BACKOFF_BASLANGIC
+        self._yeniden_baglan_timer = None
+        self._zaman_asimi_timer = None
+
+    @QtCore.pyqtSlot()
+    def baslat(self):
+        self._soket = QtNetwork.QTcpSocket(self)
+        self._soket.setSocketOption(QtNetwork.QAbstractSocket.LowDelayOption, 1)
+        self._soket.setSocketOption(QtNetwork.QAbstractSocket.KeepAliveOption, 1)
+        self._soket.connected.connect(self._baglandi)
+        self._soket.disconnected.connect(self._koptu)
+        self._soket.errorOccurred.connect(self._soket_hatasi)
+        self._soket.readyRead.connect(self._okunabilir)
+
+        self._yeniden_baglan_timer = QtCore.QTimer(self)
+        self._yeniden_baglan_timer.setSingleShot(True)
+        self._yeniden_baglan_timer.timeout.connect(self._baglan)
+
+        self._zaman_asimi_timer = QtCore.QTimer(self)
+        self._zaman_asimi_timer.setInterval(100)
+        self._zaman_asimi_timer.timeout.connect(self._zaman_asimlarini_kontrol_et)
+
+        self._baglan()
+
+    @QtCore.pyqtSlot()
+    def kapat(self):
+        self._kapaniyor = True
+        if self._yeniden_baglan_timer is not None:
+            self._yeniden_baglan_timer.stop()
+            self._zaman_asimi_timer.stop()
+        if self._soket is not None:
+            self._soket.abort()
+        self._bekleyenleri_iptal_et("oturum kapatıldı")
+
+    def bagli_mi(self):
+        return self._bagli
+
+    def gonder(self, veri):
+        """Yanıt beklemeden mesaj gönder."""
+        if not self._bagli:
+            raise ConnectionError("araç bağlı değil")
+        self._yaz(veri)
+
+    def istek(self, veri, geri_cagir, zaman_asimi=2.0):
+        """Yanıt bekleyen istek gönder; geri_cagir(yanit, hata) bir kez çağrılır."""
+        if not self._bagli:
+            geri_cagir(None, "araç bağlı değil")
+            return None
+        istek_id = next(self._istek_sayaci)
+        simdi = time.monotonic()
+        self._bekleyenler[istek_id] = (geri_cagir, simdi + zaman_asimi, simdi)
+        if not self._zaman_asimi_timer.isActive():
+            self._zaman_asimi_timer.start()
+        self._yaz(dict(veri, istek_id=istek_id))
+        return istek_id
+
+    def _yaz(self, veri):
+        cerceve = protocol.encode_message(veri)
+        self._soket.write(cerceve)
+        self.olcum.giden_bayt += len(cerceve)
+        self.olcum.giden_mesaj += 1
+        if self.kaydedici is not None:
+            self.kaydedici.kaydet(recorder.GIDEN, cerceve[protocol.BASLIK_BOYUTU:])
+
+    def _gelen_kaydet(self, yuk):
+        self.kaydedici.kaydet(recorder.GELEN, yuk)
+
+    def _baglan(self):
+        if self._kapaniyor:
+            return
+        self._cozucu.reset()
+        if self._soket.state() != QtNetwork.QAbstractSocket.UnconnectedState:
+            self._soket.abort()
+        self._soket.connectToHost(self.ip, self.port)
+
+    def _yeniden_baglanmayi_planla(self):
+        if self._kapaniyor or self._yeniden_baglan_timer.isActive():
+            return
+        self._yeniden_baglan_timer.start(int(self._backoff * 1000))
+        self._backoff = min(self._backoff * 2, BACKOFF_UST_SINIR)
+
+    def _baglandi(self):
+        self._yeniden_baglan_timer.stop()
+        self._bagli = True
+        self.olcum.baglanma += 1
+        self._backoff = BACKOFF_BASLANGIC
+        self.baglanti_degisti.emit(True)
+
+    def _koptu(self):
+        self._bagli_degil()
+
+    def _soket_hatasi(self, _hata):
+        self._bagli_degil()
+
+    def _bagli_degil(self):
+        if self._bagli:
+            self._bagli = False
+            self._bekleyenleri_iptal_et("bağlantı koptu")
+            self.baglanti_degisti.emit(False)
+        self._yeniden_baglanmayi_planla()
+
+    def _okunabilir(self):
+        if self._soket.bytesAvailable() <= 0:
+            return
+        veri = bytes(self._soket.read(OKUMA_BUTCESI))
+        self.olcum.gelen_bayt += len(veri)
+        try:
+            mesajlar = self._cozucu.feed(veri)
+        except protocol.ProtocolError:
+            # Senkron kayboldu: bağlantıyı bırak, yeniden bağlanınca temiz başla
+            self.olcum.cozme_hatasi += 1
+            self._soket.abort()
+            return
+        for mesaj in mesajlar:
+            self._mesaji_isle(mesaj)
+        if self._soket.bytesAvailable() > 0:
+            QtCore.QTimer.singleShot(0, self._okunabilir)
+
+    def _mesaji_isle(self, mesaj):
+        self.olcum.gelen_mesaj += 1
+        istek_id = mesaj.get("istek_id") if isinstance(mesaj, dict) else None
+        bekleyen = self._bekleyenler.pop(istek_id, None)
+        if bekleyen is not None:
+            self.olcum.rtt_ekle((time.monotonic() - bekleyen[2]) * 1000)
+            bekleyen[0](mesaj, None)
+        else:
+            self.mesaj_alindi.emit(mesaj)
+
+    def _zaman_asimlarini_kontrol_et(self):
+        simdi = time.monotonic()
+        dolanlar = [i for i, (_, son, _) in self._bekleyenler.items() if son <= simdi]
+        for istek_id in dolanlar:
+            geri_cagir = self._bekleyenler.pop(istek_id)[0]
+            self.olcum.zaman_asimi += 1
+            geri_cagir(None, "zaman aşımı")
+        if not self._bekleyenler:
+            self._zaman_asimi_timer.stop()
+
+    def _bekleyenleri_iptal_et(self, sebep):
+        bekleyenler, self._bekleyenler = self._bekleyenler, {}
+        for geri_cagir, _, _ in bekleyenler.values():
+            geri_cagir(None, sebep)
+
+    def kuyruk_olc(self):
+        """Soket ve istek kuyruk derinliklerini ölçüme yaz (oturum thread'inde)."""
+        self.olcum.kuyruklar["istek"] = len(self._bekleyenler)
+        self.olcum.kuyruklar["soket"] = self._soket.bytesToWrite() if self._soket is not None else 0
+
+
+class NetworkWorker(QtCore.QObject):
+    """Araçla ilgili tüm soket işlemlerini kendi thread'inde yürütür.
+
+    GUI tarafı yalnızca public metodları çağırır; bunlar sinyal yayınlar ve
+    işlem queued connection ile ağ thread'inde çalışır. Sonuçlar yine
+    sinyallerle GUI thread'ine döner. Tüm trafik tek bir VehicleSession
+    üzerinden akar (oynatma modunda onun yerine ReplaySession verilir).
+
+    Komutlar öncelikli, onaylı bir kuyruktan (commands.CommandQueue) gider;
+    her durum değişikliği `komut_sonucu` ile bildirilir.
+
+    Bağlantı açıkken `olcum_araligi` ms'de bir kuyruk derinlikleri oturumun
+    ölçümüne yazılır; o aralıkta başka bir istek gidiş-dönüş süresi ölçmediyse
+    küçük bir istekle yoklanır (dar hatta gereksiz trafik olmasın diye).
+
+    Bağlantı kurulunca kodlama el sıkışması yapılır ve telemetri aboneliği
+    açılır. Araçtan gelen telemetri
+    her örnekte GUI'ye sinyal olarak gönderilmez; örnekler `telemetri` halka
+    tamponuna eklenir ve GUI kendi çizim hızında `son_telemetri` ile okur.
+    """
+
+    # Ağ thread'inden GUI'ye
+    baglanti_durumu = QtCore.pyqtSignal(bool)
+    sarj_durumu = QtCore.pyqtSignal(object)  # int yüzde veya None
+    komut_sonucu = QtCore.pyqtSignal(str, int, str, str)  # tur, sıra, durum, ayrıntı
+
+    # GUI'den ağ thread'ine (queued)
+    _kontrol_istendi = QtCore.pyqtSignal()
+    _gonderim_istendi = QtCore.pyqtSignal(str, object, int)
+
+    def __init__(self, ip, port, telemetri_hizi=10,
+                 telemetri_kapasitesi=telemetry.VARSAYILAN_KAPASITE, kaydedici=None,
+                 oturum=None, komut_penceresi=commands.PENCERE,
+                 komut_zaman_asimi=commands.ZAMAN_ASIMI, komut_deneme=commands.DENEME,
+                 olcum_araligi=OLCUM_ARALIGI):
+        super().__init__()
+        self.telemetri_hizi = telemetri_hizi
+        self.kodlama = protocol.KODLAMA_JSON
+        self.telemetri = telemetry.TelemetryBuffer(kapasite=telemetri_kapasitesi)
+        # (bağlantı sayacı, telemetri geçerli mi); ağ thread'inde tek atamayla
+        # değişir, GUI thread'i tek okumayla tutarlı bir çift görür
+        self._telemetri_durumu = (0, False)
+        self._son_telemetri_zamani = 0.0
+        self.olcum_araligi = olcum_araligi
+        self._olcum_timer = None
+        self._son_rtt_sayisi = 0
+        self._yoklama_bekliyor = False
+
+        if oturum is None:
+            oturum = VehicleSession(ip, port, kaydedici=kaydedici)
+        self.oturum = oturum
+        self.oturum.setParent(self)
+        self.oturum.baglanti_degisti.connect(self.baglanti_durumu)
+        self.oturum.baglanti_degisti.connect(self._oturum_durumu_degisti)
+        self.oturum.mesaj_alindi.connect(self._mesaj_geldi)
+        self.komutlar = commands.CommandQueue(
+            self.oturum, self._komut_durumu, komut_penceresi, komut_zaman_asimi, komut_deneme)
+        self._thread = None
+        self._kontrol_istendi.connect(self._baglanti_kontrol)
+        self._gonderim_istendi.connect(self._komut_gonder)
+
+    def baslat(self):
+        self._thread = QtCore.QThread()
+        self._thread.setObjectName("NetworkWorker")
+        self.moveToThread(self._thread)
+        self._thread.started.connect(self.oturum.baslat)
+        self._thread.start()
+
+    def durdur(self):
+        if self._thread is not None:
+            QtCore.QMetaObject.invokeMethod(
+                self.oturum, "kapat", QtCore.Qt.BlockingQueuedConnection)
+            self._thread.quit()
+            self._thread.wait()
+            self._thread = None
+
+    def baglanti_kontrol_et(self):
+        self._kontrol_istendi.emit()
+
+    def komut_gonder(self, tur, veri, oncelik=commands.NORMAL):
+        self._gonderim_istendi.emit(tur, veri, oncelik)
+
+    @property
+    def olcum(self):
+        return self.oturum.olcum
+
+    def son_telemetri(self):
+        """(sürüm, son değerler) döndür; sürüm her yeni örnekte değişir.
+
+        Bağlantı yokken son değerler boş döner, geçmiş tamponda kalır.
+        """
+        baglanti_sayaci, gecerli = self._telemetri_durumu
+        if not gecerli:
+            return baglanti_sayaci, {}
+        sayac, son = self.telemetri.son()
+        return (baglanti_sayaci, sayac), son
+
+    @QtCore.pyqtSlot(bool)
+    def _oturum_durumu_degisti(self, bagli):
+        if bagli and self.olcum_araligi:
+            if self._olcum_timer is None:
+                self._olcum_timer = QtCore.QTimer(self)
+                self._olcum_timer.timeout.connect(self._olc)
+            self._olcum_timer.start(self.olcum_araligi)
+        elif self._olcum_timer is not None:
+            self._olcum_timer.stop()
+        if bagli:
+            # Kodlama el sıkışması; yanıt vermeyen eski araçlar JSON ile devam eder
+            self.oturum.istek(
+                {"komut": "merhaba", "kodlamalar": protocol.KODLAMALAR},
+                self._el_sikisma_yaniti, zaman_asimi=1.0)
+        else:
+            self._telemetri_durumu = (self._telemetri_durumu[0] + 1, False)
+            self._son_telemetri_zamani = 0.0
+            self.komutlar.bosalt("bağlantı koptu")
+        self._kuyruklari_olc()
+
+    def _el_sikisma_yaniti(self, yanit, hata):
+        if not self.oturum.bagli_mi():
+            return
+        kodlama = protocol.KODLAMA_JSON
+        if not hata and yanit.get("kodlama") in protocol.KODLAMALAR:
+            kodlama = yanit["kodlama"]
+        self.kodlama = kodlama
+        self.oturum.gonder({
+            "komut": "telemetri_abone",
+            "hiz": self.telemetri_hizi,
+            "kodlama": kodlama,
+        })
+
+    @QtCore.pyqtSlot(object)
+    def _mesaj_geldi(self, mesaj):
+        if isinstance(mesaj, dict) and mesaj.get("tip") == "telemetri":
+            simdi = time.monotonic()
+            try:
+                self.telemetri.append(mesaj, simdi)
+            except (TypeError, ValueError):
+                # Sayı olmayan alan: örnek düşer, çözme hatası sayılır
+                self.olcum.cozme_hatasi += 1
+                return
+            self._son_telemetri_zamani = simdi
+            if not self._telemetri_durumu[1]:
+                self._telemetri_durumu = (self._telemetri_durumu[0], True)
+
+    @QtCore.pyqtSlot()
+    def _baglanti_kontrol(self):
+        bagli = self.oturum.bagli_mi()
+        self.baglanti_durumu.emit(bagli)
+        telemetri_taze = time.monotonic() - self._son_telemetri_zamani < TELEMETRI_TAZELIK
+        if bagli and not telemetri_taze:
+            self.oturum.istek({"komut": "sarj_durumu"}, self._sarj_yaniti, zaman_asimi=1.0)
+
+    def _olc(self):
+        # Şarj sorgusu araçların hepsinde var; yanıtı yalnızca süre için beklenir.
+        # Son aralıkta başka istekler RTT ölçtüyse ya da yoklama hâlâ bekliyorsa gönderilmez
+        if not self._yoklama_bekliyor and self.olcum.rtt_sayisi == self._son_rtt_sayisi:
+            self._yoklama_bekliyor = True
+            self.oturum.istek({"komut": "sarj_durumu"}, self._yoklama_yaniti, zaman_asimi=2.0)
+        self._son_rtt_sayisi = self.olcum.rtt_sayisi
+        self._kuyruklari_olc()
+
+    def _yoklama_yaniti(self, yanit, hata):
+        self._yoklama_bekliyor = False
+        # Yoklamanın kendi ölçümü bir sonraki yoklamayı engellemesin
+        self._son_rtt_sayisi = self.olcum.rtt_sayisi
+
+    def _kuyruklari_olc(self):
+        self.olcum.kuyruklar["komut"] = len(self.komutlar)
+        self.olcum.kuyruklar["onay"] = self.komutlar.ucusta
+        self.oturum.kuyruk_olc()
+
+    def _sarj_yaniti(self, yanit, hata):
+        self.sarj_durumu.emit(None if hata else yanit.get("sarj"))
+
+    @QtCore.pyqtSlot(str, object, int)
+    def _komut_gonder(self, tur, veri, oncelik):
+        self.komutlar.ekle(tur, veri, oncelik)
+
+    def _komut_durumu(self, komut, durum, ayrinti):
+        self.komut_sonucu.emit(komut.tur, komut.sira, durum, ayrinti)
+
+
+class FleetManager(QtCore.QObject):
+    """Birden çok aracın oturumlarını tek bir ağ thread'inde yürütür.
+
+    Her araç için ayrı bir NetworkWorker (ve telemetri tamponu) vardır; hepsi
+    aynı thread'e taşınır ve soketleri o thread'in olay döngüsünde (poll/epoll
+    üzerinde) birlikte beklenir. Bir oturum okumada en fazla OKUMA_BUTCESI
+    işler, böylece yoğun bir araç diğerlerinin mesajlarını geciktirmez.
+    İşçiler `baslat`tan önce `ekle` ile verilir.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.isciler = []
+        self.adlar = []
+        self._thread = None
+
+    def __len__(self):
+        return len(self.isciler)
+
+    def ekle(self, ad, isci):
+        if self._thread is not None:
+            raise ValueError("filo çalışırken araç eklenemez")
+        if ad in self.adlar:
+            raise ValueError(f"'{ad}' adlı araç zaten var")
+        self.adlar.append(ad)
+        self.isciler.append(isci)
+        return isci
+
+    def baslat(self):
+        self._thread = QtCore.QThread()
+        self._thread.setObjectName("FleetManager")
+        for isci in self.isciler:
+            isci.moveToThread(self._thread)
+            self._thread.started.connect(isci.oturum.baslat)
+        self._thread.start()
+
+    def durdur(self):
+        if self._thread is not None:
+            for isci in self.isciler:
+                QtCore.QMetaObject.invokeMethod(
+                    isci.oturum, "kapat", QtCore.Qt.BlockingQueuedConnection)
+            self._thread.quit()
+            self._thread.wait()
+            self._thread = None
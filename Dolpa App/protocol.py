@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+"""
+DOLPA Underwater Technologies
+Çerçeveli Akış Protokolü
+
+Her mesaj 4 baytlık big-endian uzunluk başlığı ve ardından gelen yükten
+oluşur:  [uzunluk: uint32][yük: uzunluk bayt]
+Yük UTF-8 JSON'dur. Yalnızca sık gelen telemetri çerçeveleri, el sıkışmada
+"ikili" kodlama seçildiyse sabit düzenli ikili yük olarak gelir; ikili yükün
+ilk baytı bir tür kodudur ve hiçbir zaman '{' olmaz.
+"""
+
+import json
+import struct
+
+BASLIK = struct.Struct("!I")
+BASLIK_BOYUTU = BASLIK.size
+
+# Desteklenen kodlamalar, tercih sırasıyla
+KODLAMA_IKILI = "ikili"
+KODLAMA_JSON = "json"
+KODLAMALAR = [KODLAMA_IKILI, KODLAMA_JSON]
+
+# İkili yük tür kodları
+IKILI_TELEMETRI = 0x01
+
+# tür, zaman, derinlik, yön, yunuslama, yalpa, enlem, boylam, şarj, sızıntı
+TELEMETRI = struct.Struct("!BdffffddB?")
+TELEMETRI_ALANLARI = ("zaman", "derinlik", "yon", "yunuslama", "yalpa",
+                      "enlem", "boylam", "sarj", "sizinti")
+
+# Bozuk akışta dev bellek ayırmayı engellemek için üst sınır
+MAKS_CERCEVE = 4 * 1024 * 1024
+
+
+class ProtocolError(ValueError):
+    """Akış senkronu kaybedildi; bağlantı kapatılmalı."""
+
+
+def encode_message(veri):
+    """Mesajı tek bir çerçeve olarak kodla."""
+    yuk = json.dumps(veri, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+    return BASLIK.pack(len(yuk)) + yuk
+
+
+def encode_telemetry(t):
+    """Telemetri sözlüğünü ikili çerçeve olarak kodla."""
+    yuk = TELEMETRI.pack(
+        IKILI_TELEMETRI, t["zaman"], t["derinlik"], t["yon"], t["yunuslama"],
+        t["yalpa"], t["enlem"], t["boylam"], t["sarj"], t["sizinti"])
+    return BASLIK.pack(len(yuk)) + yuk
+
+
+def decode_telemetry(tampon, ofset=0):
+    degerler = TELEMETRI.unpack_from(tampon, ofset)
+    t = dict(zip(TELEMETRI_ALANLARI, degerler[1:]))
+    t["tip"] = "telemetri"
+    return t
+
+
+def decode_payload(yuk):
+    if yuk and yuk[0] == IKILI_TELEMETRI:
+        return decode_telemetry(yuk)
+    return json.loads(yuk)
+
+
+class FrameDecoder:
+    """Artımlı çerçeve çözücü.
+
+    Gelen baytlar tek bir bytearray'e eklenir, tam çerçeveler bir okuma
+    ofseti ilerletilerek çıkarılır ve tüketilen kısım her beslemede bir kez
+    baştan silinir. Böylece parçalı ya da birleşik TCP segmentleri yeniden
+    birleştirme maliyeti olmadan işlenir.
+    """
+
+    def __init__(self, maks_cerceve=MAKS_CERCEVE, yuk_dinleyici=None):
+        self.maks_cerceve = maks_cerceve
+        # Verilirse her çerçevenin ham yüküyle çağrılır (ör. dalış kaydı)
+        self.yuk_dinleyici = yuk_dinleyici
+        self._tampon = bytearray()
+        self.hatali_cerceve = 0
+
+    def feed(self, veri):
+        """Yeni baytları ekle, çözülen mesajların listesini döndür."""
+        tampon = self._tampon
+        tampon += veri
+        mesajlar = []
+        ofset = 0
+        uzunluk = len(tampon)
+        unpack_from = BASLIK.unpack_from
+
+        while uzunluk - ofset >= BASLIK_BOYUTU:
+            (boyut,) = unpack_from(tampon, ofset)
+            if boyut > self.maks_cerceve:
+                self.reset()
+                raise ProtocolError(f"çerçeve çok büyük: {boyut} bayt")
+            son = ofset + BASLIK_BOYUTU + boyut
+            if son > uzunluk:
+                break
+            bas = ofset + BASLIK_BOYUTU
+            if self.yuk_dinleyici is not None:
+                self.yuk_dinleyici(bytes(tampon[bas:son]))
+            try:
+                if boyut == TELEMETRI.size and tampon[bas] == IKILI_TELEMETRI:
+                    # Sıcak yol: kopya almadan doğrudan tampondan aç
+                    mesajlar.append(decode_telemetry(tampon, bas))
+                else:
+                    mesajlar.append(decode_payload(tampon[bas:son]))
+            except (ValueError, struct.error):
+                # Çerçeve sınırları sağlam, yalnızca bu yük bozuk
+                self.hatali_cerceve += 1
+            ofset = son
+
+        if ofset:
+            del tampon[:ofset]
+        return mesajlar
+
+    def bekleyen_bayt(self):
+        return len(self._tampon)
+
+    def reset(self):
+        self._tampon.clear()
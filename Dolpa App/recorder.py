@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+DOLPA Underwater Technologies
+Dalış Kaydedici
+
+Gelen her çerçeve ve giden her komut yalnızca eklemeli bir ikili dosyaya
+yazılır. Dosya düzeni:
+
+    [dosya başlığı] [kayıt] [kayıt] ...
+    dosya başlığı : sihir (8 bayt) + sürüm (uint32) + onaylı uzunluk (uint64)
+                    + başlangıç duvar saati (float64, Unix zamanı)
+    kayıt         : zaman (float64) + yön (uint8) + uzunluk (uint32) + yük
+
+Kayıt zamanı, kaydın başından beri geçen monoton saniyedir; sistem saati
+dalış sırasında ileri/geri alınsa da dizin ve oynatma temposu bozulmaz.
+Gerçek saat gerekiyorsa başlıktaki tek duvar saati çapasına eklenir. Sürüm 1
+dosyalarında çapa yoktur, kayıt zamanları doğrudan Unix zamanıdır.
+
+Yük, protokol çerçevesinin yüküdür (JSON ya da ikili telemetri); böylece
+kayıt canlı akışla aynı çözme yolundan geçirilebilir. Onaylı uzunluk her
+toplu yazımdan ve diske aktarımdan sonra güncellenir; çökme sonrası okuyucu
+yalnızca bu uzunluğa kadar olan kayıtlara güvenir.
+
+Yanındaki .idx dosyası seyrek zaman dizinidir: her INDEKS_ARALIGI saniyede
+bir (zaman, ofset) çifti. Uzun bir kayıtta belirli bir ana tarama yapmadan
+atlamak için kullanılır.
+"""
+
+import bisect
+import logging
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+
+SIHIR = b"DOLPAKYT"
+SURUM = 2
+DOSYA_BASLIGI = struct.Struct("<8sIQd")
+DOSYA_BASLIGI_V1 = struct.Struct("<8sIQ")
+ONAYLI_UZUNLUK_OFSETI = 12
+ONAYLI_UZUNLUK = struct.Struct("<Q")
+KAYIT_BASLIGI = struct.Struct("<dBI")
+INDEKS_KAYDI = struct.Struct("<dQ")
+
+# Kayıt yönleri
+GELEN = 0
+GIDEN = 1
+
+INDEKS_ARALIGI = 1.0          # saniye
+TOPLU_YAZMA_ARALIGI = 0.2     # saniye
+TOPLU_YAZMA_ADEDI = 2000      # kayıt
+BUYUME_ADIMI = 16 * 1024 * 1024
+
+_log = logging.getLogger(__name__)
+
+
+class DiveRecorder:
+    """Arka plan thread'inde toplu yazan, bellek eşlemeli dalış kaydedici.
+
+    `kaydet` yalnızca kuyruğa ekler ve hiçbir zaman beklemez; disk işleri
+    kaydedicinin kendi thread'inde yapılır. Yazma hatası kaydı durdurur ve
+    `hata_bildir(mesaj)` ile (kaydedici thread'inden) bildirilir.
+    """
+
+    def __init__(self, yol, hata_bildir=None):
+        self.yol = yol
+        self._hata_bildir = hata_bildir or _log.error
+        self.indeks_yolu = yol + ".idx"
+        self._kuyruk = queue.SimpleQueue()
+        self._thread = threading.Thread(target=self._calis, name="DiveRecorder", daemon=True)
+        self._dosya = None
+        self._mm = None
+        self._indeks = None
+        self._ofset = DOSYA_BASLIGI.size
+        self._son_indeks_zamani = None
+        self._hata = None
+        self._t0 = time.monotonic()
+        self.duvar_baslangici = time.time()
+        self.kayit_sayisi = 0
+
+    def baslat(self):
+        klasor = os.path.dirname(self.yol)
+        if klasor:
+            os.makedirs(klasor, exist_ok=True)
+        self._dosya = open(self.yol, "w+b")
+        self._dosya.truncate(BUYUME_ADIMI)
+        self._mm = mmap.mmap(self._dosya.fileno(), BUYUME_ADIMI)
+        self._t0 = time.monotonic()
+        self.duvar_baslangici = time.time()
+        DOSYA_BASLIGI.pack_into(self._mm, 0, SIHIR, SURUM, self._ofset, self.duvar_baslangici)
+        self._mm.flush()
+        self._indeks = open(self.indeks_yolu, "wb")
+        self._thread.start()
+
+    def kaydet(self, yon, yuk, zaman=None):
+        """Kaydı kuyruğa ekle (her thread'den güvenle çağrılabilir).
+
+        zaman: kaydın başından beri saniye; verilmezse monoton saatten alınır.
+        """
+        if self._hata is not None:
+            return
+        self._kuyruk.put((time.monotonic() - self._t0 if zaman is None else zaman, yon, yuk))
+
+    def durdur(self):
+        if not self._thread.is_alive():
+            return
+        self._kuyruk.put(None)
+        self._thread.join()
+
+    def _calis(self):
+        calisiyor = True
+        while calisiyor:
+            try:
+                ilk = self._kuyruk.get(timeout=TOPLU_YAZMA_ARALIGI)
+            except queue.Empty:
+                continue
+            parti = []
+            son_zaman = time.monotonic() + TOPLU_YAZMA_ARALIGI
+            kayit = ilk
+            while True:
+                if kayit is None:
+                    calisiyor = False
+                    break
+                parti.append(kayit)
+                if len(parti) >= TOPLU_YAZMA_ADEDI:
+                    break
+                kalan = son_zaman - time.monotonic()
+                if kalan <= 0:
+                    break
+                try:
+                    kayit = self._kuyruk.get(timeout=kalan)
+                except queue.Empty:
+                    break
+            if parti and self._hata is None:
+                try:
+                    self._partiyi_yaz(parti)
+                except (OSError, ValueError) as e:
+                    # Disk doldu vb.: kaydı bırak ama uygulamayı etkileme
+                    self._hata = e
+                    self._hata_bildir(f"Dalış kaydı yazılamadı, kayıt durduruldu: {e}")
+        self._kapat()
+
+    def _partiyi_yaz(self, parti):
+        gereken = sum(KAYIT_BASLIGI.size + len(yuk) for _, _, yuk in parti)
+        if self._ofset + gereken > len(self._mm):
+            self._buyut(self._ofset + gereken)
+
+        yeni_indeksler = []
+        mm = self._mm
+        ofset = self._ofset
+        for zaman, yon, yuk in parti:
+            if self._son_indeks_zamani is None or zaman - self._son_indeks_zamani >= INDEKS_ARALIGI:
+                yeni_indeksler.append(INDEKS_KAYDI.pack(zaman, ofset))
+                self._son_indeks_zamani = zaman
+            KAYIT_BASLIGI.pack_into(mm, ofset, zaman, yon, len(yuk))
+            ofset += KAYIT_BASLIGI.size
+            mm[ofset:ofset + len(yuk)] = yuk
+            ofset += len(yuk)
+
+        # Önce veri, sonra onaylı uzunluk diske
+        mm.flush()
+        ONAYLI_UZUNLUK.pack_into(mm, ONAYLI_UZUNLUK_OFSETI, ofset)
+        mm.flush(0, mmap.PAGESIZE)
+        self._ofset = ofset
+        self.kayit_sayisi += len(parti)
+
+        if yeni_indeksler:
+            self._indeks.write(b"".join(yeni_indeksler))
+            self._indeks.flush()
+
+    def _buyut(self, en_az):
+        boyut = len(self._mm)
+        while boyut < en_az:
+            boyut += BUYUME_ADIMI
+        self._mm.close()
+        self._dosya.truncate(boyut)
+        self._mm = mmap.mmap(self._dosya.fileno(), boyut)
+
+    def _kapat(self):
+        self._mm.close()
+        # Ön ayrılmış boş kuyruğu at
+        self._dosya.truncate(self._ofset)
+        self._dosya.close()
+        self._indeks.close()
+
+
+class DiveRecording:
+    """Kayıt dosyasını salt okunur olarak açar ve zamana göre atlamayı sağlar."""
+
+    def __init__(self, yol):
+        """Kayıt değilse, kısaysa ya da sürümü bilinmiyorsa ValueError, dosya
+        açılamazsa OSError yükseltir."""
+        self.yol = yol
+        self._dosya = open(yol, "rb")
+        try:
+            self._basligi_oku()
+        except (OSError, ValueError):
+            self._dosya.close()
+            raise
+        self._indeks_zamanlari, self._indeks_ofsetleri = self._indeksi_yukle()
+
+    def _basligi_oku(self):
+        if os.fstat(self._dosya.fileno()).st_size < DOSYA_BASLIGI_V1.size:
+            raise ValueError(f"dalış kaydı değil: {self.yol}")
+        self._mm = mmap.mmap(self._dosya.fileno(), 0, access=mmap.ACCESS_READ)
+        sihir, surum, onayli = DOSYA_BASLIGI_V1.unpack_from(self._mm, 0)
+        if sihir != SIHIR:
+            self._mm.close()
+            raise ValueError(f"dalış kaydı değil: {self.yol}")
+        if surum == 1:
+            # Zamanlar zaten Unix zamanı
+            self._veri_ofseti = DOSYA_BASLIGI_V1.size
+            self.duvar_baslangici = 0.0
+        elif surum == SURUM and len(self._mm) >= DOSYA_BASLIGI.size:
+            self._veri_ofseti = DOSYA_BASLIGI.size
+            self.duvar_baslangici = DOSYA_BASLIGI.unpack_from(self._mm, 0)[3]
+        else:
+            self._mm.close()
+            raise ValueError(f"desteklenmeyen kayıt sürümü: {surum}")
+        self.uzunluk = min(onayli, len(self._mm))
+
+    def _indeksi_yukle(self):
+        zamanlar, ofsetler = [], []
+        try:
+            with open(self.yol + ".idx", "rb") as f:
+                veri = f.read()
+        except OSError:
+            veri = b""
+        tam = len(veri) - len(veri) % INDEKS_KAYDI.size
+        for zaman, ofset in INDEKS_KAYDI.iter_unpack(veri[:tam]):
+            if ofset < self.uzunluk:
+                zamanlar.append(zaman)
+                ofsetler.append(ofset)
+        if not ofsetler:
+            zamanlar, ofsetler = [self._zaman_at(self._veri_ofseti)], [self._veri_ofseti]
+        return zamanlar, ofsetler
+
+    def _zaman_at(self, ofset):
+        if ofset + KAYIT_BASLIGI.size > self.uzunluk:
+            return 0.0
+        return KAYIT_BASLIGI.unpack_from(self._mm, ofset)[0]
+
+    def baslangic_zamani(self):
+        return self._zaman_at(self._veri_ofseti)
+
+    def bitis_zamani(self):
+        son = self.baslangic_zamani()
+        for son, _, _ in self.records(self._indeks_zamanlari[-1]):
+            pass
+        return son
+
+    def seek(self, zaman):
+        """`zaman` anındaki ya da ondan önceki en yakın dizin noktasının ofseti."""
+        i = bisect.bisect_right(self._indeks_zamanlari, zaman) - 1
+        return self._indeks_ofsetleri[max(i, 0)]
+
+    def records(self, baslangic=None):
+        """(zaman, yön, yük) üret; `baslangic` verilirse o andan itibaren."""
+        ofset = self._veri_ofseti if baslangic is None else self.seek(baslangic)
+        mm = self._mm
+        while ofset + KAYIT_BASLIGI.size <= self.uzunluk:
+            zaman, yon, boyut = KAYIT_BASLIGI.unpack_from(mm, ofset)
+            bas = ofset + KAYIT_BASLIGI.size
+            ofset = bas + boyut
+            if ofset > self.uzunluk:
+                break
+            if baslangic is not None and zaman < baslangic:
+                continue
+            yield zaman, yon, mm[bas:ofset]
+
+    def duvar_zamani(self, zaman):
+        """Kayıt zamanının Unix zamanı karşılığı."""
+        return self.duvar_baslangici + zaman
+
+    def close(self):
+        self._mm.close()
+        self._dosya.close()
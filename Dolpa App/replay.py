@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+DOLPA Underwater Technologies
+Dalış Kaydı Oynatma
+
+Kaydedilmiş gelen çerçeveleri canlı araçla aynı yoldan (FrameDecoder ->
+VehicleSession -> NetworkWorker -> GUI) geçirir. Deterministik bir
+performans düzeneği olarak da kullanılır: en yüksek hızda arayüzün saniyede
+kaç çerçeveyi geride kalmadan işleyebildiği ölçülür.
+"""
+
+from PyQt5 import QtCore
+import math
+import time
+
+import network
+import protocol
+import recorder
+
+# En yüksek hızda bir adımda beslenen en fazla çerçeve
+MAKS_PARTI = 2000
+# Oynatma sırasında Ctrl+Sağ/Sol ile atlanan süre (saniye)
+ATLAMA_ADIMI = 10.0
+
+
+class ReplaySession(network.VehicleSession):
+    """Soket yerine dalış kaydından beslenen oturum.
+
+    hiz: 1.0, 10.0 gibi çarpan; None ise olabildiğince hızlı.
+    Giden mesajlar araca gitmez, yok sayılır; yanıt bekleyen istekler hemen
+    hata ile döner. Kayıt açılamazsa `oynatma_bitti` "hata" anahtarıyla yayınlanır.
+    Oynatma sırasında `atla` ile ileri/geri sarılır (kayıt sonundan geri de).
+    """
+
+    oynatma_bitti = QtCore.pyqtSignal(object)  # istatistik sözlüğü
+
+    # GUI'den ağ thread'ine (queued)
+    _atlama_istendi = QtCore.pyqtSignal(float)
+
+    def __init__(self, yol, hiz=1.0, baslangic=0.0, parent=None):
+        if hiz is not None and not (math.isfinite(hiz) and hiz > 0):
+            raise ValueError(f"oynatma hızı sonlu ve sıfırdan büyük olmalı: {hiz}")
+        super().__init__("oynatma", 0, parent)
+        self.yol = yol
+        self.hiz = hiz
+        self.baslangic = baslangic
+        self._kayit = None
+        self._kayitlar = None
+        self._bekleyen = None
+        self._adim_timer = None
+        self._cerceve_sayisi = 0
+        self._maks_gecikme = 0.0
+        self._duvar_baslangic = 0.0
+        self._konum = 0.0
+        self._atlama_istendi.connect(self._goreli_atla)
+
+    def atla(self, saniye):
+        """Oynatmayı `saniye` kadar ileri (negatifse geri) sar; her thread'den çağrılabilir."""
+        self._atlama_istendi.emit(saniye)
+
+    @QtCore.pyqtSlot()
+    def baslat(self):
+        try:
+            self._kayit = recorder.DiveRecording(self.yol)
+        except (OSError, ValueError) as e:
+            # Slot içinde yakalanmayan istisna tüm uygulamayı düşürür
+            self.oynatma_bitti.emit({"hata": str(e)})
+            return
+
+        self._zaman_asimi_timer = QtCore.QTimer(self)
+        self._zaman_asimi_timer.setInterval(100)
+        self._zaman_asimi_timer.timeout.connect(self._zaman_asimlarini_kontrol_et)
+
+        self._adim_timer = QtCore.QTimer(self)
+        self._adim_timer.setInterval(0 if self.hiz is None else 5)
+        self._adim_timer.timeout.connect(self._adim)
+
+        self._duvar_baslangic = time.monotonic()
+        self.konuma_git(self.baslangic)
+
+    @QtCore.pyqtSlot()
+    def kapat(self):
+        self._kapaniyor = True
+        if self._adim_timer is not None:
+            self._adim_timer.stop()
+        self._bekleyenleri_iptal_et("oynatma kapatıldı")
+        if self._kayit is not None:
+            self._kayitlar = None
+            self._kayit.close()
+            self._kayit = None
+
+    @QtCore.pyqtSlot(float)
+    def konuma_git(self, saniye):
+        """Kaydın başından itibaren `saniye` anına atla."""
+        if self._kayit is None:
+            return
+        self._konum = max(saniye, 0.0)
+        hedef = self._kayit.baslangic_zamani() + self._konum
+        self._kayitlar = self._kayit.records(hedef)
+        self._bekleyen = None
+        self._kayit_t0 = hedef
+        self._duvar_t0 = time.monotonic()
+        if self._adim_timer is not None and not self._adim_timer.isActive() and not self._kapaniyor:
+            # İlk açılış ya da kayıt bitmişken geri sarma: oynatma (yeniden) başlar
+            self._bagli = True
+            self.baglanti_degisti.emit(True)
+            self._adim_timer.start()
+
+    @QtCore.pyqtSlot(float)
+    def _goreli_atla(self, fark):
+        self.konuma_git(self._konum + fark)
+
+    def _yaz(self, veri):
+        pass
+
+    def istek(self, veri, geri_cagir, zaman_asimi=2.0):
+        geri_cagir(None, "oynatma modunda komut gönderilmez")
+        return None
+
+    def _siradaki(self):
+        if self._bekleyen is None:
+            for kayit in self._kayitlar:
+                if kayit[1] == recorder.GELEN:
+                    self._bekleyen = kayit
+                    break
+        return self._bekleyen
+
+    def _adim(self):
+        simdi = time.monotonic()
+        hedef = None if self.hiz is None else self._kayit_t0 + (simdi - self._duvar_t0) * self.hiz
+
+        # Bir TCP okuması gibi, bu adımdaki tüm çerçeveler tek seferde beslenir
+        cerceveler = []
+        while len(cerceveler) < MAKS_PARTI:
+            kayit = self._siradaki()
+            if kayit is None:
+                break
+            zaman, _, yuk = kayit
+            if hedef is not None and zaman > hedef:
+                break
+            cerceveler.append(protocol.BASLIK.pack(len(yuk)))
+            cerceveler.append(yuk)
+            self._bekleyen = None
+            son_zaman = zaman
+            if hedef is not None:
+                gecikme = simdi - (self._duvar_t0 + (zaman - self._kayit_t0) / self.hiz)
+                self._maks_gecikme = max(self._maks_gecikme, gecikme)
+
+        if cerceveler:
+            self._konum = son_zaman - self._kayit.baslangic_zamani()
+            self._cerceve_sayisi += len(cerceveler) // 2
+            veri = b"".join(cerceveler)
+            self.olcum.gelen_bayt += len(veri)
+            for mesaj in self._cozucu.feed(veri):
+                self._mesaji_isle(mesaj)
+
+        if self._bekleyen is None and self._siradaki() is None:
+            self._bitir()
+
+    def _bitir(self):
+        self._adim_timer.stop()
+        sure = time.monotonic() - self._duvar_baslangic
+        self._bagli = False
+        self.baglanti_degisti.emit(False)
+        self.oynatma_bitti.emit({
+            "cerceve": self._cerceve_sayisi,
+            "sure_s": sure,
+            "cerceve_s": self._cerceve_sayisi / sure if sure > 0 else 0.0,
+            "maks_gecikme_ms": self._maks_gecikme * 1000,
+        })
@@ -0,0 +1,402 @@
+# -*- coding: utf-8 -*-
+"""
+DOLPA Underwater Technologies
+Yerel Araç Simülatörü
+
+Gerçek araçla aynı çerçeveli protokolü localhost üzerinde konuşur:
+`merhaba`, `sarj_durumu`, `telemetri_abone`, `kalibrasyon`, `acil_cikis`
+komutlarını ve `dalis` / `kablo` görevlerini yanıtlar, sentetik telemetri
+yayınlar. Sıra numarası (`sira`) daha önce görülmüş komutlar yeniden
+uygulanmaz, yalnızca tekrar onaylanır. Yük testleri için hız, gecikme,
+titreşim, kopma, onay kaybı ve yavaş okuyucu ayarları vardır. İstenirse
+ayrı bir portta kamera akışı da (MJPEG ya da ham kare, bkz. camera.py)
+yayınlanır.
+
+Kullanım:
+    python simulator.py --port 5000 --hiz 100 --gecikme 50 --titresim 20
+    python simulator.py --kamera-port 8080 --kamera-modu mjpeg --kamera-fps 30
+"""
+
+import argparse
+import math
+import random
+import socket
+import threading
+import time
+
+import protocol
+
+
+class SimulatorAyarlari:
+    def __init__(self, hiz=None, gecikme_ms=0.0, titresim_ms=0.0, kayip=0.0,
+                 kopma_araligi=0.0, yavas_okuma_ms=0.0, kodlama=None, sarj=87,
+                 onay_kaybi=0.0):
+        self.hiz = hiz                          # Hz; None ise abonelikteki hız
+        self.gecikme_ms = gecikme_ms            # her yanıta eklenen gecikme
+        self.titresim_ms = titresim_ms          # gecikmeye eklenen rastgele sapma
+        self.kayip = kayip                      # telemetri çerçevesi düşürme olasılığı
+        self.kopma_araligi = kopma_araligi      # s; >0 ise bağlantı bu aralıkla koparılır
+        self.yavas_okuma_ms = yavas_okuma_ms    # her okumadan önce bekleme
+        self.kodlama = kodlama                  # zorla kodlama; None ise el sıkışmaya uy
+        self.sarj = sarj
+        self.onay_kaybi = onay_kaybi            # komut onayını düşürme olasılığı
+
+
+class VehicleSimulator:
+    """Her bağlantıyı ayrı thread'de sunan basit araç simülatörü."""
+
+    def __init__(self, host="127.0.0.1", port=0, ayarlar=None):
+        self.ayarlar = ayarlar or SimulatorAyarlari()
+        self._sunucu = socket.create_server((host, port))
+        self.host, self.port = self._sunucu.getsockname()[:2]
+        self._durdur = threading.Event()
+        self._thread = None
+        self.alinan_komutlar = []
+        self.uygulanan_siralar = set()
+        self.tekrarlanan = 0                    # yeniden gönderildiği için tekrar gelen komut
+        self._kilit = threading.Lock()
+
+    def baslat(self):
+        self._thread = threading.Thread(target=self._kabul_et, name="VehicleSimulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def durdur(self):
+        self._durdur.set()
+        self._sunucu.close()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def __enter__(self):
+        return self.baslat()
+
+    def __exit__(self, *exc):
+        self.durdur()
+
+    def _kabul_et(self):
+        while not self._durdur.is_set():
+            try:
+                baglanti, _ = self._sunucu.accept()
+            except OSError:
+                return
+            baglanti.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            threading.Thread(target=self._istemci, args=(baglanti,), daemon=True).start()
+
+    def _istemci(self, baglanti):
+        oturum = _SimulatorOturumu(self, baglanti)
+        try:
+            oturum.calis()
+        finally:
+            oturum.kapat()
+
+
+class _SimulatorOturumu:
+    def __init__(self, simulator, baglanti):
+        self.sim = simulator
+        self.ayar = simulator.ayarlar
+        self.baglanti = baglanti
+        self.yazma_kilidi = threading.Lock()
+        self.kodlama = protocol.KODLAMA_JSON
+        self.akis_thread = None
+        self.akis_hizi = 0.0
+        self.kapali = threading.Event()
+        self.baslangic = time.monotonic()
+
+    def calis(self):
+        cozucu = protocol.FrameDecoder()
+        while not self.kapali.is_set() and not self.sim._durdur.is_set():
+            if self.ayar.kopma_araligi and time.monotonic() - self.baslangic > self.ayar.kopma_araligi:
+                return
+            if self.ayar.yavas_okuma_ms:
+                time.sleep(self.ayar.yavas_okuma_ms / 1000)
+            try:
+                self.baglanti.settimeout(0.2)
+                veri = self.baglanti.recv(65536)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            if not veri:
+                return
+            for mesaj in cozucu.feed(veri):
+                with self.sim._kilit:
+                    self.sim.alinan_komutlar.append(mesaj)
+                self._isle(mesaj)
+
+    def kapat(self):
+        self.kapali.set()
+        try:
+            self.baglanti.close()
+        except OSError:
+            pass
+
+    def _gecikme(self):
+        gecikme = self.ayar.gecikme_ms + random.uniform(-1, 1) * self.ayar.titresim_ms
+        if gecikme > 0:
+            time.sleep(gecikme / 1000)
+
+    def _gonder(self, cerceve):
+        with self.yazma_kilidi:
+            self.baglanti.sendall(cerceve)
+
+    def _yanitla(self, istek, yanit):
+        if "istek_id" in istek:
+            yanit["istek_id"] = istek["istek_id"]
+        self._gecikme()
+        self._gonder(protocol.encode_message(yanit))
+
+    def _isle(self, mesaj):
+        komut = mesaj.get("komut")
+        if komut == "merhaba":
+            secenekler = mesaj.get("kodlamalar", [protocol.KODLAMA_JSON])
+            kodlama = self.ayar.kodlama or next(
+                (k for k in protocol.KODLAMALAR if k in secenekler), protocol.KODLAMA_JSON)
+            self._yanitla(mesaj, {"kodlama": kodlama})
+        elif komut == "sarj_durumu":
+            self._yanitla(mesaj, {"sarj": self.ayar.sarj})
+        elif komut == "telemetri_abone":
+            hiz = _hiz(self.ayar.hiz or mesaj.get("hiz", 10))
+            if hiz is None:
+                # 0 akış thread'inde sıfıra bölme, negatif boş döngü olurdu
+                self._yanitla(mesaj, {"durum": "hata",
+                                      "hata": f"geçersiz telemetri hızı: {mesaj.get('hiz')!r}"})
+                return
+            self.kodlama = self.ayar.kodlama or mesaj.get("kodlama", protocol.KODLAMA_JSON)
+            self.akis_hizi = hiz
+            if self.akis_thread is None:
+                self.akis_thread = threading.Thread(target=self._telemetri_akisi, daemon=True)
+                self.akis_thread.start()
+        elif komut in ("kalibrasyon", "acil_cikis") or mesaj.get("gorev") in ("dalis", "kablo"):
+            sira = mesaj.get("sira")
+            if sira is not None:
+                with self.sim._kilit:
+                    if sira in self.sim.uygulanan_siralar:
+                        self.sim.tekrarlanan += 1
+                    self.sim.uygulanan_siralar.add(sira)
+            if "istek_id" in mesaj and random.random() >= self.ayar.onay_kaybi:
+                self._yanitla(mesaj, {"durum": "tamam"})
+
+    def _telemetri_akisi(self):
+        i = 0
+        sonraki = time.monotonic()
+        while not self.kapali.is_set():
+            t = sentetik_telemetri(i, self.ayar.sarj, self.akis_hizi)
+            i += 1
+            if random.random() >= self.ayar.kayip:
+                if self.kodlama == protocol.KODLAMA_IKILI:
+                    cerceve = protocol.encode_telemetry(t)
+                else:
+                    cerceve = protocol.encode_message(dict(t, tip="telemetri"))
+                try:
+                    self._gonder(cerceve)
+                except OSError:
+                    return
+            sonraki += 1.0 / self.akis_hizi
+            bekle = sonraki - time.monotonic()
+            if bekle > 0:
+                time.sleep(bekle)
+            else:
+                # Geride kaldıysak biriktirme, saati yeniden hizala
+                sonraki = time.monotonic()
+
+
+def _hiz(deger):
+    """Sonlu ve sıfırdan büyükse float hız, değilse None."""
+    try:
+        hiz = float(deger)
+    except (TypeError, ValueError):
+        return None
+    return hiz if math.isfinite(hiz) and hiz > 0 else None
+
+
+def _pozitif_hiz(metin):
+    hiz = _hiz(metin)
+    if hiz is None:
+        raise argparse.ArgumentTypeError("sıfırdan büyük sonlu bir sayı olmalı")
+    return hiz
+
+
+def sentetik_telemetri(i, sarj=87, hiz=10.0):
+    """i. örnek için düzgün değişen sentetik telemetri."""
+    t = i / hiz
+    return {
+        "zaman": time.time(),
+        "derinlik": 10.0 + 5.0 * math.sin(t / 20.0),
+        "yon": (t * 3.0) % 360.0,
+        "yunuslama": 2.0 * math.sin(t / 3.0),
+        "yalpa": 1.5 * math.cos(t / 4.0),
+        "enlem": 40.98 + 0.0005 * math.sin(t / 60.0),
+        "boylam": 29.02 + 0.0005 * math.cos(t / 60.0),
+        "sarj": sarj,
+        "sizinti": False,
+        # Kablo izleyici sinyali: yavaş salınım + her 45 s'de bir kısa tepe
+        "kablo_sinyali": 1.0 + 0.2 * math.sin(t / 7.0) + 0.02 * math.sin(i * 2.3)
+                         + 3.0 * math.exp(-(((t % 45.0) - 30.0) ** 2) / 2.0),
+    }
+
+
+class CameraSimulator:
+    """Araç kamerası yerine geçen kare sunucusu.
+
+    `mjpeg` modunda HTTP üzerinden multipart MJPEG, `ham` modunda TCP
+    üzerinden ham RGB kareler yayınlar. Kareler başta bir kez üretilir ve
+    döngüyle gönderilir; her kareye gönderim zamanı eklenir.
+    """
+
+    KARE_SAYISI = 60
+    SINIR = b"dolpakare"
+
+    def __init__(self, host="127.0.0.1", port=0, mod="mjpeg", fps=30.0,
+                 genislik=640, yukseklik=480, kalite=80):
+        if mod not in ("mjpeg", "ham"):
+            raise ValueError(f"bilinmeyen kamera modu: {mod}")
+        self.mod = mod
+        self.fps = fps
+        self.genislik = genislik
+        self.yukseklik = yukseklik
+        self._kareler = self._kareleri_uret(kalite)
+        self._sunucu = socket.create_server((host, port))
+        self.host, self.port = self._sunucu.getsockname()[:2]
+        self._durdur = threading.Event()
+        self._thread = None
+        self.gonderilen = 0
+
+    def _kareleri_uret(self, kalite):
+        # Qt yalnızca kamera simülasyonunda gerekir
+        from PyQt5 import QtCore, QtGui
+
+        kareler = []
+        for i in range(self.KARE_SAYISI):
+            kare = QtGui.QImage(self.genislik, self.yukseklik, QtGui.QImage.Format_RGB888)
+            kare.fill(QtGui.QColor(10, 38, 71))
+            p = QtGui.QPainter(kare)
+            x = i * (self.genislik + 40) // self.KARE_SAYISI - 40
+            p.fillRect(x, 0, 40, self.yukseklik, QtGui.QColor(74, 144, 226))
+            p.fillRect(0, self.yukseklik * i // self.KARE_SAYISI, self.genislik, 6,
+                       QtGui.QColor(255, 200, 0))
+            p.end()
+            if self.mod == "mjpeg":
+                veri = QtCore.QByteArray()
+                tampon = QtCore.QBuffer(veri)
+                tampon.open(QtCore.QIODevice.WriteOnly)
+                kare.save(tampon, "JPG", kalite)
+                kareler.append(bytes(veri))
+            else:
+                bellek = kare.constBits()
+                bellek.setsize(kare.sizeInBytes())
+                adim, satir = kare.bytesPerLine(), self.genislik * 3
+                ham = bytes(bellek)
+                kareler.append(b"".join(ham[y * adim:y * adim + satir] for y in range(self.yukseklik)))
+        return kareler
+
+    def baslat(self):
+        self._thread = threading.Thread(target=self._kabul_et, name="CameraSimulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def durdur(self):
+        self._durdur.set()
+        self._sunucu.close()
+        if self._thread is not None:
+            self._thread.join(timeout=2)
+
+    def __enter__(self):
+        return self.baslat()
+
+    def __exit__(self, *exc):
+        self.durdur()
+
+    def _kabul_et(self):
+        while not self._durdur.is_set():
+            try:
+                baglanti, _ = self._sunucu.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._istemci, args=(baglanti,), daemon=True).start()
+
+    def _istemci(self, baglanti):
+        import camera
+
+        try:
+            if self.mod == "mjpeg":
+                istek = b""
+                while b"\r\n\r\n" not in istek:
+                    parca = baglanti.recv(4096)
+                    if not parca:
+                        return
+                    istek += parca
+                baglanti.sendall(
+                    b"HTTP/1.0 200 OK\r\nCache-Control: no-cache\r\n"
+                    b"Content-Type: multipart/x-mixed-replace; boundary=" + self.SINIR + b"\r\n\r\n")
+            sonraki = time.monotonic()
+            i = 0
+            while not self._durdur.is_set():
+                kare = self._kareler[i % len(self._kareler)]
+                if self.mod == "mjpeg":
+                    baslik = (b"--" + self.SINIR + b"\r\nContent-Type: image/jpeg\r\n"
+                              b"Content-Length: %d\r\nX-Timestamp: %.6f\r\n\r\n"
+                              % (len(kare), time.time()))
+                    baglanti.sendall(baslik + kare + b"\r\n")
+                else:
+                    baglanti.sendall(camera.HAM_BASLIK.pack(
+                        camera.HAM_SIHIR, self.genislik, self.yukseklik, camera.BICIM_RGB,
+                        time.time(), len(kare)))
+                    baglanti.sendall(kare)
+                self.gonderilen += 1
+                i += 1
+                sonraki += 1.0 / self.fps
+                bekle = sonraki - time.monotonic()
+                if bekle > 0:
+                    time.sleep(bekle)
+                else:
+                    sonraki = time.monotonic()
+        except OSError:
+            pass
+        finally:
+            baglanti.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DOLPA araç simülatörü")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=5000)
+    parser.add_argument("--hiz", type=_pozitif_hiz, help="telemetri hızı (Hz); verilmezse abonelikteki hız")
+    parser.add_argument("--gecikme", type=float, default=0.0, help="yanıt gecikmesi (ms)")
+    parser.add_argument("--titresim", type=float, default=0.0, help="gecikme sapması (ms)")
+    parser.add_argument("--kayip", type=float, default=0.0, help="telemetri düşürme olasılığı (0-1)")
+    parser.add_argument("--kopma", type=float, default=0.0, help="bağlantıyı her N saniyede kopar")
+    parser.add_argument("--yavas-okuma", type=float, default=0.0, help="her okumadan önce bekleme (ms)")
+    parser.add_argument("--kodlama", choices=protocol.KODLAMALAR, help="kodlamayı zorla")
+    parser.add_argument("--onay-kaybi", type=float, default=0.0,
+                        help="komut onayını düşürme olasılığı (0-1)")
+    parser.add_argument("--kamera-port", type=int, help="kamera akışı portu; verilmezse kamera yok")
+    parser.add_argument("--kamera-modu", choices=("mjpeg", "ham"), default="mjpeg",
+                        help="mjpeg: HTTP üzerinden MJPEG, ham: TCP üzerinden ham RGB kareler")
+    parser.add_argument("--kamera-fps", type=_pozitif_hiz, default=30.0, help="kamera kare hızı")
+    parser.add_argument("--kamera-boyutu", default="640x480", help="kare boyutu (GENxYUK)")
+    args = parser.parse_args(argv)
+
+    ayarlar = SimulatorAyarlari(
+        hiz=args.hiz, gecikme_ms=args.gecikme, titresim_ms=args.titresim, kayip=args.kayip,
+        kopma_araligi=args.kopma, yavas_okuma_ms=args.yavas_okuma, kodlama=args.kodlama,
+        onay_kaybi=args.onay_kaybi)
+    sim = VehicleSimulator(args.host, args.port, ayarlar).baslat()
+    print(f"Simülatör dinliyor: {sim.host}:{sim.port}")
+    kamera = None
+    if args.kamera_port is not None:
+        genislik, _, yukseklik = args.kamera_boyutu.partition("x")
+        kamera = CameraSimulator(args.host, args.kamera_port, args.kamera_modu, args.kamera_fps,
+                                 int(genislik), int(yukseklik)).baslat()
+        sema = "http" if args.kamera_modu == "mjpeg" else "tcp"
+        print(f"Kamera yayını: {sema}://{kamera.host}:{kamera.port}/akis")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        sim.durdur()
+        if kamera is not None:
+            kamera.durdur()
+
+
+if __name__ == "__main__":
+    main()
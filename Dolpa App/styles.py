@@ -2,22 +2,54 @@
 """
 DOLPA Underwater Technologies
 Stylesheet Definitions
+
+Tüm kurallar nesne adı (#objectName) ve dinamik özellik ([durum="bagli"])
+seçicileriyle yazılır ve tek bir UYGULAMA_STILI olarak ana pencereye bir kez
+verilir. Durum değişiklikleri yeni stil metni kurmaz, yalnızca widget'ın
+özelliğini değiştirir (bkz. viewmodel.ViewModel.durum).
 """
 
+# Durum özellikleri ve değerleri
+DURUM = "durum"                 # labelAracDurum: bagli / kopuk
+DURUM_BAGLI = "bagli"
+DURUM_KOPUK = "kopuk"
+SEVIYE = "seviye"               # labelBattery: yuksek / orta / dusuk / bilinmiyor
+SEVIYE_YUKSEK = "yuksek"
+SEVIYE_ORTA = "orta"
+SEVIYE_DUSUK = "dusuk"
+SEVIYE_BILINMIYOR = "bilinmiyor"
+SIZINTI = "sizinti"             # labelTelemetri: true / false
+KALITE = "kalite"               # labelBaglanti: iyi / zayif / kotu / bilinmiyor (bkz. linkmetrics)
+
+# Şarj renkleri
+BATTERY_GREEN = "#00ff00"  # Yeşil (>50%)
+BATTERY_ORANGE = "#ffa500"  # Turuncu (20-50%)
+BATTERY_RED = "#ff0000"  # Kırmızı (<20%)
+BATTERY_WHITE = "white"  # Bilinmeyen durum
+
+
+def _secici(tip, adlar, ek=""):
+    """Aynı kuralı paylaşan widget'lar için seçici listesi."""
+    return ", ".join(f"{tip}#{ad}{ek}" for ad in adlar)
+
+
 # Ana pencere arkaplan rengi
-MAIN_WINDOW_STYLE = "background-color: #2c74b3;"
+MAIN_WINDOW_STYLE = """
+#MainWindow, #MainWindow * {
+    background-color: #2c74b3;
+}
+"""
 
 # Durum çubuğu stil
 STATUS_BAR_STYLE = """
-QWidget {
+#statusBar, #statusBar QWidget {
     background-color: #0d447d;
     border: none;
 }
 """
 
 # Görev başlık labelları için stil
-GOREV_LABEL_STYLE = """
-QLabel {
+GOREV_LABEL_STYLE = _secici("QLabel", ("labelDalisGorevi", "labelNesneGorevi")) + """ {
     background-color: #0a2647;
     color: white;
     border-radius: 8px;
@@ -28,8 +60,7 @@ QLabel {
 """
 
 # Koordinat text editleri için stil
-KOORDINAT_TEXT_STYLE = """
-QTextEdit {
+KOORDINAT_TEXT_STYLE = _secici("QTextEdit", ("textEditBaslangicKonumu", "textEditBitisKonumu")) + """ {
     background-color: #023972;
     color: white;
     border: 1px solid #4a90e2;
@@ -40,8 +71,7 @@ QTextEdit {
 """
 
 # Anomali labelları için stil
-ANOMALI_LABEL_STYLE = """
-QLabel {
+ANOMALI_LABEL_STYLE = _secici("QLabel", [f"labelAnomali_{i}" for i in range(1, 5)]) + """ {
     background-color: #023972;
     color: white;
     border: 1px solid #4a90e2;
@@ -51,8 +81,8 @@ QLabel {
 """
 
 # Butonlar için stil
-BUTTON_STYLE = """
-QPushButton {
+_BUTONLAR = ("pushButtonRotaCiz", "pushButtonGonder", "pushButtonKalibre", "pushButtonSizdirmazlik")
+BUTTON_STYLE = _secici("QPushButton", _BUTONLAR) + """ {
     background-color: #023972;
     color: white;
     border: 1px solid #4a90e2;
@@ -61,34 +91,52 @@ QPushButton {
     font-size: 12px;
     padding: 5px;
 }
-QPushButton:hover {
+""" + _secici("QPushButton", _BUTONLAR, ":hover") + """ {
     background-color: #034a94;
 }
-QPushButton:pressed {
+""" + _secici("QPushButton", _BUTONLAR, ":pressed") + """ {
     background-color: #012855;
 }
 """
 
+# Acil çıkış butonu: diğerlerinden ayrılsın diye kırmızı
+ACIL_BUTTON_STYLE = """
+QPushButton#pushButtonAcil {
+    background-color: #b00020;
+    color: white;
+    border: 2px solid #ff5252;
+    border-radius: 8px;
+    font-weight: bold;
+    font-size: 14px;
+}
+QPushButton#pushButtonAcil:hover {
+    background-color: #d0002a;
+}
+QPushButton#pushButtonAcil:pressed {
+    background-color: #7a0016;
+}
+"""
+
 # Radio buttonlar için stil
-RADIO_BUTTON_STYLE = """
-QRadioButton {
+_RADYO_BUTONLAR = ("btnDalis", "btnNesne")
+RADIO_BUTTON_STYLE = _secici("QRadioButton", _RADYO_BUTONLAR) + """ {
     background-color: #0a2647;
 }
-QRadioButton::indicator {
+""" + _secici("QRadioButton", _RADYO_BUTONLAR, "::indicator") + """ {
     width: 15px;
     height: 15px;
     border-radius: 7px;
-    border: 1px solid #FFFFFF;    
+    border: 1px solid #FFFFFF;
     background-color: #FFFFFF;
 }
-QRadioButton::indicator:checked {
+""" + _secici("QRadioButton", _RADYO_BUTONLAR, "::indicator:checked") + """ {
     background-color: #0a2647;
 }
 """
 
 # Başlık etiketleri için stil
-BASLIK_LABEL_STYLE = """
-QLabel {
+BASLIK_LABEL_STYLE = _secici("QLabel", (
+    "labelAracErisimHead", "labelAktifGorevHead", "labelKalibreText", "labelSizdirmazlikText")) + """ {
     background-color: #0a2647;
     color: white;
     font-weight: bold;
@@ -98,13 +146,14 @@ QLabel {
 """
 
 # Grup kutuları için stil
-GROUP_BOX_STYLE = """
-QGroupBox {
+_GRUPLAR = ("gorevSecimiAlani", "kontrolAlani", "groupBoxKamera", "groupBoxGPS", "groupBoxTerminal",
+            "groupBoxTest")
+GROUP_BOX_STYLE = _secici("QGroupBox", _GRUPLAR) + """ {
     border: 1px solid #4a90e2;
     border-radius: 8px;
     background-color: #0a2647;
 }
-QGroupBox:title {
+""" + _secici("QGroupBox", _GRUPLAR, ":title") + """ {
     color: white;
     font-weight: bold;
     font-size: 12px;
@@ -113,7 +162,7 @@ QGroupBox:title {
 
 # Terminal metin alanı için stil
 TERMINAL_TEXT_STYLE = """
-QTextEdit {
+QPlainTextEdit#terminalTextEdit {
     background-color: #0a2647;
     color: white;
     border: none;
@@ -121,20 +170,57 @@ QTextEdit {
 }
 """
 
-# Durum etiketleri için stil (bağlantı durumu)
+# Terminal seviye filtresi ve araç seçici için stil
+COMBO_BOX_STYLE = _secici("QComboBox", ("comboBoxLogSeviye", "comboBoxArac")) + """ {
+    background-color: #023972;
+    color: white;
+    border: 1px solid #4a90e2;
+    border-radius: 4px;
+    font-size: 11px;
+    padding: 0px 4px;
+}
+""" + _secici("QComboBox", ("comboBoxLogSeviye", "comboBoxArac"), " QAbstractItemView") + """ {
+    background-color: #023972;
+    color: white;
+}
+"""
+
+# Durum etiketleri için stil (bağlantı durumu; varsayılan kırmızı, yazı boyutu
+# diğer etiketlerden büyük kalsın diye belirtilmez)
 DURUM_LABEL_STYLE = """
-QLabel {
+QLabel#labelAracDurum {
     background-color: #0a2647;
     color: #ff0000;
     font-weight: bold;
-    font-size: 12px;
     border: none;
 }
+QLabel#labelAracDurum[durum="bagli"] {
+    color: #00ff00;
+}
+"""
+
+# Bağlantı ölçümleri etiketi; kalite özelliğine göre renk
+BAGLANTI_LABEL_STYLE = """
+QLabel#labelBaglanti {
+    background-color: #0a2647;
+    color: white;
+    font-size: 10px;
+    border: none;
+}
+QLabel#labelBaglanti[kalite="zayif"] {
+    color: #ffa500;
+}
+QLabel#labelBaglanti[kalite="kotu"] {
+    color: #ff0000;
+}
+QLabel#labelBaglanti[kalite="bilinmiyor"] {
+    color: #a0a0a0;
+}
 """
 
 # Görev durumu etiketleri için stil (her zaman beyaz)
 GOREV_DURUM_LABEL_STYLE = """
-QLabel {
+QLabel#labelAracDurum_2 {
     background-color: #0a2647;
     color: white;
     font-weight: bold;
@@ -143,26 +229,37 @@ QLabel {
 }
 """
 
-# Şarj durumu etiketi için stil
-BATTERY_LABEL_STYLE = """
-QLabel {
+# Durum çubuğu etiketleri: tarih/saat, telemetri ve şarj
+DURUM_CUBUGU_LABEL_STYLE = _secici("QLabel", ("labelDateTime", "labelTelemetri", "labelBattery")) + """ {
     color: white;
     font-weight: bold;
     font-size: 12px;
 }
-"""
-
-# Tarih/saat etiketi için stil
-DATETIME_LABEL_STYLE = "color: white; font-weight: bold; font-size: 12px;"
-
-# Bağlı durum stil (yeşil)
-CONNECTED_STYLE = "background-color: #0a2647; color: #00ff00; font-weight: bold; border: none;"
-
-# Bağlı değil durum stil (kırmızı)
-DISCONNECTED_STYLE = "background-color: #0a2647; color: #ff0000; font-weight: bold; border: none;"
+QLabel#labelTelemetri[sizinti="true"] {
+    color: #ff0000;
+}
+""" + "".join(f"""QLabel#labelBattery[seviye="{seviye}"] {{
+    color: {renk};
+}}
+""" for seviye, renk in ((SEVIYE_YUKSEK, BATTERY_GREEN), (SEVIYE_ORTA, BATTERY_ORANGE),
+                         (SEVIYE_DUSUK, BATTERY_RED), (SEVIYE_BILINMIYOR, BATTERY_WHITE)))
 
-# Şarj renkleri
-BATTERY_GREEN = "#00ff00"  # Yeşil (>50%)
-BATTERY_ORANGE = "#ffa500"  # Turuncu (20-50%)
-BATTERY_RED = "#ff0000"  # Kırmızı (<20%)
-BATTERY_WHITE = "white"  # Bilinmeyen durum
+# Ana pencereye bir kez verilen derlenmiş stil; eşit özgüllükte sonraki kural kazanır
+UYGULAMA_STILI = "".join((
+    MAIN_WINDOW_STYLE,
+    STATUS_BAR_STYLE,
+    DURUM_CUBUGU_LABEL_STYLE,
+    GOREV_LABEL_STYLE,
+    KOORDINAT_TEXT_STYLE,
+    ANOMALI_LABEL_STYLE,
+    BUTTON_STYLE,
+    ACIL_BUTTON_STYLE,
+    RADIO_BUTTON_STYLE,
+    BASLIK_LABEL_STYLE,
+    GROUP_BOX_STYLE,
+    TERMINAL_TEXT_STYLE,
+    COMBO_BOX_STYLE,
+    DURUM_LABEL_STYLE,
+    BAGLANTI_LABEL_STYLE,
+    GOREV_DURUM_LABEL_STYLE,
+))
@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+DOLPA Underwater Technologies
+Telemetri Halka Tamponu
+
+Her kanal için önceden ayrılmış bir NumPy dizisi ve monoton zaman sütunu
+tutulur. Diziler kapasitenin iki katı uzunluğundadır ve her örnek iki kez
+yazılır (i ve i + kapasite); böylece son N örnek her zaman bellekte bitişik
+durur ve pencere sorguları kopyasız görünüm (view) döndürür.
+"""
+
+import threading
+import time
+
+import numpy as np
+
+# Varsayılan telemetri kanalları (protokoldeki alan adları)
+KANALLAR = ("zaman", "derinlik", "yon", "yunuslama", "yalpa",
+            "enlem", "boylam", "sarj", "sizinti", "kablo_sinyali")
+
+VARSAYILAN_KAPASITE = 131072  # 10 Hz'de ~3.6 saat
+
+
+class TelemetryBuffer:
+    """Sabit kapasiteli, sütunlu telemetri halka tamponu.
+
+    Ekleme O(1)'dir ve bellek kullanımı kapasiteyle sınırlıdır. Bir yazıcı
+    thread (ağ işçisi) ve okuyucular (GUI) aynı anda kullanabilir. Döndürülen
+    görünümler sonraki eklemelerle üzerine yazılabilir; saklanacaksa
+    kopyalanmalıdır.
+    """
+
+    def __init__(self, kanallar=KANALLAR, kapasite=VARSAYILAN_KAPASITE):
+        self.kanallar = tuple(kanallar)
+        self.kapasite = int(kapasite)
+        self._zamanlar = np.zeros(2 * self.kapasite, dtype=np.float64)
+        self._veri = {k: np.full(2 * self.kapasite, np.nan) for k in self.kanallar}
+        self._kilit = threading.Lock()
+        self._bas = 0        # sıradaki yazma konumu (0 <= bas < kapasite)
+        self._adet = 0       # tampondaki örnek sayısı (<= kapasite)
+        self.sayac = 0       # şimdiye kadar eklenen toplam örnek
+        self._temizlenen = 0  # son clear anındaki sayaç; öncesi okunmaz
+
+    def __len__(self):
+        return self._adet
+
+    def append(self, ornek, zaman=None):
+        """Bir örnek ekle; eksik kanallar NaN olarak yazılır.
+
+        Sayıya çevrilemeyen bir değer TypeError/ValueError verir ve tampona
+        hiçbir şey yazılmaz (satır yarım kalmaz).
+        """
+        if zaman is None:
+            zaman = time.monotonic()
+        degerler = []
+        for kanal in self._veri:
+            deger = ornek.get(kanal)
+            degerler.append(np.nan if deger is None else float(deger))
+        with self._kilit:
+            i = self._bas
+            j = i + self.kapasite
+            self._zamanlar[i] = self._zamanlar[j] = zaman
+            for dizi, deger in zip(self._veri.values(), degerler):
+                dizi[i] = dizi[j] = deger
+            self._bas = (i + 1) % self.kapasite
+            if self._adet < self.kapasite:
+                self._adet += 1
+            self.sayac += 1
+
+    def _son_dilim(self, n):
+        # Son n örneğin bitişik aralığı: [bitis - n, bitis)
+        bitis = self._bas + self.kapasite if self._adet == self.kapasite else self._bas
+        return slice(bitis - n, bitis)
+
+    def son(self):
+        """(sayaç, son örnek) döndür; NaN kanallar sözlüğe alınmaz."""
+        with self._kilit:
+            if not self._adet:
+                return self.sayac, {}
+            i = (self._bas - 1) % self.kapasite
+            ornek = {}
+            for kanal, dizi in self._veri.items():
+                deger = dizi[i]
+                if deger == deger:
+                    ornek[kanal] = deger.item()
+            return self.sayac, ornek
+
+    def last_n(self, kanal, n):
+        """Son n örneğin (zamanlar, değerler) görünümleri."""
+        with self._kilit:
+            dilim = self._son_dilim(min(int(n), self._adet))
+            return self._zamanlar[dilim], self._veri[kanal][dilim]
+
+    def last_seconds(self, kanal, saniye, simdi=None):
+        """Son `saniye` içindeki örneklerin (zamanlar, değerler) görünümleri."""
+        if simdi is None:
+            simdi = time.monotonic()
+        with self._kilit:
+            dilim = self._son_dilim(self._adet)
+            zamanlar = self._zamanlar[dilim]
+            bas = np.searchsorted(zamanlar, simdi - saniye, side="left")
+            return zamanlar[bas:], self._veri[kanal][dilim][bas:]
+
+    def since(self, sayac, *kanallar):
+        """`sayac` değerinden sonra eklenen örnekler: (yeni sayaç, [değer dizileri]).
+
+        Diziler kopyadır. Tampondan taşmış örnekler atlanır; tüm kanallar
+        aynı kilit altında okunduğu için aynı örnekleri kapsar.
+        """
+        with self._kilit:
+            n = min(self.sayac - max(sayac, self._temizlenen), self._adet)
+            if n <= 0:
+                return self.sayac, [self._veri[k][:0].copy() for k in kanallar]
+            dilim = self._son_dilim(n)
+            return self.sayac, [self._veri[k][dilim].copy() for k in kanallar]
+
+    def aggregate(self, kanal, saniye, simdi=None):
+        """Pencere üzerinde min/max/ortalama; pencere boşsa None."""
+        _, degerler = self.last_seconds(kanal, saniye, simdi)
+        if not len(degerler) or np.isnan(degerler).all():
+            return None
+        return {
+            "min": float(np.nanmin(degerler)),
+            "max": float(np.nanmax(degerler)),
+            "ortalama": float(np.nanmean(degerler)),
+            "adet": int(len(degerler)),
+        }
+
+    def clear(self):
+        """Tamponu boşalt. `sayac` sıfırlanmaz, artmaya devam eder; `since`
+        okuyucuları temizlemeden önceki örnekleri bir daha görmez."""
+        with self._kilit:
+            self._bas = 0
+            self._adet = 0
+            self._temizlenen = self.sayac
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""
+DOLPA Underwater Technologies
+Terminal Günlüğü
+
+Mesajlar biriktirilir ve saniyede birkaç kez tek seferde sınırlı satırlı bir
+QPlainTextEdit'e eklenir. Ekranda yalnızca son satırlar tutulur; tüm günlük
+bir kuyruk üzerinden arka plan thread'inde dönen bir dosyaya yazılır.
+"""
+
+from PyQt5 import QtCore, QtGui
+from collections import deque
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+
+# Seviyeler (logging ile aynı değerler)
+HATA_AYIKLAMA = logging.DEBUG
+BILGI = logging.INFO
+UYARI = logging.WARNING
+HATA = logging.ERROR
+
+SEVIYE_ADLARI = {
+    HATA_AYIKLAMA: "Ayrıntı",
+    BILGI: "Bilgi",
+    UYARI: "Uyarı",
+    HATA: "Hata",
+}
+
+DOSYA_BOYUTU = 5 * 1024 * 1024
+YEDEK_SAYISI = 5
+
+
+class TerminalLog(QtCore.QObject):
+    """Sınırlı, toplu güncellenen terminal görünümü ve dosyaya döken günlük.
+
+    `yaz` her thread'den çağrılabilir ve widget'a dokunmaz; birikenler GUI
+    thread'indeki zamanlayıcıyla boşaltılır.
+    """
+
+    def __init__(self, widget, satir_siniri=2000, log_dosyasi=None,
+                 aralik_ms=250, parent=None):
+        super().__init__(parent)
+        self.widget = widget
+        self.widget.setMaximumBlockCount(satir_siniri)
+        self.min_seviye = BILGI
+        self._son_kayitlar = deque(maxlen=satir_siniri)  # (seviye, mesaj)
+        self._bekleyen = []
+        self._kilit = threading.Lock()
+
+        # Dosyaya dökme: QueueHandler bloklamaz, yazma dinleyici thread'inde
+        self._logger = logging.Logger("dolpa.terminal", logging.DEBUG)
+        self._dinleyici = None
+        self._dosya = None
+        if log_dosyasi:
+            klasor = os.path.dirname(log_dosyasi)
+            if klasor:
+                os.makedirs(klasor, exist_ok=True)
+            self._dosya = logging.handlers.RotatingFileHandler(
+                log_dosyasi, maxBytes=DOSYA_BOYUTU, backupCount=YEDEK_SAYISI, encoding="utf-8")
+            self._dosya.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(message)s"))
+            kuyruk = queue.SimpleQueue()
+            self._logger.addHandler(logging.handlers.QueueHandler(kuyruk))
+            self._dinleyici = logging.handlers.QueueListener(kuyruk, self._dosya)
+            self._dinleyici.start()
+        else:
+            # logging'in son çare stderr çıktısına düşmesin
+            self._logger.addHandler(logging.NullHandler())
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.timeout.connect(self.bosalt)
+        self._timer.start(aralik_ms)
+
+    def yaz(self, mesaj, seviye=BILGI):
+        with self._kilit:
+            self._son_kayitlar.append((seviye, mesaj))
+            if seviye >= self.min_seviye:
+                self._bekleyen.append(mesaj)
+        self._logger.log(seviye, mesaj)
+
+    def bosalt(self):
+        with self._kilit:
+            satirlar, self._bekleyen = self._bekleyen, []
+        if satirlar:
+            self.widget.appendPlainText("\n".join(satirlar))
+
+    def seviye_ayarla(self, seviye):
+        """Gösterilen en düşük seviyeyi değiştir ve görünümü yeniden kur."""
+        with self._kilit:
+            self.min_seviye = seviye
+            satirlar = [m for s, m in self._son_kayitlar if s >= seviye]
+            self._bekleyen = []
+        self.widget.setPlainText("\n".join(satirlar))
+        self.widget.moveCursor(QtGui.QTextCursor.End)
+
+    def kapat(self):
+        self._timer.stop()
+        self.bosalt()
+        if self._dinleyici is not None:
+            self._dinleyici.stop()
+            self._dinleyici = None
+            self._dosya.close()
@@ -0,0 +1,6 @@
+# -*- coding: utf-8 -*-
+# Modüller uygulama klasöründe düz durur; testler oradan içe aktarır
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""anomaly: sentetik sıçrama ve kaymada tespit, bölüm kapanışı ve sıralama."""
+
+import numpy as np
+import pytest
+
+import anomaly
+
+N = 2000
+
+
+def _gurultu(n=N, tohum=0, std=0.1):
+    return np.random.default_rng(tohum).normal(0.0, std, n)
+
+
+def _besle(dedektor, kanal, degerler):
+    """Örnekleri tek tek besle; sıralamanın değiştiği sıra numaralarını döndür."""
+    degisen = []
+    for i in range(len(degerler)):
+        t = np.array([float(i)])
+        if dedektor.besle({kanal: degerler[i:i + 1]}, t, t + 40.0, t + 29.0):
+            degisen.append(i)
+    return degisen
+
+
+def test_isinmada_olay_yok():
+    d = anomaly.ChannelDetector()
+    x = _gurultu()
+    x[50] += 5.0
+    puanlar = [d.guncelle(v)[0] for v in x[:anomaly.ISINMA]]
+    assert puanlar == [0.0] * anomaly.ISINMA
+
+
+def test_yavas_egilim_anomali_degil():
+    # Sabit hızla dalış: fark sabit, yalnızca gürültü kalır
+    d = anomaly.ChannelDetector()
+    x = np.arange(N) * 0.05 + _gurultu()
+    assert max(d.guncelle(v)[0] for v in x) == 0.0
+
+
+def test_sicrama_z_skoru_ile_yakalanir():
+    d = anomaly.ChannelDetector()
+    x = _gurultu()
+    x[1000:] += 3.0  # basamak: farkta tek sıçrama
+    sonuc = [d.guncelle(v) for v in x]
+    puanlar = np.array([p for p, _ in sonuc])
+    assert np.flatnonzero(puanlar).tolist() == [1000]
+    assert sonuc[1000][1] > anomaly.Z_ESIGI
+    # Kırpılarak öğrenildiği için istatistik sıçramadan sonra bozulmaz
+    assert puanlar[1001:].max() == 0.0
+
+
+def test_kayma_cusum_ile_yakalanir():
+    # Farkın ortalaması iki standart sapma kayar; tek örnekte z eşiği aşılmaz
+    d = anomaly.ChannelDetector()
+    x = np.cumsum(_gurultu())  # farkı gürültü olan rastgele yürüyüş
+    x[1000:] += np.arange(N - 1000) * 0.2
+    sonuc = [d.guncelle(v) for v in x]
+    assert max(p for p, _ in sonuc[:1000]) == 0.0
+    ilk = next(i for i, (p, _) in enumerate(sonuc) if p > 0.0)
+    assert 1000 < ilk < 1100
+    assert all(abs(z) < anomaly.Z_ESIGI for _, z in sonuc[1000:ilk + 1])
+    assert sonuc[ilk][0] == pytest.approx(anomaly.Z_ESIGI, rel=0.5)
+
+
+def test_bolum_sakin_orneklerden_sonra_kapanir():
+    d = anomaly.AnomalyDetector(kanallar=("derinlik",))
+    x = _gurultu()
+    x[1000] += 5.0  # tek örneklik sivri: farkta önce artı sonra eksi sıçrama
+    degisen = _besle(d, "derinlik", x)
+    assert degisen == [1001 + anomaly.SAKIN]
+    olay, = d.en_yuksek()
+    assert olay["kanal"] == "derinlik"
+    assert olay["zaman"] in (1000.0, 1001.0)
+    assert olay["enlem"] == olay["zaman"] + 40.0 and olay["boylam"] == olay["zaman"] + 29.0
+    assert d.olay == 1 and d.ornek == N
+
+
+def test_en_yuksek_dort_olay_puana_gore_sirali():
+    d = anomaly.AnomalyDetector(kanallar=("yalpa",))
+    x = _gurultu()
+    buyuklukler = [3.0, 7.0, 2.0, 6.0, 4.0, 5.0, 1.0]
+    for j, b in enumerate(buyuklukler):
+        x[300 + 250 * j:] += b  # aralıklı basamaklar
+    degisen = _besle(d, "yalpa", x)
+    assert d.olay == len(buyuklukler)
+    # İlk dört olay ve en küçüğü geçenler listeyi değiştirir; 1.0 giremez
+    assert len(degisen) == 6
+    olaylar = d.en_yuksek()
+    assert len(olaylar) == anomaly.EN_YUKSEK
+    assert [o["zaman"] for o in olaylar] == [550.0, 1050.0, 1550.0, 1300.0]
+    puanlar = [o["puan"] for o in olaylar]
+    assert puanlar == sorted(puanlar, reverse=True)
+
+
+def test_nan_atlanir_ve_sifirla():
+    d = anomaly.AnomalyDetector(kanallar=("derinlik", "yalpa"))
+    x = _gurultu()
+    x[::7] = np.nan
+    x[1000] += 5.0
+    t = np.arange(N, dtype=float)
+    assert d.besle({"derinlik": x}, t, t, t)  # eksik kanal atlanır
+    assert len(d.en_yuksek()) == 1
+    d.sifirla()
+    assert d.en_yuksek() == [] and d.olay == 0 and d.ornek == 0
@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""CommandQueue: öncelik, pencere, aynı sıra numarasıyla yeniden deneme, boşaltma."""
+
+import pytest
+
+import commands
+
+
+class SahteOturum:
+    """`istek` çağrılarını geri çağrılarıyla birlikte saklar; yanıtı test verir."""
+
+    def __init__(self):
+        self.bagli = True
+        self.istekler = []  # (veri, geri_cagir, zaman_asimi)
+
+    def bagli_mi(self):
+        return self.bagli
+
+    def istek(self, veri, geri_cagir, zaman_asimi):
+        self.istekler.append((veri, geri_cagir, zaman_asimi))
+
+    def gonderilenler(self):
+        return [veri["sira"] for veri, _, _ in self.istekler]
+
+    def yanitla(self, sira, yanit=None, hata=None):
+        # Aynı sıra birden çok gönderildiyse sonuncusu yanıtlanır
+        for veri, geri_cagir, _ in reversed(self.istekler):
+            if veri["sira"] == sira:
+                if hata is not None:
+                    geri_cagir(None, hata)
+                else:
+                    geri_cagir(yanit or {"durum": "tamam"}, None)
+                return
+        raise AssertionError(f"{sira} gönderilmedi")
+
+
+@pytest.fixture
+def oturum():
+    return SahteOturum()
+
+
+@pytest.fixture
+def olaylar():
+    return []
+
+
+def _kuyruk(oturum, olaylar, **ayar):
+    return commands.CommandQueue(
+        oturum, lambda komut, durum, ayrinti: olaylar.append((komut.sira, durum)), **ayar)
+
+
+def test_pencere_dolunca_kuyrukta_bekler(oturum, olaylar):
+    kuyruk = _kuyruk(oturum, olaylar, pencere=2)
+    for i in range(4):
+        kuyruk.ekle("k", {"komut": "k", "i": i})
+    assert oturum.gonderilenler() == [1, 2]
+    assert kuyruk.ucusta == 2 and len(kuyruk) == 2
+    assert (3, commands.KUYRUKTA) in olaylar and (4, commands.KUYRUKTA) in olaylar
+
+    oturum.yanitla(1)
+    assert oturum.gonderilenler() == [1, 2, 3]
+    assert (1, commands.ONAYLANDI) in olaylar
+    assert kuyruk.ucusta == 2 and len(kuyruk) == 1
+
+
+def test_acil_toplu_yuklemenin_onune_gecer(oturum, olaylar):
+    kuyruk = _kuyruk(oturum, olaylar, pencere=1)
+    for _ in range(3):
+        kuyruk.ekle("gorev", {"komut": "gorev"}, commands.TOPLU)
+    normal = kuyruk.ekle("kalibrasyon", {"komut": "kalibrasyon"}, commands.NORMAL)
+    assert oturum.gonderilenler() == [1]
+
+    # Pencere doluyken de beklemeden gider
+    acil = kuyruk.ekle("acil", {"komut": "acil_cikis"}, commands.ACIL)
+    assert oturum.gonderilenler() == [1, acil.sira]
+    assert (acil.sira, commands.KUYRUKTA) not in olaylar
+
+    # Pencere açılınca NORMAL, kendinden önce gelen TOPLU'lardan önce gider
+    oturum.yanitla(1)
+    oturum.yanitla(acil.sira)
+    assert oturum.gonderilenler()[2] == normal.sira
+    oturum.yanitla(normal.sira)
+    oturum.yanitla(2)
+    assert oturum.gonderilenler() == [1, acil.sira, normal.sira, 2, 3]
+
+
+def test_zaman_asiminda_ayni_sira_ile_yeniden_gonderilir(oturum, olaylar):
+    kuyruk = _kuyruk(oturum, olaylar, deneme=3, zaman_asimi=0.5)
+    komut = kuyruk.ekle("k", {"komut": "k"})
+    oturum.yanitla(komut.sira, hata="zaman aşımı")
+    oturum.yanitla(komut.sira, hata="zaman aşımı")
+    assert oturum.gonderilenler() == [komut.sira] * 3
+    assert all(zaman_asimi == 0.5 for _, _, zaman_asimi in oturum.istekler)
+    assert [d for s, d in olaylar] == [commands.GONDERILDI, commands.YENIDEN, commands.YENIDEN]
+    assert kuyruk.yeniden_gonderilen == 2
+
+    # Deneme hakkı bitince başarısız; tekrar gönderilmez
+    oturum.yanitla(komut.sira, hata="zaman aşımı")
+    assert olaylar[-1] == (komut.sira, commands.BASARISIZ)
+    assert len(oturum.istekler) == 3 and kuyruk.ucusta == 0
+
+
+def test_reddedilen_komut_yeniden_gonderilmez(oturum, olaylar):
+    kuyruk = _kuyruk(oturum, olaylar)
+    komut = kuyruk.ekle("k", {"komut": "k"})
+    oturum.yanitla(komut.sira, {"durum": "hata", "hata": "bilinmeyen komut"})
+    assert olaylar[-1] == (komut.sira, commands.REDDEDILDI)
+    assert len(oturum.istekler) == 1
+
+
+def test_baglanti_kopunca_kuyruk_bosalir_ve_yeniden_gonderilmez(oturum, olaylar):
+    kuyruk = _kuyruk(oturum, olaylar, pencere=1)
+    ilk = kuyruk.ekle("k", {"komut": "k"})
+    bekleyenler = [kuyruk.ekle("gorev", {"komut": "gorev"}, commands.TOPLU),
+                   kuyruk.ekle("k", {"komut": "k"})]
+
+    oturum.bagli = False
+    kuyruk.bosalt("bağlantı koptu")
+    # Öncelik sırasıyla bildirilir: NORMAL, sonra TOPLU
+    assert olaylar[-2:] == [(bekleyenler[1].sira, commands.BAGLI_DEGIL),
+                            (bekleyenler[0].sira, commands.BAGLI_DEGIL)]
+    assert len(kuyruk) == 0
+
+    # Onay bekleyeni oturum iptal eder; bağlantı yokken kuyruk pompalanmaz
+    oturum.yanitla(ilk.sira, hata="bağlantı koptu")
+    assert olaylar[-1] == (ilk.sira, commands.BASARISIZ)
+    assert oturum.gonderilenler() == [ilk.sira]
+    assert kuyruk.basarisiz == 3
+
+    sonra = kuyruk.ekle("k", {"komut": "k"})
+    assert olaylar[-1] == (sonra.sira, commands.BAGLI_DEGIL)
+    assert oturum.gonderilenler() == [ilk.sira]
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+"""geodesy: skaler haversine ile uyum ve gidiş-dönüş tutarlılığı."""
+
+import math
+
+import numpy as np
+import pytest
+
+import geodesy
+
+N = 20000
+
+
+def _haversine_skaler(lat1, lon1, lat2, lon2):
+    # Ui_MainWindow.haversine'in geodesy modülünden önceki hâli
+    R = 6371000
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    dphi = math.radians(lat2 - lat1)
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi/2)**2 + math.cos(phi1)*math.cos(phi2)*math.sin(dlambda/2)**2
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return R * c
+
+
+@pytest.fixture
+def noktalar():
+    rng = np.random.default_rng(0)
+    return rng, rng.uniform(-80, 80, N), rng.uniform(-180, 180, N)
+
+
+def test_mesafe_skaler_haversine_ile_ayni(noktalar):
+    rng, e1, b1 = noktalar
+    e2, b2 = rng.uniform(-80, 80, N), rng.uniform(-180, 180, N)
+    skaler = np.array([_haversine_skaler(*n) for n in zip(e1.tolist(), b1.tolist(),
+                                                           e2.tolist(), b2.tolist())])
+    assert np.max(np.abs(geodesy.mesafe(e1, b1, e2, b2) - skaler)) < 1e-6
+    assert geodesy.mesafe(41.0, 29.0, 40.0, 28.0) == pytest.approx(
+        _haversine_skaler(41.0, 29.0, 40.0, 28.0), abs=1e-6)
+
+
+def test_hedef_mesafe_yon_gidis_donus(noktalar):
+    rng, e1, b1 = noktalar
+    yonler, uzakliklar = rng.uniform(0, 360, N), rng.uniform(1, 20000, N)
+    e2, b2 = geodesy.hedef(e1, b1, yonler, uzakliklar)
+    assert np.max(np.abs(geodesy.mesafe(e1, b1, e2, b2) - uzakliklar)) < 1e-6
+    fark = (geodesy.yon(e1, b1, e2, b2) - yonler + 180.0) % 360.0 - 180.0
+    assert np.max(np.abs(fark)) < 1e-6
+
+
+def test_enu_gidis_donus(noktalar):
+    rng, e1, b1 = noktalar
+    e2, b2 = geodesy.hedef(e1, b1, rng.uniform(0, 360, N), rng.uniform(1, 20000, N))
+    dogu, kuzey, yukari = geodesy.enu(e2, b2, e1, b1)
+    e3, b3, yukseklik = geodesy.enu_ters(dogu, kuzey, e1, b1, yukari)
+    assert np.max(geodesy.mesafe(e2, b2, e3, b3)) < 1e-3
+    assert np.max(np.abs(yukseklik)) < 1e-3
+
+
+def test_capraz_ve_boyuna_mesafe_isaretleri():
+    # Ekvator üzerinde doğuya giden hat: kuzeydeki nokta solda (negatif)
+    kuzeyde = geodesy.capraz_mesafe(0.001, 0.5, 0.0, 0.0, 0.0, 1.0)
+    guneyde = geodesy.capraz_mesafe(-0.001, 0.5, 0.0, 0.0, 0.0, 1.0)
+    assert kuzeyde == pytest.approx(-geodesy.DUNYA_YARICAPI * math.radians(0.001), abs=1e-3)
+    assert guneyde == pytest.approx(-kuzeyde, abs=1e-6)
+    ileride = geodesy.boyuna_mesafe(0.001, 0.5, 0.0, 0.0, 0.0, 1.0)
+    geride = geodesy.boyuna_mesafe(0.001, -0.5, 0.0, 0.0, 0.0, 1.0)
+    assert ileride == pytest.approx(geodesy.DUNYA_YARICAPI * math.radians(0.5), abs=1e-2)
+    assert geride == pytest.approx(-ileride, abs=1e-2)
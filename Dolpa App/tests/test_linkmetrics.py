@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""Bağlantı kalitesi ve RTT yoklamasının gereksiz trafiği atlaması."""
+
+import math
+
+import pytest
+from PyQt5 import QtCore
+
+import linkmetrics
+import network
+
+
+def _izleyici_durumu(rtt_ms=(), zaman_asimi=0):
+    olcum = linkmetrics.LinkMetrics()
+    izleyici = linkmetrics.LinkMonitor({"arac": olcum})
+    izleyici.guncelle(0.0)
+    for ms in rtt_ms:
+        olcum.rtt_ekle(ms)
+    olcum.zaman_asimi += zaman_asimi
+    return izleyici.guncelle(1.0)["arac"]
+
+
+def test_rtt_olcumu_yoksa_kalite_iyi_degil():
+    durum = _izleyici_durumu()
+    assert durum["rtt_ornek"] == 0 and math.isnan(durum["rtt_p95_ms"])
+    assert durum["kalite"] == linkmetrics.KALITE_BILINMIYOR
+
+
+def test_rtt_olcumu_yok_zaman_asimi_var_kotu():
+    assert _izleyici_durumu(zaman_asimi=2)["kalite"] == linkmetrics.KALITE_KOTU
+
+
+@pytest.mark.parametrize("rtt_ms, kalite", [
+    ((20.0,) * 10, linkmetrics.KALITE_IYI),
+    ((400.0,) * 10, linkmetrics.KALITE_ZAYIF),
+    ((3000.0,) * 10, linkmetrics.KALITE_KOTU),
+])
+def test_kalite_p95_rtt_ile(rtt_ms, kalite):
+    assert _izleyici_durumu(rtt_ms)["kalite"] == kalite
+
+
+class SahteOturum(network.VehicleSession):
+    """Soketsiz oturum; istekleri geri çağrılarıyla birlikte saklar."""
+
+    def __init__(self):
+        super().__init__(None, None)
+        self._bagli = True
+        self.istekler = []
+
+    def istek(self, veri, geri_cagir, zaman_asimi=2.0):
+        self.istekler.append((veri, geri_cagir))
+        return len(self.istekler)
+
+    def yanitla(self, rtt_ms=5.0):
+        veri, geri_cagir = self.istekler[-1]
+        self.olcum.rtt_ekle(rtt_ms)
+        geri_cagir({"sarj": 80}, None)
+
+
+@pytest.fixture
+def isci():
+    QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    return network.NetworkWorker(None, None, oturum=SahteOturum())
+
+
+def test_yoklama_yalnizca_baska_rtt_olculmediyse(isci):
+    oturum = isci.oturum
+    isci._olc()
+    assert len(oturum.istekler) == 1
+    isci._olc()                 # önceki yoklama hâlâ bekliyor
+    assert len(oturum.istekler) == 1
+    oturum.yanitla()
+    isci._olc()                 # yoklamanın kendi ölçümü sonrakini engellemez
+    assert len(oturum.istekler) == 2
+    oturum.yanitla()
+    oturum.olcum.rtt_ekle(3.0)  # aradaki bir komut onayı RTT ölçtü
+    isci._olc()
+    assert len(oturum.istekler) == 2
+    isci._olc()
+    assert len(oturum.istekler) == 3
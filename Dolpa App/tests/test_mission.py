@@ -0,0 +1,105 @@
+# -*- coding: utf-8 -*-
+"""mission: tarama desenleri, ikili paketleme ve derinlik kırpma."""
+
+import base64
+
+import numpy as np
+import pytest
+
+import geodesy
+import mission
+
+MERKEZ = (41.0, 29.0)
+
+
+def _kare(kenar=1000.0):
+    # Merkez etrafında kenarları doğu-batı / kuzey-güney olan kare (ENU'dan)
+    h = kenar / 2
+    x = np.array([-h, h, h, -h])
+    y = np.array([-h, -h, h, h])
+    enlemler, boylamlar, _ = geodesy.enu_ters(x, y, *MERKEZ)
+    return np.column_stack([enlemler, boylamlar])
+
+
+def _yerel(gorev):
+    x, y, _ = geodesy.enu(gorev.enlemler, gorev.boylamlar, *MERKEZ)
+    return np.asarray(x), np.asarray(y)
+
+
+def test_serit_bacak_sayisi_ve_aralik():
+    gorev = mission.serit_tarama(_kare(), 20.0, aci=90.0)  # şeritler doğu-batı
+    x, y = _yerel(gorev)
+    # -490, -470, ..., 490: 50 şerit, şerit başına iki uç
+    assert len(gorev) == 100 and gorev.bacak_sayisi == 99
+    seritler = y[0::2]
+    assert np.allclose(np.diff(seritler), 20.0, atol=0.05)
+    assert np.allclose(y[0::2], y[1::2], atol=0.05)
+    assert np.allclose(np.abs(x), 500.0, atol=0.05)
+    # Yön her şeritte değişir (çim biçme)
+    yonler = np.sign(x[1::2] - x[0::2])
+    assert np.all(yonler[:-1] == -yonler[1:])
+    # Uzunluk: 50 şerit x 1000 m + 49 geçiş x 20 m (uzunluk küresel, ENU elipsoidal)
+    assert gorev.uzunluk() == pytest.approx(50 * 1000 + 49 * 20, rel=5e-3)
+    assert gorev.sure() == pytest.approx(gorev.uzunluk() / mission.VARSAYILAN_HIZ)
+
+
+def test_serit_aci_verilmezse_en_uzun_kenar():
+    dikdortgen = _kare()
+    dikdortgen[:, 1] = MERKEZ[1] + (dikdortgen[:, 1] - MERKEZ[1]) * 3  # doğu-batı 3 km
+    gorev = mission.serit_tarama(dikdortgen, 50.0)
+    _, y = _yerel(gorev)
+    assert np.allclose(y[0::2], y[1::2], atol=0.1)  # şeritler uzun kenar boyunca
+
+
+def test_spiral_merkezden_disa_ic_daire_icinde():
+    gorev = mission.spiral_tarama(_kare(), 20.0)
+    x, y = _yerel(gorev)
+    r = np.hypot(x, y)
+    assert r[0] == pytest.approx(0.0, abs=0.05)  # merkez: köşelerin enlem/boylam ortalaması
+    assert np.all(np.diff(r) > 0)
+    assert r[-1] == pytest.approx(500.0, abs=0.05)
+    # Kollar arası mesafe: bir tur (2π) sonra yarıçap `aralik` kadar artar
+    teta = np.unwrap(np.arctan2(y[1:], x[1:]))
+    tur = np.interp(teta[-1] - 2 * np.pi, teta, r[1:])
+    assert r[-1] - tur == pytest.approx(20.0, abs=0.1)
+
+
+@pytest.mark.parametrize("desen", [mission.serit_tarama, mission.spiral_tarama])
+def test_gecersiz_desen_girdileri(desen):
+    with pytest.raises(ValueError):
+        desen(_kare(), 0.0)
+    with pytest.raises(ValueError):
+        desen(_kare()[:2], 20.0)
+
+
+def test_araliktan_dar_poligon():
+    # Şerit ortadan tek geçişe iner; spiral çizilemez
+    gorev = mission.serit_tarama(_kare(10.0), 50.0, aci=90.0)
+    assert gorev.bacak_sayisi == 1
+    with pytest.raises(ValueError):
+        mission.spiral_tarama(_kare(10.0), 50.0)
+
+
+def test_paketle_coz_gidis_donus():
+    gorev = mission.serit_tarama(_kare(), 20.0, derinlik=12.3456, hiz=1.5)
+    veri = gorev.paketle()
+    assert len(veri) == len(gorev) * mission.NOKTA.itemsize
+    geri = mission.Mission.coz(veri)
+    assert np.max(np.abs(geri.enlemler - gorev.enlemler)) <= 0.5e-7
+    assert np.max(np.abs(geri.boylamlar - gorev.boylamlar)) <= 0.5e-7
+    assert np.allclose(geri.derinlikler, 12.35) and np.allclose(geri.hizlar, 1.5)
+
+
+def test_derinlik_655_metrede_kirpilir():
+    gorev = mission.Mission([41.0, 41.001], [29.0, 29.001], derinlik=[700.0, -3.0])
+    geri = mission.Mission.coz(gorev.paketle())
+    assert geri.derinlikler.tolist() == [655.35, 0.0]
+
+
+def test_mesaj_alanlari():
+    gorev = mission.Mission([41.0, 41.001, 41.002], [29.0, 29.001, 29.002])
+    mesaj = gorev.mesaj()
+    assert mesaj["gorev"] == "dalis" and mesaj["bicim"] == mission.BICIM
+    assert mesaj["nokta_sayisi"] == 3
+    assert mesaj["baslangic"] == [41.0, 29.0] and mesaj["bitis"] == [41.002, 29.002]
+    assert base64.b64decode(mesaj["noktalar"]) == gorev.paketle()
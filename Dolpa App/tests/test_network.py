@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""NetworkWorker.son_telemetri: sürüm bağlantı sayacıyla ve geçerlilikle tutarlı."""
+
+import pytest
+from PyQt5 import QtCore
+
+import network
+
+
+class SahteOturum(network.VehicleSession):
+    """Soketsiz oturum; istekler yanıtsız kalır."""
+
+    def __init__(self):
+        super().__init__(None, None)
+        self._bagli = True
+
+    def istek(self, veri, geri_cagir, zaman_asimi=2.0):
+        return None
+
+
+@pytest.fixture
+def isci():
+    QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+    return network.NetworkWorker(None, None, oturum=SahteOturum(), olcum_araligi=0)
+
+
+def test_kopunca_son_degerler_bosalir_surum_degisir(isci):
+    assert isci.son_telemetri() == (0, {})
+    isci._mesaj_geldi({"tip": "telemetri", "derinlik": 3.0})
+    surum, son = isci.son_telemetri()
+    assert surum[0] == 0 and son["derinlik"] == 3.0
+
+    isci.oturum._bagli = False
+    isci._oturum_durumu_degisti(False)
+    assert isci.son_telemetri() == (1, {})
+
+    # Yeniden bağlanınca yeni sayaçla, yeni örnekten sonra geçerli
+    isci.oturum._bagli = True
+    isci._oturum_durumu_degisti(True)
+    assert isci.son_telemetri() == (1, {})
+    isci._mesaj_geldi({"tip": "telemetri", "derinlik": 4.0})
+    surum2, son = isci.son_telemetri()
+    assert surum2[0] == 1 and surum2 != surum and son["derinlik"] == 4.0
+
+
+def test_hatali_ornek_gecerlilik_acmaz(isci):
+    isci._mesaj_geldi({"tip": "telemetri", "derinlik": "x"})
+    assert isci.son_telemetri() == (0, {})
+    assert isci.olcum.cozme_hatasi == 1
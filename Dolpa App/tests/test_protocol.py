@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""FrameDecoder: parçalı ve birleşik akış, boyut sınırı, bozuk yük."""
+
+import pytest
+
+import protocol
+
+TELEMETRI = {
+    "zaman": 1712345678.125, "derinlik": 12.5, "yon": 271.5, "yunuslama": -1.25,
+    "yalpa": 0.75, "enlem": 40.987654, "boylam": 29.123456, "sarj": 87, "sizinti": False,
+}
+
+
+def _mesajlar(n):
+    return [{"tip": "durum", "seq": i, "not": "ğüşiöç"} for i in range(n)]
+
+
+def test_bayt_bayt_besleme():
+    mesajlar = _mesajlar(3)
+    akis = b"".join(protocol.encode_message(m) for m in mesajlar)
+    cozucu = protocol.FrameDecoder()
+    cozulen = []
+    for i in range(len(akis)):
+        cozulen += cozucu.feed(akis[i:i + 1])
+    assert cozulen == mesajlar
+    assert cozucu.bekleyen_bayt() == 0
+
+
+def test_tek_okumada_birden_cok_cerceve():
+    mesajlar = _mesajlar(50)
+    akis = b"".join(protocol.encode_message(m) for m in mesajlar)
+    cozucu = protocol.FrameDecoder()
+    # Son çerçevenin yarısı bir sonraki okumaya kalır
+    kesim = len(akis) - 5
+    assert cozucu.feed(akis[:kesim]) == mesajlar[:-1]
+    assert cozucu.bekleyen_bayt() > 0
+    assert cozucu.feed(akis[kesim:]) == mesajlar[-1:]
+    assert cozucu.bekleyen_bayt() == 0
+
+
+def _ham_cerceve(boyut):
+    # Geçerli JSON yük: boşlukla doldurulmuş bir dizi
+    yuk = b"[" + b" " * (boyut - 2) + b"]"
+    return protocol.BASLIK.pack(len(yuk)) + yuk
+
+
+def test_sinirdaki_cerceve_kabul_edilir():
+    cozucu = protocol.FrameDecoder(maks_cerceve=1024)
+    assert cozucu.feed(_ham_cerceve(1024)) == [[]]
+
+
+def test_siniri_asan_cerceve_protocol_error():
+    cozucu = protocol.FrameDecoder(maks_cerceve=1024)
+    with pytest.raises(protocol.ProtocolError):
+        # Yalnızca başlık yeter; yük beklenmeden reddedilir
+        cozucu.feed(protocol.BASLIK.pack(1025))
+    assert cozucu.bekleyen_bayt() == 0
+
+
+def test_varsayilan_sinir_maks_cerceve():
+    cozucu = protocol.FrameDecoder()
+    assert cozucu.feed(_ham_cerceve(protocol.MAKS_CERCEVE)) == [[]]
+    with pytest.raises(protocol.ProtocolError):
+        cozucu.feed(protocol.BASLIK.pack(protocol.MAKS_CERCEVE + 1))
+
+
+def test_bozuk_json_yalnizca_kendi_cercevesini_atlar():
+    bozuk = b'{"tip": "telem'
+    akis = (protocol.encode_message({"seq": 1})
+            + protocol.BASLIK.pack(len(bozuk)) + bozuk
+            + protocol.encode_message({"seq": 2}))
+    cozucu = protocol.FrameDecoder()
+    assert cozucu.feed(akis) == [{"seq": 1}, {"seq": 2}]
+    assert cozucu.hatali_cerceve == 1
+
+
+def test_json_gidis_donus():
+    mesaj = {"tip": "gorev", "noktalar": [[40.1, 29.2], [40.3, 29.4]], "ad": "Şerit"}
+    assert protocol.FrameDecoder().feed(protocol.encode_message(mesaj)) == [mesaj]
+
+
+def test_ikili_telemetri_gidis_donus():
+    cozulen = protocol.FrameDecoder().feed(protocol.encode_telemetry(TELEMETRI))
+    assert len(cozulen) == 1
+    t = cozulen[0]
+    assert t["tip"] == "telemetri"
+    for alan in ("zaman", "enlem", "boylam", "sarj", "sizinti"):
+        assert t[alan] == TELEMETRI[alan]
+    for alan in ("derinlik", "yon", "yunuslama", "yalpa"):  # float32
+        assert t[alan] == pytest.approx(TELEMETRI[alan], rel=1e-6)
+
+
+def test_yuk_dinleyici_ham_yuku_alir():
+    alinan = []
+    cozucu = protocol.FrameDecoder(yuk_dinleyici=alinan.append)
+    cerceve = protocol.encode_message({"seq": 7})
+    cozucu.feed(cerceve)
+    assert alinan == [cerceve[protocol.BASLIK_BOYUTU:]]
@@ -0,0 +1,68 @@
+# -*- coding: utf-8 -*-
+"""DiveRecorder/DiveRecording: monoton kayıt zamanı, duvar saati çapası, hata bildirimi."""
+
+import time
+
+import pytest
+
+import recorder
+
+
+def test_zamanlar_monoton_ofset_duvar_saati_baslikta(tmp_path):
+    yol = str(tmp_path / "dalis.dkyt")
+    once = time.time()
+    kaydedici = recorder.DiveRecorder(yol)
+    kaydedici.baslat()
+    kaydedici.kaydet(recorder.GELEN, b"a")
+    for i in range(1, 50):
+        kaydedici.kaydet(recorder.GELEN, b"x%d" % i, i * 0.1)
+    kaydedici.durdur()
+
+    kayit = recorder.DiveRecording(yol)
+    kayitlar = list(kayit.records())
+    assert len(kayitlar) == 50
+    assert 0.0 <= kayitlar[0][0] < 1.0
+    assert once <= kayit.duvar_baslangici <= time.time()
+    assert kayit.duvar_zamani(4.9) == kayit.duvar_baslangici + 4.9
+    # Dizinden atlama kayıt zamanıyla çalışır
+    assert [z for z, _, _ in kayit.records(2.0)][0] == 2.0
+    assert kayit.bitis_zamani() == 4.9
+    kayit.close()
+
+
+def test_surum_1_dosyasi_okunur(tmp_path):
+    yol = tmp_path / "eski.dkyt"
+    kayitlar = b"".join(recorder.KAYIT_BASLIGI.pack(1.7e9 + i, recorder.GELEN, 1) + b"k"
+                        for i in range(3))
+    baslik = recorder.DOSYA_BASLIGI_V1.pack(recorder.SIHIR, 1, recorder.DOSYA_BASLIGI_V1.size + len(kayitlar))
+    yol.write_bytes(baslik + kayitlar)
+
+    kayit = recorder.DiveRecording(str(yol))
+    assert kayit.baslangic_zamani() == 1.7e9
+    assert kayit.duvar_zamani(kayit.baslangic_zamani()) == 1.7e9
+    assert [z for z, _, _ in kayit.records(1.7e9 + 1)] == [1.7e9 + 1, 1.7e9 + 2]
+    kayit.close()
+
+
+@pytest.mark.parametrize("icerik", [b"", b"garbage\n", b"NOTDOLPA" + bytes(40)])
+def test_kayit_olmayan_dosya_valueerror(tmp_path, icerik):
+    yol = tmp_path / "bozuk.dkyt"
+    yol.write_bytes(icerik)
+    with pytest.raises(ValueError):
+        recorder.DiveRecording(str(yol))
+
+
+def test_yazma_hatasi_bildirilir(tmp_path, monkeypatch):
+    bildirilen = []
+    kaydedici = recorder.DiveRecorder(str(tmp_path / "dalis.dkyt"), bildirilen.append)
+
+    def yazamaz(parti):
+        raise OSError(28, "No space left on device")
+
+    monkeypatch.setattr(kaydedici, "_partiyi_yaz", yazamaz)
+    kaydedici.baslat()
+    kaydedici.kaydet(recorder.GELEN, b"a")
+    kaydedici.durdur()
+    assert len(bildirilen) == 1
+    assert "kayıt durduruldu" in bildirilen[0]
+    kaydedici.kaydet(recorder.GELEN, b"b")  # durduktan sonra sessizce yok sayılır
@@ -0,0 +1,62 @@
+# -*- coding: utf-8 -*-
+"""ReplaySession: açılamayan kayıt ve oynatma sırasında ileri/geri sarma."""
+
+import pytest
+from PyQt5 import QtCore
+
+import protocol
+import recorder
+import replay
+
+
+@pytest.fixture(scope="module")
+def uygulama():
+    return QtCore.QCoreApplication.instance() or QtCore.QCoreApplication([])
+
+
+def _kayit(yol, n=50, hiz=10.0):
+    kaydedici = recorder.DiveRecorder(yol)
+    kaydedici.baslat()
+    for i in range(n):
+        cerceve = protocol.encode_message({"tip": "telemetri", "derinlik": float(i)})
+        kaydedici.kaydet(recorder.GELEN, cerceve[protocol.BASLIK_BOYUTU:], i / hiz)
+    kaydedici.durdur()
+
+
+def _sonuna_kadar(oturum):
+    while oturum._adim_timer.isActive():
+        oturum._adim()
+
+
+def test_acilamayan_kayit_hata_ile_biter(uygulama, tmp_path):
+    oturum = replay.ReplaySession(str(tmp_path / "yok.dkyt"), hiz=None)
+    sonuclar = []
+    oturum.oynatma_bitti.connect(sonuclar.append)
+    oturum.baslat()
+    assert len(sonuclar) == 1 and "hata" in sonuclar[0]
+    assert not oturum.bagli_mi()
+
+
+def test_geri_sarma_bitmis_oynatmayi_surdurur(uygulama, tmp_path):
+    yol = str(tmp_path / "dalis.dkyt")
+    _kayit(yol)
+    oturum = replay.ReplaySession(yol, hiz=None)
+    derinlikler = []
+    oturum.mesaj_alindi.connect(lambda m: derinlikler.append(m["derinlik"]))
+    oturum.baslat()
+    _sonuna_kadar(oturum)
+    assert derinlikler == [float(i) for i in range(50)]
+    assert not oturum.bagli_mi()
+
+    del derinlikler[:]
+    oturum.atla(-1.05)  # son kayıt 4.9 s'de: 3.85 s'ye döner
+    assert oturum.bagli_mi()
+    _sonuna_kadar(oturum)
+    assert derinlikler == [float(i) for i in range(39, 50)]
+
+    del derinlikler[:]
+    oturum.konuma_git(0.0)
+    oturum.atla(4.5)
+    _sonuna_kadar(oturum)
+    assert derinlikler[0] == 45.0
+    oturum.kapat()
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""Simülatör: geçersiz telemetri hızı akışı öldürmeden reddedilir."""
+
+import argparse
+import socket
+
+import pytest
+
+import protocol
+import simulator
+
+
+def _mesajlar(soket, cozucu, adet):
+    alinan = []
+    while len(alinan) < adet:
+        veri = soket.recv(65536)
+        assert veri, "simülatör bağlantıyı kapattı"
+        alinan.extend(cozucu.feed(veri))
+    return alinan
+
+
+def test_gecersiz_abonelik_hizi_reddedilir_akis_surer():
+    with simulator.VehicleSimulator() as sim, \
+            socket.create_connection((sim.host, sim.port), timeout=5) as soket:
+        cozucu = protocol.FrameDecoder()
+        for istek_id, hiz in enumerate([0, -5, "nan", "inf", "hızlı", None], 1):
+            soket.sendall(protocol.encode_message(
+                {"komut": "telemetri_abone", "hiz": hiz, "istek_id": istek_id}))
+            yanit, = _mesajlar(soket, cozucu, 1)
+            assert yanit == {"durum": "hata", "hata": f"geçersiz telemetri hızı: {hiz!r}",
+                             "istek_id": istek_id}
+
+        # Akış thread'i ölmedi; aynı bağlantıda geçerli abonelik çalışır
+        soket.sendall(protocol.encode_message({"komut": "telemetri_abone", "hiz": 200}))
+        telemetri = _mesajlar(soket, cozucu, 3)
+        assert all(m["tip"] == "telemetri" for m in telemetri)
+
+
+def test_komut_satiri_hizi_pozitif_olmali():
+    with pytest.raises(argparse.ArgumentTypeError):
+        simulator._pozitif_hiz("0")
+    assert simulator._pozitif_hiz("2.5") == 2.5
@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""TelemetryBuffer: atomik ekleme, halka taşması, pencere okumaları ve temizleme."""
+
+import math
+
+import numpy as np
+import pytest
+
+import telemetry
+
+
+def test_hatali_deger_satiri_yarim_birakmaz():
+    tampon = telemetry.TelemetryBuffer(kapasite=8)
+    tampon.append({"derinlik": 1.0, "yon": 90.0}, zaman=1.0)
+    # "yon" derinlikten sonra gelir; eski yazım derinliği yazıp yarıda kalırdı
+    with pytest.raises(ValueError):
+        tampon.append({"derinlik": 2.0, "yon": "x"}, zaman=2.0)
+    with pytest.raises(TypeError):
+        tampon.append({"derinlik": [3.0]}, zaman=3.0)
+    assert len(tampon) == 1
+    assert tampon.sayac == 1
+    _, son = tampon.son()
+    assert son["derinlik"] == 1.0 and son["yon"] == 90.0
+
+
+def test_eksik_kanal_nan_bool_sayi():
+    tampon = telemetry.TelemetryBuffer(kapasite=4)
+    tampon.append({"derinlik": 5, "sizinti": True}, zaman=1.0)
+    _, (derinlik, sizinti, yon) = tampon.since(0, "derinlik", "sizinti", "yon")
+    assert derinlik[0] == 5.0 and sizinti[0] == 1.0
+    assert math.isnan(yon[0])
+
+
+def _dolu(kapasite=8, n=12):
+    # n > kapasite: en eski örnekler taşar, halka başa sarar
+    tampon = telemetry.TelemetryBuffer(kapasite=kapasite)
+    for i in range(n):
+        tampon.append({"derinlik": float(i)}, zaman=float(i))
+    return tampon
+
+
+def test_last_n_sarmadan_sonra_bitisik_gorunum():
+    tampon = _dolu()
+    zamanlar, derinlik = tampon.last_n("derinlik", 5)
+    assert zamanlar.tolist() == [7.0, 8.0, 9.0, 10.0, 11.0]
+    assert derinlik.tolist() == [7.0, 8.0, 9.0, 10.0, 11.0]
+    assert np.shares_memory(derinlik, tampon._veri["derinlik"])  # kopya değil
+    assert tampon.last_n("derinlik", 100)[1].tolist() == [float(i) for i in range(4, 12)]
+
+
+def test_last_seconds_pencere_siniri_dahil():
+    tampon = _dolu()
+    zamanlar, derinlik = tampon.last_seconds("derinlik", 3.0, simdi=11.0)
+    assert zamanlar.tolist() == [8.0, 9.0, 10.0, 11.0]
+    assert not len(tampon.last_seconds("derinlik", 1.0, simdi=100.0)[0])
+
+
+def test_aggregate_nan_atlar_bos_pencere_none():
+    tampon = _dolu()
+    tampon.append({"yon": 1.0}, zaman=12.0)  # derinlik NaN
+    assert tampon.aggregate("derinlik", 3.0, simdi=12.0) == {
+        "min": 9.0, "max": 11.0, "ortalama": 10.0, "adet": 4}
+    assert tampon.aggregate("derinlik", 1.0, simdi=100.0) is None
+    assert tampon.aggregate("sarj", 5.0, simdi=12.0) is None
+
+
+def test_since_tasmis_ornekleri_atlar():
+    tampon = _dolu()
+    sayac, (derinlik,) = tampon.since(2, "derinlik")
+    assert sayac == 12 and derinlik.tolist() == [float(i) for i in range(4, 12)]
+    assert tampon.since(12, "derinlik")[1][0].tolist() == []
+
+
+def test_clear_sonrasi_since_yalnizca_yeni_ornekler():
+    tampon = _dolu()
+    okunan, _ = tampon.since(0, "derinlik")
+    geride_kalan = okunan - 3
+    tampon.clear()
+    assert len(tampon) == 0 and tampon.son() == (12, {})
+    assert tampon.since(geride_kalan, "derinlik")[1][0].tolist() == []
+
+    tampon.append({"derinlik": 100.0}, zaman=20.0)
+    tampon.append({"derinlik": 101.0}, zaman=21.0)
+    for sayac in (0, geride_kalan, okunan):
+        yeni, (derinlik,) = tampon.since(sayac, "derinlik")
+        assert yeni == 14 and derinlik.tolist() == [100.0, 101.0]
+    assert tampon.last_n("derinlik", 10)[1].tolist() == [100.0, 101.0]
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""tiles.tohumla: tek geçiş, sınırlı sayıda bekleyen indirme."""
+
+import threading
+
+import pytest
+
+import tiles
+
+
+KUTU = (40.90, 28.90, 41.10, 29.20)
+ZOOMLAR = range(10, 13)
+
+
+def test_bolge_karo_sayisi():
+    assert tiles.bolge_karo_sayisi(*KUTU, ZOOMLAR) == sum(1 for _ in tiles.bolge_karolari(*KUTU, ZOOMLAR))
+
+
+def test_tohumla_eksikleri_sinirli_pencereyle_indirir(tmp_path, monkeypatch):
+    depo = tiles.TileStore(str(tmp_path / "karolar.mbtiles"))
+    karolar = list(tiles.bolge_karolari(*KUTU, ZOOMLAR))
+    depo.yaz([(*k, b"eski") for k in karolar[::3]])
+    kilit = threading.Lock()
+    durum = {"ucusta": 0, "en_cok": 0}
+
+    def karo_indir(adres, z, x, y):
+        with kilit:
+            durum["ucusta"] += 1
+            durum["en_cok"] = max(durum["en_cok"], durum["ucusta"])
+        try:
+            return None if (x + y) % 5 == 0 else b"yeni"
+        finally:
+            with kilit:
+                durum["ucusta"] -= 1
+
+    monkeypatch.setattr(tiles, "karo_indir", karo_indir)
+    ilerlemeler = []
+    indirilen, atlanan, hatali = tiles.tohumla(depo, "adres", KUTU, ZOOMLAR, paralel=2, parti=7,
+                                               ilerleme=lambda i, n: ilerlemeler.append((i, n)))
+
+    eksik = [k for k in karolar[1::3] + karolar[2::3]]
+    assert atlanan == len(karolar[::3])
+    assert hatali == sum(1 for _, x, y in eksik if (x + y) % 5 == 0)
+    assert indirilen + hatali == len(eksik)
+    assert depo.adet() == len(karolar) - hatali
+    assert durum["en_cok"] <= 2
+    assert ilerlemeler[-1] == (len(karolar), len(karolar))
+    depo.close()
+
+
+def test_tohumla_bekleyen_is_sayisi_sinirli(tmp_path, monkeypatch):
+    depo = tiles.TileStore(str(tmp_path / "karolar.mbtiles"))
+    gonderilen = []
+    gercek_submit = tiles.concurrent.futures.ThreadPoolExecutor.submit
+    biten = []
+
+    def karo_indir(adres, z, x, y):
+        biten.append((z, x, y))
+        return b"k"
+
+    def submit(havuz, fn, *args):
+        # gönderilmiş ama bitmemiş iş sayısı; eski sürüm hepsini bir anda gönderirdi
+        gonderilen.append(len(gonderilen) - len(biten))
+        return gercek_submit(havuz, fn, *args)
+
+    monkeypatch.setattr(tiles, "karo_indir", karo_indir)
+    monkeypatch.setattr(tiles.concurrent.futures.ThreadPoolExecutor, "submit", submit)
+    indirilen, atlanan, hatali = tiles.tohumla(depo, "adres", KUTU, ZOOMLAR, paralel=2)
+    assert (indirilen, atlanan, hatali) == (tiles.bolge_karo_sayisi(*KUTU, ZOOMLAR), 0, 0)
+    assert max(gonderilen) <= 2 * 4
+    depo.close()
+
+
+@pytest.mark.parametrize("argumanlar", [
+    [],                                                                   # --adres zorunlu
+    ["--adres", "https://tile.openstreetmap.org/{z}/{x}/{y}.png"],        # OSM toplu indirmeye kapalı
+    ["--adres", "https://b.tile.openstreetmap.org/{z}/{x}/{y}.png"],
+    ["--adres", "https://karo.ornek/{z}/{x}/{y}.png", "--paralel", "0"],
+    ["--adres", "https://karo.ornek/{z}/{x}/{y}.png", "--zoom", "10-19"],  # sınırı aşar
+])
+def test_tohumla_komutu_reddeder(tmp_path, monkeypatch, argumanlar):
+    monkeypatch.setattr(tiles, "karo_indir", lambda *a: pytest.fail("indirme başlamamalı"))
+    temel = ["tohumla", "--bbox", "40.90,28.90,41.10,29.20", "--zoom", "10-12",
+             "--depo", str(tmp_path / "k.mbtiles")]
+    with pytest.raises(SystemExit) as hata:
+        tiles.main(temel + argumanlar)
+    assert hata.value.code == 2
+
+
+def test_tohumla_sinir_acikca_yukseltilebilir(tmp_path, monkeypatch):
+    monkeypatch.setattr(tiles, "karo_indir", lambda adres, z, x, y: b"k")
+    toplam = tiles.bolge_karo_sayisi(*KUTU, ZOOMLAR)
+    argumanlar = ["tohumla", "--adres", "https://karo.ornek/{z}/{x}/{y}.png", "--bbox", "40.90,28.90,41.10,29.20",
+                  "--zoom", "10-12", "--depo", str(tmp_path / "k.mbtiles")]
+    with pytest.raises(SystemExit):
+        tiles.main(argumanlar + ["--maks", str(toplam - 1)])
+    tiles.main(argumanlar + ["--maks", str(toplam)])
+    depo = tiles.TileStore(str(tmp_path / "k.mbtiles"))
+    assert depo.adet() == toplam
+    depo.close()
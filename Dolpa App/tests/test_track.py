@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""track: yön dilimi sadeleştiricisinin tolerans garantisi ve yakınlık değişiminde yeniden kurma."""
+
+import math
+
+import numpy as np
+import pytest
+
+import track
+
+ENLEM0, BOYLAM0 = 41.0, 29.0
+PAY = 1e-6  # metre; kayan nokta payı
+
+
+def _iz(n=5000, tohum=0):
+    # Yönü yavaşça ve ara sıra sertçe dönen, ~1 m adımlı rastgele yürüyüş
+    rng = np.random.default_rng(tohum)
+    yon = np.cumsum(rng.normal(0.0, 0.05, n) + (rng.random(n) < 0.01) * rng.uniform(-2.5, 2.5, n))
+    adim = rng.uniform(0.5, 1.5, n)
+    x = np.cumsum(adim * np.cos(yon))
+    y = np.cumsum(adim * np.sin(yon))
+    k = math.radians(1.0) * track.geodesy.DUNYA_YARICAPI
+    return ENLEM0 + y / k, BOYLAM0 + x / (k * math.cos(math.radians(ENLEM0)))
+
+
+def _sapmalar(enlemler, boylamlar, kose_enlem, kose_boylam):
+    """Her noktanın, kendisini kapsayan köşe çiftinin parçasına uzaklığı."""
+    x, y = track._metre(enlemler, boylamlar, ENLEM0, BOYLAM0)
+    kx, ky = track._metre(kose_enlem, kose_boylam, ENLEM0, BOYLAM0)
+    # Köşeler gelen noktaların kendisidir; sıra numaralarını bul
+    sira = [int(np.flatnonzero((x == a) & (y == b))[0]) for a, b in zip(kx, ky)]
+    assert sira == sorted(sira) and sira[0] == 0 and sira[-1] == len(x) - 1
+    sapma = np.zeros(len(x))
+    for (bas, son) in zip(sira, sira[1:]):
+        sapma[bas:son + 1] = track._parca_mesafesi(
+            x[bas:son + 1], y[bas:son + 1], x[bas], y[bas], x[son], y[son])
+    return sapma
+
+
+@pytest.mark.parametrize("tol", [0.5, 2.0, 10.0])
+def test_atilan_noktalar_tolerans_icinde(tol):
+    enlemler, boylamlar = _iz()
+    s = track.TrackSimplifier(tol)
+    for enlem, boylam in zip(enlemler.tolist(), boylamlar.tolist()):
+        s.ekle(enlem, boylam)
+    assert s.gelen == len(enlemler)
+    assert len(s) < len(enlemler) // 4
+    # Kesinleşen köşeler + güncel baş izin tamamını temsil eder
+    bas = s.bas
+    sapma = _sapmalar(enlemler, boylamlar,
+                      list(s.enlemler) + [bas[0]], list(s.boylamlar) + [bas[1]])
+    assert sapma.max() <= tol + PAY
+
+
+def test_duz_cizgi_tek_parca():
+    s = track.TrackSimplifier(0.5)
+    for i in range(500):
+        s.ekle(ENLEM0 + i * 1e-5, BOYLAM0)
+    assert len(s) == 1
+    assert s.bas == (ENLEM0 + 499 * 1e-5, BOYLAM0)
+
+
+def test_geri_donus_kose_olur():
+    # Düz gidip aynı doğru üzerinde geri dönen iz: dönüş noktası korunmalı
+    s = track.TrackSimplifier(0.5)
+    git = [ENLEM0 + i * 1e-5 for i in range(100)]
+    for enlem in git + git[-2::-1]:
+        s.ekle(enlem, BOYLAM0)
+    assert list(s.enlemler) == [ENLEM0, git[-1]]
+
+
+def test_pencere_dolunca_kose():
+    s = track.TrackSimplifier(0.5, pencere=10)
+    for i in range(25):
+        s.ekle(ENLEM0 + i * 1e-5, BOYLAM0)
+    assert len(s) == 3  # ilk nokta + 10 ve 20 noktada bir köşe
+
+
+def test_douglas_peucker_tolerans_icinde():
+    enlemler, boylamlar = _iz(tohum=1)
+    secilen = track.douglas_peucker(enlemler, boylamlar, 3.0)
+    assert secilen[0] == 0 and secilen[-1] == len(enlemler) - 1
+    assert np.all(np.diff(secilen) > 0)
+    sapma = _sapmalar(enlemler, boylamlar, enlemler[secilen], boylamlar[secilen])
+    assert sapma.max() <= 3.0 + PAY
+
+
+def test_zoom_degisince_goruntu_izi_yeniden_kurulur():
+    enlemler, boylamlar = _iz(tohum=2)
+    iz = track.Track(zoom=18)
+    iz.ekle(enlemler, boylamlar)
+    assert iz.delta() is not None
+    assert iz.zoom_ayarla(18) is False  # tolerans değişmedi
+
+    assert iz.zoom_ayarla(14) is True
+    tol = track.tolerans(14, iz.ince.enlemler[0])
+    assert iz.goruntu.tol == tol
+    secilen = track.douglas_peucker(iz.ince.enlemler, iz.ince.boylamlar, tol)
+    assert list(iz.goruntu.enlemler) == [iz.ince.enlemler[i] for i in secilen]
+    assert list(iz.goruntu.boylamlar) == [iz.ince.boylamlar[i] for i in secilen]
+    # Yeniden kurulan iz haritaya baştan gönderilir
+    enlem, _ = iz.delta()
+    assert len(enlem) == len(iz.goruntu) + 1
+    assert enlem[-1] == iz.ince.bas[0]
+    assert len(iz.delta()[0]) == 1  # sonraki delta yalnızca baş
+
+    # Yakın zoomda tolerans ince izin altına inmez
+    iz.zoom_ayarla(22)
+    assert iz.goruntu.tol == iz.ince.tol
+
+
+def test_bos_iz():
+    iz = track.Track()
+    assert iz.delta() is None and iz.tamami() is None
+    assert iz.zoom_ayarla(10) is False
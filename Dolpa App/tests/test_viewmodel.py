@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+"""ViewModel: aynı değer bastırılır, aynı karedeki güncellemeler birleştirilir."""
+
+import viewmodel
+
+
+class SahteStil:
+    def __init__(self):
+        self.cilalama = 0
+
+    def unpolish(self, widget):
+        pass
+
+    def polish(self, widget):
+        self.cilalama += 1
+
+
+class SahteWidget:
+    def __init__(self):
+        self.metinler = []
+        self.ozellikler = {}
+        self._stil = SahteStil()
+
+    def setText(self, metin):
+        self.metinler.append(metin)
+
+    def setProperty(self, ad, deger):
+        self.ozellikler[ad] = deger
+
+    def style(self):
+        return self._stil
+
+    def update(self):
+        pass
+
+
+def test_ayni_deger_bastirilir():
+    gorunum, etiket = viewmodel.ViewModel(), SahteWidget()
+    gorunum.metin(etiket, "Bağlı")
+    assert gorunum.uygula() == 1
+    gorunum.metin(etiket, "Bağlı")
+    assert gorunum.uygula() == 0
+    assert etiket.metinler == ["Bağlı"]
+    assert gorunum.istatistik() == {"istenen": 2, "uygulanan": 1, "bastirilan": 1, "birlestirilen": 0}
+
+
+def test_ayni_karede_son_deger_uygulanir():
+    gorunum, etiket = viewmodel.ViewModel(), SahteWidget()
+    for derinlik in ("1.0 m", "1.1 m", "1.2 m"):
+        gorunum.metin(etiket, derinlik)
+    assert gorunum.uygula() == 1
+    assert etiket.metinler == ["1.2 m"]
+    assert gorunum.birlestirilen == 2
+
+
+def test_karede_eski_degerine_donen_ozellik_uygulanmaz():
+    gorunum, etiket = viewmodel.ViewModel(), SahteWidget()
+    gorunum.metin(etiket, "A")
+    gorunum.uygula()
+    gorunum.metin(etiket, "B")
+    gorunum.metin(etiket, "A")
+    assert gorunum.uygula() == 0
+    assert etiket.metinler == ["A"]
+    assert gorunum.bastirilan == 1 and gorunum.birlestirilen == 1
+
+
+def test_durum_dinamik_ozellik_ve_yeniden_cilalama():
+    gorunum, etiket = viewmodel.ViewModel(), SahteWidget()
+    gorunum.durum(etiket, "durum", "bagli")
+    gorunum.uygula()
+    gorunum.durum(etiket, "durum", "bagli")
+    gorunum.uygula()
+    assert etiket.ozellikler == {"durum": "bagli"}
+    assert etiket.style().cilalama == 1
+    assert etiket.metinler == []
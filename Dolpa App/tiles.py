@@ -0,0 +1,381 @@
+# -*- coding: utf-8 -*-
+"""
+DOLPA Underwater Technologies
+Çevrimdışı Harita Karoları
+
+Karolar bir MBTiles (SQLite) dosyasında saklanır ve önünde bayt sınırlı bir
+bellek içi LRU durur. İnternet varsa eksik karolar indirilip depoya eklenir;
+yoksa yalnızca depodakiler gösterilir. Dalıştan önce bir bölgeyi doldurmak
+için komut satırı aracı:
+
+    python tiles.py tohumla --adres https://karo.ornek/{z}/{x}/{y}.png \
+        --bbox 40.90,28.90,41.10,29.20 --zoom 10-16
+    python tiles.py leaflet      # Leaflet'i harita/leaflet/ altına indir
+
+OSM'nin kullanım politikası toplu ön indirmeyi yasaklar; tohumlama için
+buna izin veren bir karo sunucusu (kendi sunucunuz ya da ticari bir
+sağlayıcı) verilmelidir, tile.openstreetmap.org reddedilir.
+
+MBTiles satırları TMS düzenindedir (y ekseni ters); dışarıya hep XYZ
+(z/x/y, OSM düzeni) ile konuşulur.
+"""
+
+import argparse
+import concurrent.futures
+import itertools
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+import urllib.parse
+from collections import OrderedDict
+
+VARSAYILAN_ADRES = "https://tile.openstreetmap.org/{z}/{x}/{y}.png"
+KULLANICI_AJANI = "DolpaGCS/1.0 (+https://github.com/selmanmisen/Dolpa-Underwater-Tecnologies)"
+INDIRME_ZAMAN_ASIMI = 10.0      # saniye
+LRU_BOYUTU = 32 * 1024 * 1024   # bayt
+MAKS_ZOOM = 19
+MAKS_TOHUM = 20000              # --maks verilmeden bir seferde tohumlanabilecek karo
+TOHUM_YASAK_SUNUCULAR = ("tile.openstreetmap.org",)  # toplu indirmeyi yasaklayanlar
+
+LEAFLET_SURUMU = "1.9.3"  # harita/leaflet/ altında depoyla birlikte gelen sürüm
+LEAFLET_DOSYALARI = ("leaflet.js", "leaflet.css", "images/layers.png", "images/layers-2x.png",
+                     "images/marker-icon.png", "images/marker-icon-2x.png", "images/marker-shadow.png")
+
+
+class TileStore:
+    """MBTiles dosyası; birden fazla thread'den kullanılabilir."""
+
+    def __init__(self, yol):
+        self.yol = yol
+        klasor = os.path.dirname(yol)
+        if klasor:
+            os.makedirs(klasor, exist_ok=True)
+        self._db = sqlite3.connect(yol, check_same_thread=False)
+        self._kilit = threading.Lock()
+        with self._kilit:
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS metadata (name TEXT, value TEXT)")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS tiles (zoom_level INTEGER, tile_column INTEGER, "
+                "tile_row INTEGER, tile_data BLOB)")
+            self._db.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS tile_index ON tiles (zoom_level, tile_column, tile_row)")
+            if not self._db.execute("SELECT 1 FROM metadata WHERE name = 'format'").fetchone():
+                self._db.executemany("INSERT INTO metadata VALUES (?, ?)", [
+                    ("name", "dolpa"), ("format", "png"), ("type", "baselayer"), ("version", "1")])
+            self._db.commit()
+
+    @staticmethod
+    def _tms(z, y):
+        return (1 << z) - 1 - y
+
+    def oku(self, z, x, y):
+        with self._kilit:
+            satir = self._db.execute(
+                "SELECT tile_data FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+                (z, x, self._tms(z, y))).fetchone()
+        return satir[0] if satir else None
+
+    def var_mi(self, z, x, y):
+        with self._kilit:
+            return self._db.execute(
+                "SELECT 1 FROM tiles WHERE zoom_level = ? AND tile_column = ? AND tile_row = ?",
+                (z, x, self._tms(z, y))).fetchone() is not None
+
+    def sutundakiler(self, z, x, y0, y1):
+        """x sütununda y0..y1 (XYZ) aralığında depoda olan karoların y'leri."""
+        with self._kilit:
+            satirlar = self._db.execute(
+                "SELECT tile_row FROM tiles WHERE zoom_level = ? AND tile_column = ? "
+                "AND tile_row BETWEEN ? AND ?",
+                (z, x, self._tms(z, y1), self._tms(z, y0))).fetchall()
+        return {self._tms(z, r) for (r,) in satirlar}
+
+    def yaz(self, karolar):
+        """[(z, x, y, veri), ...] karolarını tek işlemde yaz."""
+        with self._kilit:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO tiles VALUES (?, ?, ?, ?)",
+                [(z, x, self._tms(z, y), sqlite3.Binary(veri)) for z, x, y, veri in karolar])
+            self._db.commit()
+
+    def adet(self):
+        with self._kilit:
+            return self._db.execute("SELECT COUNT(*) FROM tiles").fetchone()[0]
+
+    def close(self):
+        with self._kilit:
+            self._db.close()
+
+
+class TileCache:
+    """Depo önünde bayt sınırlı LRU; gerekirse karoyu indirir."""
+
+    def __init__(self, depo, adres=VARSAYILAN_ADRES, indir=True, lru_boyutu=LRU_BOYUTU):
+        self.depo = depo
+        self.adres = adres
+        self.indir_acik = indir
+        self.lru_boyutu = lru_boyutu
+        self._lru = OrderedDict()   # (z, x, y) -> bayt
+        self._lru_bayt = 0
+        self._kilit = threading.Lock()
+        self.bellek_isabet = 0
+        self.depo_isabet = 0
+        self.indirilen = 0
+        self.bulunamayan = 0
+
+    def _lru_ekle(self, anahtar, veri):
+        with self._kilit:
+            eski = self._lru.pop(anahtar, None)
+            if eski is not None:
+                self._lru_bayt -= len(eski)
+            self._lru[anahtar] = veri
+            self._lru_bayt += len(veri)
+            while self._lru_bayt > self.lru_boyutu and len(self._lru) > 1:
+                _, atilan = self._lru.popitem(last=False)
+                self._lru_bayt -= len(atilan)
+
+    def bellekte(self, z, x, y):
+        """Yalnızca LRU'ya bak (GUI thread'inde beklemeden yanıt için)."""
+        anahtar = (z, x, y)
+        with self._kilit:
+            veri = self._lru.get(anahtar)
+            if veri is not None:
+                self._lru.move_to_end(anahtar)
+                self.bellek_isabet += 1
+        return veri
+
+    def karo(self, z, x, y):
+        """LRU -> depo -> (açıksa) indirme; hiçbiri yoksa None. Bloklayabilir."""
+        veri = self.bellekte(z, x, y)
+        if veri is not None:
+            return veri
+        veri = self.depo.oku(z, x, y)
+        if veri is not None:
+            self.depo_isabet += 1
+        elif self.indir_acik:
+            veri = karo_indir(self.adres, z, x, y)
+            if veri is not None:
+                self.indirilen += 1
+                self.depo.yaz([(z, x, y, veri)])
+        if veri is None:
+            self.bulunamayan += 1
+            return None
+        self._lru_ekle((z, x, y), veri)
+        return veri
+
+    def istatistik(self):
+        return {
+            "bellek_isabet": self.bellek_isabet,
+            "depo_isabet": self.depo_isabet,
+            "indirilen": self.indirilen,
+            "bulunamayan": self.bulunamayan,
+            "lru_bayt": self._lru_bayt,
+        }
+
+
+def karo_indir(adres, z, x, y, zaman_asimi=INDIRME_ZAMAN_ASIMI):
+    """Karoyu sunucudan indir; ağ yoksa ya da hata olursa None."""
+    # urllib.request (http.client, ssl, email) açılışı ~50 ms uzatır; gerekince yükle
+    import urllib.request
+    istek = urllib.request.Request(adres.format(z=z, x=x, y=y), headers={"User-Agent": KULLANICI_AJANI})
+    try:
+        with urllib.request.urlopen(istek, timeout=zaman_asimi) as yanit:
+            return yanit.read()
+    except OSError:
+        return None
+
+
+def karo_numarasi(enlem, boylam, z):
+    """(enlem, boylam) noktasını içeren XYZ karosunun (x, y) numarası."""
+    n = 1 << z
+    enlem = max(min(enlem, 85.05112878), -85.05112878)
+    x = int((boylam + 180.0) / 360.0 * n)
+    y = int((1.0 - math.asinh(math.tan(math.radians(enlem))) / math.pi) / 2.0 * n)
+    return min(max(x, 0), n - 1), min(max(y, 0), n - 1)
+
+
+def bolge_sutunlari(guney, bati, kuzey, dogu, zoomlar):
+    """Sınır kutusunu kaplayan karo sütunları: (z, x, y0, y1), düşük zoomdan başlayarak."""
+    for z in zoomlar:
+        x0, y0 = karo_numarasi(kuzey, bati, z)
+        x1, y1 = karo_numarasi(guney, dogu, z)
+        for x in range(x0, x1 + 1):
+            yield z, x, y0, y1
+
+
+def bolge_karolari(guney, bati, kuzey, dogu, zoomlar):
+    """Sınır kutusunu kaplayan (z, x, y) karoları, düşük zoomdan başlayarak."""
+    for z, x, y0, y1 in bolge_sutunlari(guney, bati, kuzey, dogu, zoomlar):
+        for y in range(y0, y1 + 1):
+            yield z, x, y
+
+
+def bolge_karo_sayisi(guney, bati, kuzey, dogu, zoomlar):
+    """Sınır kutusundaki karo sayısı (karolar tek tek gezilmeden)."""
+    return sum(y1 - y0 + 1 for _, _, y0, y1 in bolge_sutunlari(guney, bati, kuzey, dogu, zoomlar))
+
+
+def tohumla(depo, adres, kutu, zoomlar, paralel=2, parti=200, ilerleme=None):
+    """Bölgedeki eksik karoları indirip depoya yaz; (indirilen, atlanan, hatalı).
+
+    Bölge tek geçişte, sütun başına bir depo sorgusuyla taranır. Aynı anda en
+    fazla `paralel * 4` indirme bekler ve biten işin verisi `parti` karoluk
+    yazma tamponuna geçer; bellek bölgenin büyüklüğünden bağımsızdır.
+    `ilerleme(islenen, toplam)` depoda zaten olanları da sayar.
+    """
+    if paralel < 1:
+        raise ValueError(f"paralel en az 1 olmalı: {paralel}")
+    toplam = bolge_karo_sayisi(*kutu, zoomlar)
+    indirilen = atlanan = hatali = 0
+    bekleyen = []
+
+    def eksikler():
+        nonlocal atlanan
+        for z, x, y0, y1 in bolge_sutunlari(*kutu, zoomlar):
+            var = depo.sutundakiler(z, x, y0, y1)
+            atlanan += len(var)
+            for y in range(y0, y1 + 1):
+                if y not in var:
+                    yield z, x, y
+
+    kuyruk = eksikler()
+    with concurrent.futures.ThreadPoolExecutor(max_workers=paralel) as havuz:
+        ucusta = {}
+
+        def doldur():
+            for k in itertools.islice(kuyruk, paralel * 4 - len(ucusta)):
+                ucusta[havuz.submit(karo_indir, adres, *k)] = k
+
+        doldur()
+        while ucusta:
+            bitenler, _ = concurrent.futures.wait(
+                ucusta, return_when=concurrent.futures.FIRST_COMPLETED)
+            for islem in bitenler:
+                karo = ucusta.pop(islem)
+                veri = islem.result()
+                if veri is None:
+                    hatali += 1
+                else:
+                    bekleyen.append((*karo, veri))
+                    indirilen += 1
+            if len(bekleyen) >= parti:
+                depo.yaz(bekleyen)
+                bekleyen = []
+            doldur()
+            if ilerleme:
+                ilerleme(indirilen + hatali + atlanan, toplam)
+    if bekleyen:
+        depo.yaz(bekleyen)
+    if ilerleme:
+        ilerleme(toplam, toplam)
+    return indirilen, atlanan, hatali
+
+
+def leaflet_indir(klasor, surum=LEAFLET_SURUMU):
+    """Leaflet dağıtımını yerel klasöre yeniden indir (sürüm yükseltmek için)."""
+    import urllib.request
+    for dosya in LEAFLET_DOSYALARI:
+        hedef = os.path.join(klasor, *dosya.split("/"))
+        os.makedirs(os.path.dirname(hedef), exist_ok=True)
+        adres = f"https://unpkg.com/leaflet@{surum}/dist/{dosya}"
+        istek = urllib.request.Request(adres, headers={"User-Agent": KULLANICI_AJANI})
+        with urllib.request.urlopen(istek, timeout=INDIRME_ZAMAN_ASIMI) as yanit, open(hedef, "wb") as f:
+            f.write(yanit.read())
+
+
+def _zoom_araligi(metin):
+    bas, _, son = metin.partition("-")
+    bas, son = int(bas), int(son or bas)
+    if not 0 <= bas <= son <= MAKS_ZOOM:
+        raise argparse.ArgumentTypeError(f"zoom aralığı 0-{MAKS_ZOOM} içinde olmalı: {metin}")
+    return range(bas, son + 1)
+
+
+def _pozitif_tam(metin):
+    deger = int(metin)
+    if deger < 1:
+        raise argparse.ArgumentTypeError("en az 1 olmalı")
+    return deger
+
+
+def _tohum_adresi(metin):
+    sunucu = (urllib.parse.urlsplit(metin).hostname or "").lower()
+    if any(sunucu == y or sunucu.endswith("." + y) for y in TOHUM_YASAK_SUNUCULAR):
+        raise argparse.ArgumentTypeError(
+            f"{sunucu} toplu ön indirmeye izin vermiyor (OSM karo kullanım politikası); "
+            "izin veren bir karo sunucusu verin")
+    if not all(f"{{{p}}}" in metin for p in "zxy"):
+        raise argparse.ArgumentTypeError("adres {z}, {x} ve {y} içermeli")
+    return metin
+
+
+def _kutu(metin):
+    try:
+        guney, bati, kuzey, dogu = (float(d) for d in metin.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError("--bbox güney,batı,kuzey,doğu biçiminde olmalı")
+    if guney >= kuzey or bati >= dogu:
+        raise argparse.ArgumentTypeError("--bbox: güney < kuzey ve batı < doğu olmalı")
+    return guney, bati, kuzey, dogu
+
+
+def main(argv=None):
+    klasor = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="DOLPA çevrimdışı harita karoları")
+    alt = parser.add_subparsers(dest="komut", required=True)
+
+    t = alt.add_parser("tohumla", help="bir bölgenin karolarını önceden indir")
+    t.add_argument("--bbox", type=_kutu, required=True, metavar="G,B,K,D",
+                   help="güney,batı,kuzey,doğu (derece)")
+    t.add_argument("--zoom", type=_zoom_araligi, required=True, metavar="MIN-MAKS")
+    t.add_argument("--depo", default=os.path.join(klasor, "harita", "karolar.mbtiles"))
+    t.add_argument("--adres", type=_tohum_adresi, required=True,
+                   help="toplu indirmeye izin veren karo sunucusu şablonu ({z}/{x}/{y}); "
+                        "tile.openstreetmap.org kabul edilmez")
+    t.add_argument("--paralel", type=_pozitif_tam, default=2,
+                   help="eşzamanlı indirme (sunucunun izin verdiği kadar)")
+    t.add_argument("--maks", type=_pozitif_tam, default=MAKS_TOHUM,
+                   help=f"bu sayıdan fazla karo indirilmez (varsayılan: {MAKS_TOHUM})")
+    t.add_argument("--kuru", action="store_true", help="yalnızca karo sayısını göster")
+
+    lf = alt.add_parser("leaflet", help="harita/leaflet/ altındaki Leaflet'i yenile")
+    lf.add_argument("--klasor", default=os.path.join(klasor, "harita", "leaflet"))
+    args = parser.parse_args(argv)
+
+    if args.komut == "leaflet":
+        leaflet_indir(args.klasor)
+        print(f"Leaflet {LEAFLET_SURUMU} indirildi: {args.klasor}")
+        return
+
+    toplam = bolge_karo_sayisi(*args.bbox, args.zoom)
+    print(f"{toplam} karo (zoom {args.zoom.start}-{args.zoom.stop - 1})")
+    if args.kuru:
+        return
+    if toplam > args.maks:
+        t.error(f"{toplam} karo sınırı ({args.maks}) aşıyor; bölgeyi ya da zoom aralığını "
+                "daraltın veya --maks ile sınırı açıkça yükseltin")
+    depo = TileStore(args.depo)
+    t0 = time.monotonic()
+
+    son_yazim = 0.0
+
+    def ilerleme(i, n):
+        nonlocal son_yazim
+        simdi = time.monotonic()
+        if i == n or simdi - son_yazim >= 0.5:
+            son_yazim = simdi
+            print(f"\r{i}/{n}", end="", file=sys.stderr, flush=True)
+
+    indirilen, atlanan, hatali = tohumla(depo, args.adres, args.bbox, args.zoom, args.paralel,
+                                         ilerleme=ilerleme)
+    print(f"\n{indirilen} indirildi, {atlanan} zaten vardı, {hatali} indirilemedi "
+          f"({time.monotonic() - t0:.1f} s) -> {args.depo} ({depo.adet()} karo)")
+    depo.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+DOLPA Underwater Technologies
+İz Sadeleştirme
+
+Saatler süren bir dalışın her konumunu haritaya çizmek kaydırmayı
+yavaşlatır. Burada iz, gelen noktalarla birlikte çevrimiçi sadeleştirilir
+(yön dilimi yöntemi): son köşeden bakıldığında her nokta, kendisinden
+toleransın 1/√2'si kadar geçen doğrultuların açı aralığını daraltır. Yeni
+noktanın doğrultusu kalan aralığın dışına düşerse (ya da iz geri dönerse)
+bir önceki nokta yeni köşe olur. Nokta başına iş sabittir.
+
+İki kademe tutulur: sabit ve küçük toleranslı `ince` iz (hafızadaki kompakt
+iz) ve harita yakınlığına göre toleransı değişen görüntü izi. Yakınlık
+değişince görüntü izi ince izden Douglas–Peucker ile yeniden kurulur. Tam
+çözünürlüklü iz dalış kaydında (recorder) durur.
+"""
+
+import math
+from array import array
+
+import numpy as np
+
+import geodesy
+
+EKVATOR_METRE_PIKSEL = 156543.03392  # zoom 0'da ekvatorda bir pikselin metre karşılığı
+INCE_TOLERANS = 0.5                  # metre
+PIKSEL_TOLERANSI = 1.0               # görüntü izinde izin verilen sapma (piksel)
+PENCERE = 1000                       # bir köşeden sonra en fazla nokta
+
+
+def tolerans(zoom, enlem, piksel=PIKSEL_TOLERANSI):
+    """Verilen yakınlıkta `piksel` piksele karşılık gelen metre."""
+    return piksel * EKVATOR_METRE_PIKSEL * math.cos(math.radians(enlem)) / (1 << int(zoom))
+
+
+def _metre(enlemler, boylamlar, enlem0, boylam0):
+    # Kısa mesafeler için yerel düzlem (eşdikdörtgen) izdüşümü
+    k = math.radians(1.0) * geodesy.DUNYA_YARICAPI
+    return ((np.asarray(boylamlar) - boylam0) * k * math.cos(math.radians(enlem0)),
+            (np.asarray(enlemler) - enlem0) * k)
+
+
+def douglas_peucker(enlemler, boylamlar, tol):
+    """Korunacak noktaların sıra numaraları (uçlar dahil, artan sırada)."""
+    n = len(enlemler)
+    if n <= 2:
+        return np.arange(n)
+    x, y = _metre(enlemler, boylamlar, enlemler[0], boylamlar[0])
+    tut = np.zeros(n, dtype=bool)
+    tut[0] = tut[-1] = True
+    yigin = [(0, n - 1)]
+    while yigin:
+        bas, son = yigin.pop()
+        if son - bas < 2:
+            continue
+        mesafe = _parca_mesafesi(x[bas + 1:son], y[bas + 1:son], x[bas], y[bas], x[son], y[son])
+        i = int(np.argmax(mesafe))
+        if mesafe[i] > tol:
+            orta = bas + 1 + i
+            tut[orta] = True
+            yigin.append((bas, orta))
+            yigin.append((orta, son))
+    return np.flatnonzero(tut)
+
+
+def _parca_mesafesi(px, py, ax, ay, bx, by):
+    # Noktaların [a, b] doğru parçasına uzaklığı (doğruya değil: geri dönüşler korunur)
+    dx, dy = bx - ax, by - ay
+    uzunluk2 = dx * dx + dy * dy
+    if uzunluk2 == 0.0:
+        return np.hypot(px - ax, py - ay)
+    t = np.clip(((px - ax) * dx + (py - ay) * dy) / uzunluk2, 0.0, 1.0)
+    return np.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+
+class TrackSimplifier:
+    """Yön dilimi yöntemiyle çevrimiçi iz sadeleştirici.
+
+    Kesinleşen köşeler `array('d')` içinde tutulur. Son köşeden sonra gelen
+    noktalar atılır; yalnızca sonuncusu (`bas`) ve yön aralığı saklanır.
+    Atılan her nokta, son köşeden `bas`a çizilen parçaya en fazla tolerans
+    kadar uzaktır.
+    """
+
+    def __init__(self, tol, pencere=PENCERE):
+        self.tol = tol
+        self.pencere = pencere
+        self.enlemler = array("d")
+        self.boylamlar = array("d")
+        self._olcek = None   # boylam derecesinin metre karşılığı (ilk noktada sabitlenir)
+        self.gelen = 0
+        self._pencereyi_ac()
+
+    def _pencereyi_ac(self, bas=None):
+        self._bas = bas      # son köşeden sonraki en son nokta
+        self._adet = 0       # son köşeden sonra gelen nokta
+        self._yon = None     # yön açılarının ölçüldüğü eksen
+        self._alt = -math.pi
+        self._ust = math.pi
+        self._uzak = 0.0     # son köşeye en büyük uzaklık
+
+    def __len__(self):
+        return len(self.enlemler)
+
+    @property
+    def bas(self):
+        """En son gelen nokta; hiç nokta yoksa None."""
+        if self._bas is not None:
+            return self._bas
+        if self.enlemler:
+            return self.enlemler[-1], self.boylamlar[-1]
+        return None
+
+    def _kesinlestir(self, enlem, boylam):
+        self.enlemler.append(enlem)
+        self.boylamlar.append(boylam)
+
+    def ekle(self, enlem, boylam):
+        """Nokta ekle; yeni köşe oluştuysa True."""
+        self.gelen += 1
+        if not self.enlemler:
+            self._olcek = math.cos(math.radians(enlem))
+            self._kesinlestir(enlem, boylam)
+            return False
+        if self._adet >= self.pencere or not self._dilimde(enlem, boylam):
+            self._kesinlestir(*self._bas)
+            self._pencereyi_ac()
+            self._dilimde(enlem, boylam)
+            self._bas = (enlem, boylam)
+            self._adet = 1
+            return True
+        self._bas = (enlem, boylam)
+        self._adet += 1
+        return False
+
+    def _dilimde(self, enlem, boylam):
+        # Nokta yön aralığına uyuyorsa aralığı daralt ve True döndür
+        k = math.radians(1.0) * geodesy.DUNYA_YARICAPI
+        x = (boylam - self.boylamlar[-1]) * k * self._olcek
+        y = (enlem - self.enlemler[-1]) * k
+        uzaklik = math.hypot(x, y)
+        # Sapma, yana kayma ve parça ucunu aşma olarak ikiye bölünür;
+        # ikisi de tol/√2 ile sınırlanınca toplam sapma tol'u geçmez.
+        pay = self.tol / math.sqrt(2.0)
+        if uzaklik < self._uzak - pay:
+            return False  # geri dönüş
+        if uzaklik <= self.tol:
+            return True   # köşeye zaten yakın, doğrultu kısıtlamaz
+        if self._yon is None:
+            self._yon = math.atan2(y, x)
+        aci = (math.atan2(y, x) - self._yon + math.pi) % (2 * math.pi) - math.pi
+        if not self._alt <= aci <= self._ust:
+            return False
+        yarim = math.asin(pay / uzaklik)
+        self._alt = max(self._alt, aci - yarim)
+        self._ust = min(self._ust, aci + yarim)
+        self._uzak = max(self._uzak, uzaklik)
+        return True
+
+    def yeniden_kur(self, enlemler, boylamlar, tol):
+        """Köşeleri verilen noktalardan yeni toleransla baştan oluştur."""
+        self.tol = tol
+        self.enlemler = array("d")
+        self.boylamlar = array("d")
+        self._pencereyi_ac()
+        if len(enlemler):
+            self._olcek = math.cos(math.radians(enlemler[0]))
+            secilen = douglas_peucker(enlemler, boylamlar, tol)
+            self.enlemler.extend(np.asarray(enlemler)[secilen].tolist())
+            self.boylamlar.extend(np.asarray(boylamlar)[secilen].tolist())
+
+    def temizle(self):
+        self.yeniden_kur((), (), self.tol)
+        self.gelen = 0
+
+
+class Track:
+    """İki kademeli iz: kompakt ince iz + yakınlığa göre görüntü izi.
+
+    `delta` haritaya son çağrıdan beri kesinleşen görüntü köşelerini ve
+    sonunda güncel başı verir.
+    """
+
+    def __init__(self, ince_tol=INCE_TOLERANS, zoom=16):
+        self.ince = TrackSimplifier(ince_tol)
+        self.zoom = zoom
+        self.goruntu = None          # ilk noktada kurulur (tolerans enleme bağlı)
+        self._gonderilen = 0         # haritaya gitmiş görüntü köşesi
+
+    def ekle(self, enlemler, boylamlar):
+        for enlem, boylam in zip(np.asarray(enlemler).tolist(), np.asarray(boylamlar).tolist()):
+            if self.goruntu is None:
+                self.goruntu = TrackSimplifier(max(tolerans(self.zoom, enlem), self.ince.tol))
+                self.goruntu.ekle(enlem, boylam)
+            # Görüntü izi yalnızca ince izde kesinleşen köşelerle beslenir
+            if self.ince.ekle(enlem, boylam):
+                self.goruntu.ekle(self.ince.enlemler[-1], self.ince.boylamlar[-1])
+
+    def zoom_ayarla(self, zoom):
+        """Görüntü toleransını yakınlığa göre değiştir; iz yeniden kurulduysa True."""
+        self.zoom = zoom
+        if self.goruntu is None:
+            return False
+        tol = max(tolerans(zoom, self.ince.enlemler[0]), self.ince.tol)
+        if tol == self.goruntu.tol:
+            return False
+        self.goruntu.yeniden_kur(self.ince.enlemler, self.ince.boylamlar, tol)
+        self._gonderilen = 0
+        return True
+
+    def _paket(self, bas_sira):
+        g = self.goruntu
+        enlem, boylam = self.ince.bas
+        self._gonderilen = len(g)
+        return (np.array(g.enlemler[bas_sira:].tolist() + [enlem]),
+                np.array(g.boylamlar[bas_sira:].tolist() + [boylam]))
+
+    def delta(self):
+        """Yeni köşeler + güncel baş; iz boşsa None."""
+        if self.goruntu is None:
+            return None
+        return self._paket(self._gonderilen)
+
+    def tamami(self):
+        """Tüm görüntü izi + güncel baş; iz boşsa None."""
+        if self.goruntu is None:
+            return None
+        return self._paket(0)
+
+    def temizle(self):
+        self.ince.temizle()
+        self.goruntu = None
+        self._gonderilen = 0
@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""
+DOLPA Underwater Technologies
+Görünüm Modeli
+
+Veri ile widget'lar arasında duran ince katman. Her widget özelliği için
+son çizilen değer tutulur; aynı değerin tekrar yazılması atlanır. İstenen
+değişiklikler biriktirilir ve kare başına tek seferde uygulanır, böylece
+bir karede aynı widget'a gelen birden fazla güncellemeden yalnızca sonuncusu
+Qt'ye ulaşır.
+
+Görsel durumlar stil metniyle değil, stil seçicilerinde kullanılan dinamik
+özelliklerle (`durum`) ifade edilir; değiştiğinde widget yalnızca yeniden
+cilalanır, stil yeniden ayrıştırılmaz.
+"""
+
+_YOK = object()
+
+# Özellik adı -> widget üzerindeki ayarlayıcı
+AYARLAYICILAR = {
+    "text": "setText",
+    "styleSheet": "setStyleSheet",
+    "toolTip": "setToolTip",
+    "visible": "setVisible",
+    "enabled": "setEnabled",
+}
+
+# Dinamik özellik anahtarlarının öneki
+_DINAMIK = "@"
+
+
+class ViewModel:
+    """Widget başına son çizilen değeri tutan, değişiklikleri kare başına
+    toplu uygulayan görünüm modeli.
+
+    `ayarla` GUI thread'inden çağrılır ve widget'a dokunmaz; `uygula` render
+    zamanlayıcısından kare başına bir kez çağrılır.
+    """
+
+    def __init__(self):
+        self._cizilen = {}   # (widget, özellik) -> son uygulanan değer
+        self._bekleyen = {}  # (widget, özellik) -> uygulanacak değer
+        self.istenen = 0     # toplam güncelleme isteği
+        self.uygulanan = 0   # Qt'ye ulaşan güncelleme
+        self.bastirilan = 0  # değer aynı olduğu için atlanan
+        self.birlestirilen = 0  # aynı karede üzerine yazılan
+
+    def ayarla(self, widget, ozellik, deger):
+        anahtar = (widget, ozellik)
+        self.istenen += 1
+        if anahtar in self._bekleyen:
+            self.birlestirilen += 1
+        elif self._cizilen.get(anahtar, _YOK) == deger:
+            self.bastirilan += 1
+            return
+        self._bekleyen[anahtar] = deger
+
+    def metin(self, widget, metin):
+        self.ayarla(widget, "text", metin)
+
+    def durum(self, widget, ad, deger):
+        """Stil seçicilerinde kullanılan dinamik özelliği ayarla."""
+        self.ayarla(widget, _DINAMIK + ad, deger)
+
+    def uygula(self):
+        """Biriken değişiklikleri tek geçişte widget'lara yaz."""
+        if not self._bekleyen:
+            return 0
+        bekleyen, self._bekleyen = self._bekleyen, {}
+        uygulanan = 0
+        for anahtar, deger in bekleyen.items():
+            # Aynı karede önce değişip sonra eski değerine dönen özellik
+            if self._cizilen.get(anahtar, _YOK) == deger:
+                self.bastirilan += 1
+                continue
+            widget, ozellik = anahtar
+            if ozellik.startswith(_DINAMIK):
+                widget.setProperty(ozellik[len(_DINAMIK):], deger)
+                # Seçiciler yeniden değerlendirilsin
+                stil = widget.style()
+                stil.unpolish(widget)
+                stil.polish(widget)
+                widget.update()
+            else:
+                getattr(widget, AYARLAYICILAR[ozellik])(deger)
+            self._cizilen[anahtar] = deger
+            uygulanan += 1
+        self.uygulanan += uygulanan
+        return uygulanan
+
+    def istatistik(self):
+        return {
+            "istenen": self.istenen,
+            "uygulanan": self.uygulanan,
+            "bastirilan": self.bastirilan,
+            "birlestirilen": self.birlestirilen,
+        }